@@ -0,0 +1,242 @@
+"""
+Participant reads under concurrency: async views on the ASGI handler vs the DRF views
+on the WSGI handler with a fixed thread pool (a gunicorn gthread worker).
+
+    python -m benchmarks.bench_async_reads --concurrency 50 200 1000 --threads 8
+    python -m benchmarks.bench_async_reads --db-latency-ms 2    # emulate a remote database
+
+Both handlers run in this process against the same seeded database, with the
+response cache off so every request reaches the database. Latency is measured from
+the moment a request is issued, so time spent waiting for a free WSGI thread counts.
+For numbers from real servers, run `uvicorn config.asgi:application --workers N`
+and `gunicorn config.wsgi -w N --threads T` and point a load generator at both.
+"""
+
+import argparse
+import asyncio
+import importlib
+import itertools
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+from wsgiref.util import setup_testing_defaults
+
+import django
+
+
+class ThreadPeak:
+    # Samples the number of live threads in the background
+    def __init__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(0.005):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def use_async_reads(enabled):
+    from django.conf import settings
+    from django.urls import clear_url_caches
+
+    import config.urls
+    import interviewhub.urls
+
+    settings.API_ASYNC_READS = enabled
+    importlib.reload(interviewhub.urls)
+    importlib.reload(config.urls)
+    clear_url_caches()
+
+
+def asgi_request(app, url, token):
+    parts = urlsplit(url)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": parts.path,
+        "raw_path": parts.path.encode(),
+        "query_string": parts.query.encode(),
+        "headers": [(b"host", b"testserver"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+
+    async def call():
+        finished = asyncio.Event()
+        requested = False
+        status = None
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif not message.get("more_body"):
+                finished.set()
+
+        await app(scope, receive, send)
+        return status
+
+    return call
+
+
+async def run_asgi(app, urls, token, total, concurrency):
+    limit = asyncio.Semaphore(concurrency)
+    samples, statuses = [], set()
+
+    async def one(url):
+        async with limit:
+            start = time.perf_counter()
+            statuses.add(await asgi_request(app, url, token)())
+            samples.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(next(urls)) for _ in range(total)))
+    return samples, statuses, time.perf_counter() - started
+
+
+def run_wsgi(app, urls, token, total, concurrency, threads):
+    def one(url, issued):
+        parts = urlsplit(url)
+        environ = {
+            "PATH_INFO": parts.path,
+            "QUERY_STRING": parts.query,
+            "HTTP_AUTHORIZATION": f"Bearer {token}",
+            "HTTP_HOST": "testserver",
+            "SERVER_NAME": "testserver",
+        }
+        setup_testing_defaults(environ)
+        status = []
+        body = app(environ, lambda s, headers, exc_info=None: status.append(int(s[:3])))
+        for _chunk in body:
+            pass
+        body.close()
+        return status[0], (time.perf_counter() - issued) * 1000
+
+    samples, statuses = [], set()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        # `concurrency` clients, each sending its next request when the last one returns
+        pending = set()
+        sent = 0
+        while sent < total or pending:
+            while sent < total and len(pending) < concurrency:
+                pending.add(pool.submit(one, next(urls), time.perf_counter()))
+                sent += 1
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                status, ms = future.result()
+                statuses.add(status)
+                samples.append(ms)
+    return samples, statuses, time.perf_counter() - started
+
+
+def summary(samples, statuses, elapsed, peak):
+    from .suite import percentile
+
+    return (
+        f"{statistics.fmean(samples):>8.1f}{percentile(samples, 50):>8.1f}"
+        f"{percentile(samples, 99):>9.1f}{len(samples) / elapsed:>9.0f}{peak:>9}"
+        f"  {sorted(statuses)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per run.")
+    parser.add_argument("--threads", type=int, default=8, help="WSGI worker threads.")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="Added per query.")
+    parser.add_argument("--interviews", type=int, default=100)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.bench")
+    django.setup()
+    from django.conf import settings
+    from django.core.handlers.asgi import ASGIHandler
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connection
+    from django.db.backends.signals import connection_created
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from .fixtures import seed
+
+    settings.API_CACHE_ENABLED = False
+    if args.db_latency_ms:
+
+        def remote(execute, sql, params, many, context):
+            time.sleep(args.db_latency_ms / 1000)
+            return execute(sql, params, many, context)
+
+        def add_latency(sender, connection, **kwargs):
+            connection.execute_wrappers.append(remote)
+
+        connection_created.connect(add_latency, weak=False)
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        data = seed(users=200, questions=2000, interviews=args.interviews, per_interview=20)
+        from django.contrib.auth.models import User
+
+        token = str(AccessToken.for_user(User.objects.get(pk=data.users[0])))
+        paths = {
+            "interview_detail": [f"/api/interviews/{pk}/" for pk in data.interviews],
+            "question_detail": [f"/api/questions/{pk}/" for pk in data.questions[:500]],
+            "submission_list": ["/api/submissions/"],
+        }
+
+        print(f"{args.requests} requests per run, {args.threads} WSGI threads, ms")
+        print(
+            f"{'scenario':<18}{'server':<6}{'conc':>6}{'mean':>8}{'p50':>8}{'p99':>9}"
+            f"{'req/s':>9}{'threads':>9}  status"
+        )
+        for name, urls in paths.items():
+            for concurrency in args.concurrency:
+                use_async_reads(True)
+                with ThreadPeak() as peak:
+                    result = asyncio.run(
+                        run_asgi(
+                            ASGIHandler(), itertools.cycle(urls), token, args.requests, concurrency
+                        )
+                    )
+                print(f"{name:<18}{'asgi':<6}{concurrency:>6}{summary(*result, peak.peak)}")
+
+                use_async_reads(False)
+                with ThreadPeak() as peak:
+                    result = run_wsgi(
+                        WSGIHandler(),
+                        itertools.cycle(urls),
+                        token,
+                        args.requests,
+                        concurrency,
+                        args.threads,
+                    )
+                print(f"{name:<18}{'wsgi':<6}{concurrency:>6}{summary(*result, peak.peak)}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
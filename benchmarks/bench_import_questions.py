@@ -0,0 +1,78 @@
+"""
+Question import: import_questions (chunked upsert) vs one POST /api/questions/ per row.
+
+    python -m benchmarks.bench_import_questions --rows 50000 --loop-rows 500
+
+Runs on config.settings.bench: in-memory SQLite, or Postgres test_<POSTGRES_DB> when
+POSTGRES_DB is set. The per-row loop goes through the test client (no network), so
+real clients pay more per row.
+"""
+
+import argparse
+import os
+import time
+
+import django
+
+
+def rows(n, prefix):
+    qtypes = ["Scale", "Open Ended", "Multiple Choice"]
+    return [
+        {
+            "external_id": f"{prefix}{i}",
+            "title": f"Question {i} about the team",
+            "qtype": qtypes[i % 3],
+            "options": ["Yes", "No", "Maybe"] if i % 3 == 2 else [],
+            "tags": [f"topic{i % 50}", "bank"],
+        }
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--loop-rows", type=int, default=500, help="Rows POSTed one by one.")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.bench")
+    django.setup()
+    from django.db import connection
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        run(args)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def run(args):
+    from django.contrib.auth.models import User
+    from rest_framework.test import APIClient
+
+    from interviewhub.imports import import_questions
+
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user("bench", is_staff=True))
+
+    start = time.perf_counter()
+    for row in rows(args.loop_rows, "loop-"):
+        assert client.post("/api/questions/", row, format="json").status_code == 201
+    per_row = (time.perf_counter() - start) / args.loop_rows
+
+    print(f"{'run':<28}{'rows':>8}{'seconds':>10}{'rows/s':>10}")
+    loop_seconds = per_row * args.loop_rows
+    print(f"{'POST per row':<28}{args.loop_rows:>8}{loop_seconds:>10.2f}{1 / per_row:>10.0f}")
+    print(f"{'  extrapolated':<28}{args.rows:>8}{per_row * args.rows:>10.2f}")
+    data = rows(args.rows, "bulk-")
+    for run in ("import (create)", "import (update)"):
+        start = time.perf_counter()
+        report = import_questions(data, chunk_size=args.chunk_size)
+        seconds = time.perf_counter() - start
+        assert not report["errors"], report["errors"][:3]
+        print(f"{run:<28}{args.rows:>8}{seconds:>10.2f}{args.rows / seconds:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Submission create latency with the previous synchronous log pipeline vs the queued one.
+
+    python -m benchmarks.bench_logging --requests 2000 --answer-bytes 4000
+    python -m benchmarks.bench_logging --write-ms 2     # log collector that lags
+
+"sync" renders JSON in the request thread and writes through a StreamHandler, as
+before. "queued" is settings.LOGGING: the request thread only enqueues, the log
+thread applies the field policies, renders and writes. Both write to the same
+temporary file; --write-ms adds a delay to every write, like a pipe to a busy
+log shipper. Runs on config.settings.bench.
+"""
+
+import argparse
+import copy
+import logging
+import logging.config
+import os
+import statistics
+import tempfile
+import time
+
+import django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--answer-bytes", type=int, default=4000)
+    parser.add_argument("--write-ms", type=float, default=0, help="Delay added to each write.")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.bench")
+    django.setup()
+    from django.db import connection
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        with tempfile.NamedTemporaryFile("w", suffix=".log") as sink:
+            run(args, _Sink(sink, args.write_ms / 1000))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+class _Sink:
+    def __init__(self, stream, delay):
+        self.stream = stream
+        self.delay = delay
+
+    def write(self, text):
+        if self.delay:
+            time.sleep(self.delay)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def _sync_pipeline(stream):
+    import structlog
+
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.JSONRenderer(),
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+    )
+    handler = {"class": "logging.StreamHandler", "stream": stream}
+    logging.config.dictConfig(
+        {
+            "version": 1,
+            "disable_existing_loggers": False,
+            "handlers": {"console": handler},
+            "root": {"handlers": ["console"], "level": "INFO"},
+        }
+    )
+
+
+def _queued_pipeline(stream, structlog_config):
+    import structlog
+    from django.conf import settings
+
+    structlog.configure(**structlog_config)
+    config = copy.deepcopy(settings.LOGGING)
+    config["handlers"]["console"].pop("filename", None)
+    config["handlers"]["console"]["stream"] = stream
+    logging.config.dictConfig(config)
+
+
+def _seed(args):
+    from django.contrib.auth.models import User
+
+    from interviewhub.models import Interview, InterviewQuestion, Question
+
+    owner = User.objects.create_user("owner", is_staff=True)
+    per_user = 50
+    users = User.objects.bulk_create(
+        [User(username=f"p{i}") for i in range(2 * args.requests // per_user + 2)]
+    )
+    questions = Question.objects.bulk_create(
+        [Question(title=f"Q{i}", qtype=Question.OPEN_ENDED) for i in range(per_user)]
+    )
+    interview = Interview.objects.create(owner=owner, title="Bench", is_published=True)
+    InterviewQuestion.objects.bulk_create(
+        [
+            InterviewQuestion(interview=interview, question=q, position=(n + 1) * 1024)
+            for n, q in enumerate(questions)
+        ]
+    )
+    pairs = [(u, q) for u in users for q in questions]
+    return interview, pairs
+
+
+def _measure(client, interview, pairs, answer):
+    timings = []
+    for user, question in pairs:
+        client.force_authenticate(user)
+        start = time.perf_counter()
+        resp = client.post(
+            "/api/submissions/create/",
+            {"interview": interview.id, "question": question.id, "answer_text": answer},
+            format="json",
+        )
+        timings.append(time.perf_counter() - start)
+        assert resp.status_code == 201, resp.content
+    return timings
+
+
+def run(args, sink):
+    import structlog
+    from rest_framework.test import APIClient
+
+    from interviewhub.log_pipeline import stats
+
+    structlog_config = structlog.get_config()
+    interview, pairs = _seed(args)
+    answer = ("The rollout plan was unclear to most of the team. " * 100)[: args.answer_bytes]
+    client = APIClient()
+
+    print(
+        f"{'pipeline':<10}{'requests':>10}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}"
+        f"{'dropped':>10}"
+    )
+    for name, batch in (("sync", pairs[: args.requests]), ("queued", pairs[args.requests :])):
+        if name == "sync":
+            _sync_pipeline(sink)
+        else:
+            _queued_pipeline(sink, structlog_config)
+        _measure(client, interview, batch[:50], answer)  # warm-up
+        stats.reset()
+        timings = sorted(_measure(client, interview, batch[50 : args.requests], answer))
+        logging.shutdown()
+        ms = [t * 1000 for t in timings]
+        p50 = ms[len(ms) // 2]
+        p99 = ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+        dropped = stats.snapshot()["dropped"] if name == "queued" else 0
+        print(
+            f"{name:<10}{len(ms):>10}{statistics.mean(ms):>10.2f}{p50:>10.2f}{p99:>10.2f}"
+            f"{dropped:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Question search: FTS (interviewhub.search) vs the old icontains filter.
+
+    python -m benchmarks.bench_question_search --questions 20000 --repeat 20
+
+Runs against config.settings.test (in-memory SQLite) unless DJANGO_SETTINGS_MODULE
+points elsewhere (e.g. a Postgres database with POSTGRES_DB set).
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+
+import django
+
+COMMON = (
+    "leadership clarity team process tooling feedback growth culture delivery roadmap "
+    "planning meeting manager review onboarding remote office hiring budget quality"
+).split()
+
+
+def vocabulary(rnd, size=5000):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    rare = {"".join(rnd.choices(letters, k=rnd.randint(5, 10))) for _ in range(size)}
+    return COMMON + sorted(rare)
+
+
+def seed(n):
+    from interviewhub.models import Question
+
+    rnd = random.Random(42)
+    words = vocabulary(rnd)
+    # Zipf-ish: the common words show up often, the long tail rarely
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    Question.objects.bulk_create(
+        [
+            Question(
+                title=" ".join(rnd.choices(words, weights, k=4)).capitalize(),
+                body=" ".join(rnd.choices(words, weights, k=30)),
+                tags=rnd.sample(COMMON, 2),
+            )
+            for _ in range(n)
+        ],
+        batch_size=2000,
+    )
+    return words
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--questions", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=10)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+    django.setup()
+    from django.core.management import call_command
+    from django.db.models import Q
+
+    from interviewhub.models import Question
+    from interviewhub.search import search_questions
+
+    call_command("migrate", verbosity=0)
+    words = seed(args.questions)
+
+    def icontains(term):
+        qs = Question.objects.filter(Q(title__icontains=term) | Q(body__icontains=term))
+        return lambda: (qs.count(), list(qs[: args.page_size]))
+
+    def fts(term):
+        qs = search_questions(Question.objects.all(), term)
+        return lambda: (qs.count(), list(qs[: args.page_size]))
+
+    print(f"{args.questions} questions, median/max ms over {args.repeat} runs (count + page)")
+    print(f"{'query':<22}{'icontains':>20}{'fts':>20}")
+    rare = words[len(COMMON) + 100]
+    for term in ["leadership", "lead", "roadmap planning", rare, rare[:4], "zzzz"]:
+        old = timed(icontains(term), args.repeat)
+        new = timed(fts(term), args.repeat)
+        print(f"{term:<22}{old[0]:>11.2f} / {old[1]:>6.2f}{new[0]:>11.2f} / {new[1]:>6.2f}")
+
+
+if __name__ == "__main__":
+    main()
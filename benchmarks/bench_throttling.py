@@ -0,0 +1,92 @@
+"""
+Per-request cost of the token bucket throttle (interviewhub.throttling).
+
+    python -m benchmarks.bench_throttling --calls 200000
+    python -m benchmarks.bench_throttling --clients 1 1000 1000000 --threads 1 8
+
+Times TokenBucketThrottle.allow_request() on prebuilt requests, for each number
+of distinct clients (more clients than THROTTLE_MAX_BUCKETS exercise the LRU
+eviction) and each number of threads calling it at once, with the in-process
+LocalBucketStore and with CacheBucketStore on a LocMemCache (the shared store
+minus the network round trips). Reports microseconds per call, wall time divided
+by calls. Rates are set so that nothing is refused. Runs on config.settings.bench.
+"""
+
+import argparse
+import os
+import threading
+import time
+
+import django
+
+
+def per_call_us(requests, calls, threads):
+    from interviewhub.throttling import TokenBucketThrottle
+
+    view = type("View", (), {"throttle_scope": "default"})()
+    per_thread = calls // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def work(offset):
+        throttle = TokenBucketThrottle()
+        n = len(requests)
+        barrier.wait()
+        for i in range(offset, offset + per_thread):
+            throttle.allow_request(requests[i % n], view)
+
+    workers = [threading.Thread(target=work, args=(t * per_thread,)) for t in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter() - start) / (per_thread * threads) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 1000, 200000])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8])
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.bench")
+    django.setup()
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from interviewhub.throttling import get_store
+
+    factory = APIRequestFactory()
+
+    def build(clients):
+        requests = []
+        for pk in range(1, min(clients, args.calls) + 1):
+            request = Request(factory.get("/api/questions/"))
+            request.user = User(pk=pk, username=f"u{pk}")
+            request.auth = None
+            requests.append(request)
+        return requests
+
+    stores = {
+        "local": "interviewhub.throttling.LocalBucketStore",
+        "cache": "interviewhub.throttling.CacheBucketStore",
+    }
+    print(f"{args.calls} calls, THROTTLE_MAX_BUCKETS={settings.THROTTLE_MAX_BUCKETS}; us per call")
+    print(f"{'clients':>8}{'threads':>8}" + "".join(f"{name:>10}" for name in stores))
+    for clients in args.clients:
+        requests = build(clients)
+        for threads in args.threads:
+            timings = []
+            for path in stores.values():
+                settings.THROTTLE_STORE = path
+                get_store.cache_clear()
+                timings.append(per_call_us(requests, args.calls, threads))
+            print(f"{clients:>8}{threads:>8}" + "".join(f"{us:>10.2f}" for us in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Interview visibility filtering (interviewhub.visibility) as invitation lists grow.
+
+    python -m benchmarks.bench_visibility --users 100000 --interviews 10000
+    python -m benchmarks.bench_visibility --invites 10 100 1000 --repeat 20
+
+Seeds the users and interviews once, then grows every restricted interview's
+allowed_participants list to each --invites size in turn and times, per size:
+the first page of the interview list (count + 20 rows) for an invited
+participant, a participant invited nowhere and an anonymous caller, the access
+check of one restricted interview, and the same list through a join on the
+allowlist with DISTINCT for comparison. Runs against config.settings.test
+(in-memory SQLite) unless DJANGO_SETTINGS_MODULE points elsewhere.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+
+import django
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def seed(args):
+    from django.contrib.auth.models import User
+
+    from interviewhub.models import Interview
+
+    rnd = random.Random(42)
+    User.objects.bulk_create([User(username=f"u{i}") for i in range(args.users)], batch_size=5000)
+    user_ids = list(User.objects.order_by("id").values_list("id", flat=True))
+    owners = user_ids[:200]
+    Interview.objects.bulk_create(
+        [
+            Interview(
+                owner_id=rnd.choice(owners),
+                title=f"Interview {i}",
+                is_published=rnd.random() < 0.8,
+            )
+            for i in range(args.interviews)
+        ],
+        batch_size=5000,
+    )
+    interview_ids = list(Interview.objects.order_by("id").values_list("id", flat=True))
+    restricted = rnd.sample(interview_ids, int(len(interview_ids) * args.restricted))
+    return user_ids, restricted
+
+
+# Grow each restricted interview's list from `have` to `size` invitees. The
+# invited participant (user_ids[-1]) is on every tenth list from the start.
+def invite(user_ids, restricted, have, size):
+    from interviewhub.models import Interview
+
+    through = Interview.allowed_participants.through
+    pool = user_ids[200:-2]
+    rows = []
+    for n, interview_id in enumerate(restricted):
+        start = n * 7919
+        chosen = {pool[(start + k) % len(pool)] for k in range(have, size)}
+        if have == 0 and n % 10 == 0:
+            chosen.add(user_ids[-1])
+        rows.extend(through(interview_id=interview_id, user_id=u) for u in chosen)
+        if len(rows) >= 50000:
+            through.objects.bulk_create(rows, ignore_conflicts=True)
+            rows = []
+    through.objects.bulk_create(rows, ignore_conflicts=True)
+    return through.objects.count()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--interviews", type=int, default=10000)
+    parser.add_argument("--restricted", type=float, default=0.2, help="Share with a list.")
+    parser.add_argument("--invites", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+    django.setup()
+    from django.contrib.auth.models import AnonymousUser, User
+    from django.core.management import call_command
+    from django.db.models import Q
+
+    from interviewhub.models import Interview
+    from interviewhub.visibility import interview_for, visible_interviews
+
+    call_command("migrate", verbosity=0)
+    user_ids, restricted = seed(args)
+    invited = User.objects.get(pk=user_ids[-1])
+    outsider = User.objects.get(pk=user_ids[-2])
+    Interview.objects.filter(pk=restricted[0]).update(is_published=True)
+
+    def page(qs):
+        qs = qs.order_by("-created_at", "-id")
+        return lambda: (qs.count(), list(qs[:20]))
+
+    def joined(user):
+        # The allowlist joined in: one row per invitation, folded back by DISTINCT
+        return Interview.objects.filter(
+            Q(owner=user)
+            | Q(is_published=True, allowed_participants=None)
+            | Q(is_published=True, allowed_participants=user)
+        ).distinct()
+
+    scenarios = {
+        "invited": page(visible_interviews(invited)),
+        "not invited": page(visible_interviews(outsider)),
+        "anonymous": page(visible_interviews(AnonymousUser())),
+        "access check": lambda: interview_for(invited, restricted[0]),
+        "join+distinct": page(joined(invited)),
+    }
+    print(
+        f"{args.users} users, {args.interviews} interviews, {len(restricted)} restricted; "
+        f"median ms over {args.repeat} runs"
+    )
+    print(f"{'invites':>8}{'rows':>10}" + "".join(f"{name:>15}" for name in scenarios))
+    have = 0
+    for size in args.invites:
+        rows = invite(user_ids, restricted, have, size)
+        have = size
+        timings = [timed(fn, args.repeat) for fn in scenarios.values()]
+        print(f"{size:>8}{rows:>10}" + "".join(f"{ms:>15.2f}" for ms in timings))
+
+
+if __name__ == "__main__":
+    main()
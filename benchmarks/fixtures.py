@@ -0,0 +1,124 @@
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+
+from interviewhub.models import (
+    Interview,
+    InterviewQuestion,
+    Question,
+    QuestionTag,
+    Submission,
+    Tag,
+)
+from interviewhub.question_sets import POSITION_GAP
+from interviewhub.results import rebuild_results
+
+WORDS = (
+    "leadership clarity team process tooling feedback growth culture delivery roadmap "
+    "planning meeting manager review onboarding remote office hiring budget quality "
+    "security incident customer support release velocity mentoring career balance"
+).split()
+PASSWORD = "bench-pw"
+
+
+@dataclass
+class Dataset:
+    users: list = field(default_factory=list)  # ids, first half have answered
+    questions: list = field(default_factory=list)
+    interviews: dict = field(default_factory=dict)  # id -> [question ids]
+    owner: int = None
+
+
+# Bulk-load a dataset: every table is written with bulk_create in batches, the
+# password is hashed once and shared. Aggregates and tag links are rebuilt at the
+# end the way the live write paths would have left them.
+def seed(users=200, questions=500, interviews=50, per_interview=20, seed=42, batch_size=2000):
+    rnd = random.Random(seed)
+    data = Dataset()
+    password = make_password(PASSWORD)
+
+    owner = User.objects.create(username="bench-owner", password=password, is_staff=True)
+    data.owner = owner.pk
+    created = User.objects.bulk_create(
+        [User(username=f"bench-{i}", password=password) for i in range(users)],
+        batch_size=batch_size,
+    )
+    data.users = [u.pk for u in created]
+
+    qtypes = [Question.SCALE, Question.MULTIPLE_CHOICE, Question.OPEN_ENDED]
+    qs = Question.objects.bulk_create(
+        [
+            Question(
+                title=" ".join(rnd.sample(WORDS, 3)).capitalize(),
+                body=" ".join(rnd.choices(WORDS, k=20)),
+                qtype=qtypes[i % 3],
+                options=["Yes", "No", "Maybe"] if qtypes[i % 3] == Question.MULTIPLE_CHOICE else [],
+                tags=rnd.sample(WORDS, 2),
+            )
+            for i in range(questions)
+        ],
+        batch_size=batch_size,
+    )
+    data.questions = [q.pk for q in qs]
+    _tag(qs, batch_size)
+
+    ivs = Interview.objects.bulk_create(
+        [
+            Interview(owner=owner, title=f"Session {i}", is_published=True)
+            for i in range(interviews)
+        ],
+        batch_size=batch_size,
+    )
+    links = []
+    for iv in ivs:
+        picked = rnd.sample(data.questions, min(per_interview, len(data.questions)))
+        data.interviews[iv.pk] = picked
+        links += [
+            InterviewQuestion(interview_id=iv.pk, question_id=q, position=n * POSITION_GAP)
+            for n, q in enumerate(picked, start=1)
+        ]
+    InterviewQuestion.objects.bulk_create(links, batch_size=batch_size)
+
+    # The first half of the users answered every question of one interview each
+    by_id = {q.pk: q for q in qs}
+    answers = []
+    interview_ids = list(data.interviews)
+    for n, user_id in enumerate(data.users[: len(data.users) // 2]):
+        iv_id = interview_ids[n % len(interview_ids)]
+        for q_id in data.interviews[iv_id]:
+            answers.append(
+                Submission(
+                    candidate_id=user_id,
+                    interview_id=iv_id,
+                    question_id=q_id,
+                    answer_text=_answer(rnd, by_id[q_id]),
+                )
+            )
+    Submission.objects.bulk_create(answers, batch_size=batch_size)
+    rebuild_results()
+    return data
+
+
+# Same rows the post_save tag sync would write, in two bulk inserts
+def _tag(questions, batch_size):
+    counts = Counter(name for q in questions for name in q.tags)
+    Tag.objects.bulk_create(
+        [Tag(name=name, question_count=n) for name, n in counts.items()],
+        batch_size=batch_size,
+    )
+    ids = dict(Tag.objects.filter(name__in=counts).values_list("name", "id"))
+    QuestionTag.objects.bulk_create(
+        [QuestionTag(question_id=q.pk, tag_id=ids[name]) for q in questions for name in q.tags],
+        batch_size=batch_size,
+    )
+
+
+def _answer(rnd, question):
+    if question.qtype == Question.SCALE:
+        return str(rnd.randint(1, 5))
+    if question.qtype == Question.MULTIPLE_CHOICE:
+        return rnd.choice(question.options)
+    return " ".join(rnd.choices(WORDS, k=8))
@@ -0,0 +1,112 @@
+"""
+API hot-path benchmark: seeds a dataset, drives the endpoints in-process and
+reports latency percentiles, throughput and queries per request.
+
+    python -m benchmarks.run                               # run, compare with baseline.json
+    python -m benchmarks.run --output bench.json           # also keep the results
+    python -m benchmarks.run --write-baseline              # accept this run as the baseline
+    POSTGRES_DB=interviewhub python -m benchmarks.run      # Postgres (test_interviewhub DB)
+
+Exits with status 1 when a scenario issues more queries per request than the
+baseline or its p95 grows beyond --tolerance. Baseline latencies are machine
+specific: regenerate them on the machine that runs the comparison.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+
+import django
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=400)
+    parser.add_argument("--questions", type=int, default=2000)
+    parser.add_argument("--interviews", type=int, default=100)
+    parser.add_argument("--per-interview", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200, help="Timed requests per scenario.")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--only", nargs="*", help="Scenario names to run.")
+    parser.add_argument("--output", type=Path, help="Write the results JSON here.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--write-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed p95 growth.")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.bench")
+    django.setup()
+    from django.db import connection
+
+    from .fixtures import seed
+    from .suite import compare, run_suite
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        started = time.perf_counter()
+        data = seed(
+            users=args.users,
+            questions=args.questions,
+            interviews=args.interviews,
+            per_interview=args.per_interview,
+        )
+        seeded = time.perf_counter() - started
+        scenarios = run_suite(data, requests=args.requests, warmup=args.warmup, only=args.only)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    results = {
+        "meta": {
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "dataset": {
+                "users": args.users,
+                "questions": args.questions,
+                "interviews": args.interviews,
+                "per_interview": args.per_interview,
+            },
+            "seed_seconds": round(seeded, 2),
+        },
+        "scenarios": scenarios,
+    }
+    _print(results)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    if args.write_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}, skipping comparison")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline["meta"]["dataset"] != results["meta"]["dataset"]:
+        print("warning: baseline was recorded with a different dataset size")
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+def _print(results):
+    meta = results["meta"]
+    print(f"{meta['database']} | {meta['dataset']} | seeded in {meta['seed_seconds']}s")
+    print(f"{'scenario':<20}{'p50':>9}{'p95':>9}{'p99':>9}{'req/s':>9}{'queries':>9}  status")
+    for name, r in results["scenarios"].items():
+        print(
+            f"{name:<20}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}"
+            f"{r['throughput_rps']:>9.1f}{r['queries_per_request']:>9.1f}  {r['statuses']}"
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+import itertools
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .fixtures import PASSWORD, WORDS
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def _client(user=None):
+    client = APIClient()
+    if user is not None:
+        token = RefreshToken.for_user(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+# Each scenario returns a callable issuing one request; successive calls walk
+# through the dataset so caches and indexes see a realistic spread of keys.
+def scenarios(data, seed=7):
+    rnd = random.Random(seed)
+    answered = data.users[: len(data.users) // 2]
+    fresh = data.users[len(data.users) // 2 :]
+    interview_ids = list(data.interviews)
+    users = User.objects.in_bulk(answered[:20] + fresh)
+
+    def token_obtain():
+        client = _client()
+        usernames = itertools.cycle(f"bench-{i}" for i in range(len(data.users)))
+        return lambda: client.post(
+            "/api/auth/token/",
+            {"username": next(usernames), "password": PASSWORD},
+            format="json",
+        )
+
+    def question_search():
+        client = _client()
+        terms = itertools.cycle([w[:4] for w in WORDS])
+        return lambda: client.get(f"/api/questions/?search={next(terms)}")
+
+    def interview_list():
+        client = _client()
+        return lambda: client.get("/api/interviews/")
+
+    def interview_detail():
+        client = _client()
+        ids = itertools.cycle(interview_ids)
+        return lambda: client.get(f"/api/interviews/{next(ids)}/")
+
+    def submission_create():
+        # Users from the second half have not answered anything yet
+        pairs = (
+            (user_id, iv_id, q_id)
+            for user_id in fresh
+            for iv_id in rnd.sample(interview_ids, len(interview_ids))
+            for q_id in data.interviews[iv_id]
+        )
+        clients = {}
+
+        def call():
+            user_id, iv_id, q_id = next(pairs)
+            if user_id not in clients:
+                clients[user_id] = _client(users[user_id])
+            client = clients[user_id]
+            return client.post(
+                "/api/submissions/create/",
+                # Valid for every question type: Scale 2, option index 2, free text
+                {"interview": iv_id, "question": q_id, "answer_text": "2"},
+                format="json",
+            )
+
+        return call
+
+    def submission_list():
+        clients = itertools.cycle([_client(users[u]) for u in answered[:20]])
+        return lambda: next(clients).get("/api/submissions/")
+
+    return {
+        "token_obtain": token_obtain,
+        "question_search": question_search,
+        "interview_list": interview_list,
+        "interview_detail": interview_detail,
+        "submission_create": submission_create,
+        "submission_list": submission_list,
+    }
+
+
+# Run one scenario: `warmup` requests with SQL capture (queries per request),
+# then `requests` timed requests without it.
+def measure(factory, requests, warmup):
+    call = factory()
+    statuses = set()
+    with CaptureQueriesContext(connection) as ctx:
+        for _ in range(warmup):
+            statuses.add(call().status_code)
+    queries = len(ctx.captured_queries) / warmup if warmup else None
+
+    samples = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        t0 = time.perf_counter()
+        statuses.add(call().status_code)
+        samples.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "statuses": sorted(statuses),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "throughput_rps": round(requests / elapsed, 1),
+        "queries_per_request": queries,
+    }
+
+
+# Password hashing makes token requests ~0.5s each by design; fewer samples suffice
+MAX_REQUESTS = {"token_obtain": 20}
+
+
+def run_suite(data, requests=200, warmup=10, only=None):
+    results = {}
+    for name, factory in scenarios(data).items():
+        if only and name not in only:
+            continue
+        count = min(requests, MAX_REQUESTS.get(name, requests))
+        results[name] = measure(factory, count, min(warmup, count))
+    return results
+
+
+# Compare a run against a baseline run: query counts must not grow, latency (p95)
+# may grow by at most `tolerance` (0.25 = 25%). Returns a list of regressions.
+def compare(current, baseline, tolerance):
+    regressions = []
+    for name, base in baseline.get("scenarios", {}).items():
+        now = current["scenarios"].get(name)
+        if now is None:
+            continue
+        if (now["queries_per_request"] or 0) > (base["queries_per_request"] or 0) + 1e-9:
+            regressions.append(
+                f"{name}: {now['queries_per_request']} queries/request "
+                f"(baseline {base['queries_per_request']})"
+            )
+        if now["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {now['p95_ms']:.2f} ms (baseline {base['p95_ms']:.2f} ms, "
+                f"tolerance {tolerance:.0%})"
+            )
+    return regressions
@@ -8,23 +8,50 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-# Structlog setup
+# Structlog setup: log calls only build the event dict, rendering and writing
+# happen on the log thread (interviewhub/log_pipeline.py)
 structlog.configure(
     processors=[
+        structlog.contextvars.merge_contextvars,
         structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.JSONRenderer(),
+        structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
     ],
     wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
     context_class=dict,
     logger_factory=structlog.stdlib.LoggerFactory(),
 )
 
+# Share of the info events kept, by event name (warnings are always kept).
+# Kept events carry "sample_rate".
+LOG_SAMPLING = {
+    "request": float(os.getenv("LOG_SAMPLE_REQUEST", "1")),
+    "create_submission": float(os.getenv("LOG_SAMPLE_CREATE_SUBMISSION", "1")),
+}
+
+# Per-field policies by the event's interview confidentiality: "keep", "drop",
+# "hash" or a maximum length. "default" covers events without confidentiality.
+LOG_FIELD_POLICIES = {
+    "answer": {"public": 200, "internal": 200, "anonymous": "hash", "default": "hash"},
+}
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "filters": {
+        "sampling": {"()": "interviewhub.log_pipeline.SamplingFilter", "rates": LOG_SAMPLING},
+    },
+    "formatters": {
+        "json": {"()": "interviewhub.log_pipeline.json_formatter", "policies": LOG_FIELD_POLICIES},
+    },
     "handlers": {
-        "console": {"class": "logging.StreamHandler"},
+        # Bounded queue in front of stderr; full queue = dropped record, never a wait
+        "console": {
+            "()": "interviewhub.log_pipeline.QueuedHandler",
+            "maxsize": int(os.getenv("LOG_QUEUE_SIZE", "10000")),
+            "formatter": "json",
+            "filters": ["sampling"],
+        },
     },
     "root": {"handlers": ["console"], "level": "INFO"},
 }
@@ -50,6 +77,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "interviewhub.instrumentation.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -119,15 +147,108 @@ MEDIA_ROOT = BASE_DIR / "media"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("interviewhub.authentication.ClaimsJWTAuthentication",),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.AllowAny",),
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "interviewhub.pagination.HybridPagination",
+    "DEFAULT_THROTTLE_CLASSES": ("interviewhub.throttling.TokenBucketThrottle",),
     "PAGE_SIZE": 10,
 }
 
+# Token bucket throttling (interviewhub/throttling.py): "<requests>/<period>[:<burst>]"
+# per client and scope. Writes of answers have a bucket of their own ("submit").
+THROTTLE_RATES = {
+    "default": os.getenv("THROTTLE_DEFAULT_RATE", "600/min:120"),
+    "search": os.getenv("THROTTLE_SEARCH_RATE", "60/min:20"),
+    "submit": os.getenv("THROTTLE_SUBMIT_RATE", "300/min:60"),
+}
+# LocalBucketStore is per process; CacheBucketStore shares the buckets through
+# THROTTLE_CACHE_ALIAS (e.g. Redis via THROTTLE_CACHE_BACKEND/LOCATION)
+THROTTLE_STORE = os.getenv("THROTTLE_STORE", "interviewhub.throttling.LocalBucketStore")
+THROTTLE_SHARDS = 16
+THROTTLE_MAX_BUCKETS = int(os.getenv("THROTTLE_MAX_BUCKETS", "100000"))
+THROTTLE_CACHE_ALIAS = "throttle"
+
+# Upper bound for ?page_size= on list endpoints (page number and cursor modes)
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "100"))
+
+# Serve interview/question detail and the submission list from async views
+# (interviewhub/async_views.py); config/asgi.py turns this on by default
+API_ASYNC_READS = os.getenv("API_ASYNC_READS", "0") == "1"
+
+# Request instrumentation (interviewhub/instrumentation.py)
+REQUEST_LOG_ENABLED = os.getenv("REQUEST_LOG_ENABLED", "1") == "1"
+REQUEST_SLOW_MS = float(os.getenv("REQUEST_SLOW_MS", "500"))
+REQUEST_MAX_QUERIES = int(os.getenv("REQUEST_MAX_QUERIES", "20"))
+METRICS_ALLOWED_IPS = os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",")
+
+# Response cache for read-heavy endpoints (interviewhub/response_cache.py).
+# LocMemCache is per process; point API_CACHE_BACKEND/LOCATION at a shared cache
+# (e.g. django.core.cache.backends.redis.RedisCache) when running several workers.
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "api": {
+        "BACKEND": os.getenv("API_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("API_CACHE_LOCATION", "interviewhub-api"),
+        "TIMEOUT": int(os.getenv("API_CACHE_TIMEOUT", "300")),
+    },
+    # Idempotency-Key responses (interviewhub/idempotency.py)
+    "idempotency": {
+        "BACKEND": os.getenv(
+            "IDEMPOTENCY_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("IDEMPOTENCY_CACHE_LOCATION", "interviewhub-idempotency"),
+        "OPTIONS": {"MAX_ENTRIES": int(os.getenv("IDEMPOTENCY_MAX_KEYS", "50000"))},
+    },
+    # Throttle buckets when THROTTLE_STORE is CacheBucketStore
+    "throttle": {
+        "BACKEND": os.getenv(
+            "THROTTLE_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("THROTTLE_CACHE_LOCATION", "interviewhub-throttle"),
+    },
+}
+API_CACHE_ALIAS = "api"
+API_CACHE_ENABLED = os.getenv("API_CACHE_ENABLED", "1") == "1"
+
+IDEMPOTENCY_CACHE_ALIAS = "idempotency"
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", "86400"))  # seconds a response is replayed
+IDEMPOTENCY_LOCK_TIMEOUT = 60  # seconds a key stays claimed by a request that never finishes
+
+# Live submission events (interviewhub/events.py, GET /api/interviews/<id>/events/).
+# "memory" only reaches listeners in the process that took the write; use "poll"
+# when several processes serve the API.
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "memory")
+EVENTS_POLL_INTERVAL = float(os.getenv("EVENTS_POLL_INTERVAL", "2"))
+# Seconds of recent rows the poller reads again for late commits (events.py)
+EVENTS_POLL_LOOKBACK = int(os.getenv("EVENTS_POLL_LOOKBACK", "30"))
+EVENTS_MAX_LISTENERS_PER_INTERVIEW = int(os.getenv("EVENTS_MAX_LISTENERS_PER_INTERVIEW", "20"))
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "500"))
+EVENTS_HEARTBEAT = 15  # seconds between keepalive comments
+EVENTS_MAX_SECONDS = int(os.getenv("EVENTS_MAX_SECONDS", "600"))
+
+# Background metric_score pipeline (interviewhub/scoring.py, manage.py score_worker)
+METRIC_SCORER = os.getenv("METRIC_SCORER", "interviewhub.scoring.LexiconSentimentScorer")
+SCORING_BATCH_SIZE = int(os.getenv("SCORING_BATCH_SIZE", "200"))
+SCORING_MAX_ATTEMPTS = int(os.getenv("SCORING_MAX_ATTEMPTS", "5"))
+SCORING_RETRY_BASE = 30  # seconds, doubled on each retry
+SCORING_RETRY_MAX = 3600
+SCORING_LOCK_TIMEOUT = 600  # seconds before a running job counts as abandoned
+
+# Submission archives (interviewhub/archive.py, manage.py archive_submissions):
+# one gzip JSON Lines file per archived interview
+SUBMISSION_ARCHIVE_DIR = os.getenv("SUBMISSION_ARCHIVE_DIR", str(BASE_DIR / "archive"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=int(os.getenv("JWT_ACCESS_MINUTES", "60"))),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=int(os.getenv("JWT_REFRESH_DAYS", "7"))),
+    # Tokens carry username/is_staff (interviewhub/authentication.py) and a password
+    # fingerprint, so a password change revokes the tokens issued before it (tokens
+    # from before this setting lack the fingerprint and are refused: log in again)
+    "TOKEN_OBTAIN_SERIALIZER": "interviewhub.authentication.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "interviewhub.authentication.ClaimsTokenRefreshSerializer",
+    "CHECK_REVOKE_TOKEN": True,
 }
+
+# In-process cache of user rows behind JWT authentication
+AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "30"))
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "10000"))
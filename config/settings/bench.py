@@ -0,0 +1,24 @@
+import os
+
+from .base import *
+
+# Settings for `python -m benchmarks.run`: production-like (DEBUG off, caches and
+# password hashing as configured in base), against a throwaway test database.
+# SQLite in memory unless POSTGRES_DB is set, then Postgres test_<POSTGRES_DB>.
+DEBUG = False
+ALLOWED_HOSTS = ["testserver"]
+
+if not os.getenv("POSTGRES_DB"):
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": ":memory:",
+        }
+    }
+
+# Events still go through the log thread and are rendered to JSON, only the
+# final write is discarded
+LOGGING["handlers"]["console"]["filename"] = os.devnull
+
+# Throttling stays on, so its cost is measured, but never refuses a request
+THROTTLE_RATES = {scope: "1000000/s" for scope in THROTTLE_RATES}
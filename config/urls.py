@@ -23,6 +23,8 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 
+from interviewhub.instrumentation import metrics_view
+
 
 def ping(_request):
     return JsonResponse({"status": "ok", "service": "interviewhub"})
@@ -32,6 +34,8 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     # check
     path("ping/", ping),
+    # Prometheus scrape endpoint (internal)
+    path("metrics", metrics_view),
     # app urls
     path("api/", include("interviewhub.urls")),
     # JWT token endpoints (no view code needed)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Interview, Question, Submission
+from .models import Interview, InterviewQuestion, Question, ScoringJob, Submission
 
 
 @admin.register(Question)
@@ -10,12 +10,20 @@ class QuestionAdmin(admin.ModelAdmin):
     search_fields = ("title", "body", "tags")
 
 
+class InterviewQuestionInline(admin.TabularInline):
+    model = InterviewQuestion
+    fields = ("position", "question")
+    raw_id_fields = ("question",)
+    extra = 0
+
+
 @admin.register(Interview)
 class InterviewAdmin(admin.ModelAdmin):
     list_display = ("id", "title", "owner", "is_published", "scheduled_at", "created_at")
     list_filter = ("is_published",)
     search_fields = ("title", "description")
-    filter_horizontal = ("questions",)
+    exclude = ("snapshot", "question_set_version")
+    inlines = [InterviewQuestionInline]
 
 
 @admin.register(Submission)
@@ -23,3 +31,10 @@ class SubmissionAdmin(admin.ModelAdmin):
     list_display = ("id", "candidate", "interview", "question", "metric_score", "submitted_at")
     list_filter = ("interview",)
     search_fields = ("answer_text",)
+
+
+@admin.register(ScoringJob)
+class ScoringJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "submission", "status", "attempts", "run_after", "locked_by")
+    list_filter = ("status",)
+    raw_id_fields = ("submission",)
@@ -0,0 +1,176 @@
+import gzip
+import io
+import json
+import os
+from itertools import chain
+from pathlib import Path
+
+import structlog
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Exists, OuterRef, Subquery
+from rest_framework import exceptions, status
+
+from .exports import EXPORT_COLUMNS, export_record, export_rows
+from .models import Interview, ScoringJob, Submission, SubmissionArchive
+
+log = structlog.get_logger(__name__)
+
+# Retention: submissions of closed interviews leave the live table for a gzip
+# JSON Lines file per interview (`manage.py archive_submissions`), which keeps
+# the table and its indexes, and with them every insert, small.
+#
+# An interview is archived batch by batch: the next BATCH_SIZE rows are appended
+# to the file as one gzip member and synced, then deleted from the table in the
+# same transaction that advances the SubmissionArchive counters. A run that stops
+# halfway leaves a tail past SubmissionArchive.size, which the next run cuts off
+# before it carries on; readers never look past it either.
+#
+# Archived rows are the export rows (exports.py): candidate identity is already
+# blanked where an export would blank it. Anonymous interviews (CONF_ANON) are
+# stored anonymised: no candidate and no meta at all.
+#
+# Reads go through: results come from the aggregate tables, which keep counting
+# archived answers (the deletes bypass the post_delete handlers), and exports
+# read the archive before the live rows (submission_rows()).
+
+BATCH_SIZE = 1000
+
+
+class InterviewArchived(exceptions.APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The submissions of this interview are archived, it takes no new answers."
+    default_code = "interview_archived"
+
+
+_CANDIDATE = EXPORT_COLUMNS.index("candidate")
+_META = EXPORT_COLUMNS.index("meta")
+
+
+def archive_path(archive):
+    return Path(settings.SUBMISSION_ARCHIVE_DIR) / archive.path
+
+
+# Annotation: the interview has an archive. Its archived answers no longer hold
+# their unique (candidate, interview, question) keys, so new answers would be
+# counted on top of them in the aggregates: submissions are refused (409).
+def has_archive():
+    return Exists(SubmissionArchive.objects.filter(interview_id=OuterRef("pk")))
+
+
+def check_not_archived(interview_id):
+    if SubmissionArchive.objects.filter(interview_id=interview_id).exists():
+        raise InterviewArchived()
+
+
+# Closed (unpublished) interviews whose newest submission is older than `cutoff`
+def archivable_interviews(cutoff, interview_ids=None):
+    newest = (
+        Submission.objects.filter(interview=OuterRef("pk"))
+        .order_by("-submitted_at")
+        .values("submitted_at")[:1]
+    )
+    qs = Interview.objects.filter(is_published=False)
+    if interview_ids is not None:
+        qs = qs.filter(pk__in=interview_ids)
+    return qs.annotate(newest=Subquery(newest)).filter(newest__lt=cutoff).order_by("id")
+
+
+def _anonymise(row):
+    row = list(row)
+    row[_CANDIDATE] = row[_CANDIDATE + 1] = None
+    row[_META] = {}
+    return tuple(row)
+
+
+def _encode(rows):
+    lines = "".join(json.dumps(export_record(r), separators=(",", ":")) + "\n" for r in rows)
+    return gzip.compress(lines.encode())
+
+
+# A plain DELETE, not QuerySet.delete(): no post_delete, so the results and the
+# progress keep counting the archived answers. Scoring jobs go first.
+def _delete_submissions(ids):
+    ScoringJob.objects.filter(submission_id__in=ids).delete()
+    connection = connections[Submission.objects.db]
+    table = connection.ops.quote_name(Submission._meta.db_table)
+    pk = connection.ops.quote_name(Submission._meta.pk.column)
+    placeholders = ", ".join(["%s"] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE {pk} IN ({placeholders})", ids)
+
+
+# Move every live submission of the interview to its archive; returns the
+# number of rows moved
+def archive_interview(interview, batch_size=BATCH_SIZE):
+    archive, _ = SubmissionArchive.objects.get_or_create(
+        interview=interview,
+        defaults={
+            "path": f"interview-{interview.pk}.jsonl.gz",
+            "anonymised": interview.confidentiality == Interview.CONF_ANON,
+        },
+    )
+    path = archive_path(archive)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    moved = 0
+    with open(path, "ab") as fh:
+        fh.truncate(archive.size)
+        while True:
+            rows = list(
+                export_rows(interview, after_id=archive.last_submission_id, limit=batch_size)
+            )
+            if not rows:
+                break
+            if archive.anonymised:
+                rows = [_anonymise(r) for r in rows]
+            data = _encode(rows)
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+
+            ids = [r[0] for r in rows]
+            with transaction.atomic():
+                _delete_submissions(ids)
+                archive.size += len(data)
+                archive.row_count += len(rows)
+                archive.last_submission_id = ids[-1]
+                archive.save(
+                    update_fields=["size", "row_count", "last_submission_id", "updated_at"]
+                )
+            moved += len(rows)
+    if moved:
+        log.info("archive_submissions", interview=interview.pk, rows=moved, path=archive.path)
+    return moved
+
+
+class _Head(io.RawIOBase):
+    # The first `size` bytes of a file: the batches whose deletes committed
+    def __init__(self, fh, size):
+        self.fh = fh
+        self.left = size
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.fh.read(min(len(buffer), self.left))
+        self.left -= len(data)
+        buffer[: len(data)] = data
+        return len(data)
+
+
+# The archived rows of an interview, as export row tuples
+def archived_rows(interview):
+    archive = SubmissionArchive.objects.filter(interview=interview).first()
+    if archive is None or not archive.size:
+        return
+    with open(archive_path(archive), "rb") as fh:
+        lines = io.TextIOWrapper(gzip.GzipFile(fileobj=_Head(fh, archive.size)), "utf-8")
+        for line in lines:
+            record = json.loads(line)
+            yield tuple(record.get(column) for column in EXPORT_COLUMNS)
+
+
+# Every submission of the interview for exports: archived rows, then live ones
+def submission_rows(interview, chunk_size=2000):
+    return chain(archived_rows(interview), export_rows(interview, chunk_size=chunk_size))
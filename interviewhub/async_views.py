@@ -0,0 +1,197 @@
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from .authentication import ClaimsJWTAuthentication
+from .events import TooManyListeners, bus, event_stream
+from .models import Interview, Question, Submission
+from .pagination import HybridPagination
+from .query_plan import plan_queryset
+from .response_cache import aserve
+from .serializers import InterviewSerializer, QuestionSerializer, SubmissionSerializer
+from .throttling import bucket_for, get_store
+from .visibility import acheck_visible
+
+# ASGI-native versions of the participant-facing reads: interview detail (with its
+# questions), question detail and the user's submission list. Also the live
+# events stream, which only makes sense without a worker thread per connection.
+#
+# The DRF views in views.py are sync, so under ASGI each request holds a worker
+# thread for its whole duration. These views run on the event loop instead: the
+# JWT is verified in the loop (authentication.py), the rows come from the async
+# ORM, and serialization works on prefetched rows only. They return the same JSON as their
+# DRF counterparts and share their response cache entries.
+#
+# urls.py routes to them when API_ASYNC_READS is on (config/asgi.py enables it);
+# under WSGI the DRF views keep serving these URLs.
+
+_renderer = JSONRenderer()
+_jwt = ClaimsJWTAuthentication()
+
+
+def _json(data, status=200):
+    return HttpResponse(_renderer.render(data), status=status, content_type="application/json")
+
+
+# Error bodies and headers as DRF's exception handler renders them
+def _error(exc):
+    if isinstance(exc, Http404):
+        exc = exceptions.NotFound(*exc.args)
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+    response = _json(data, status=exc.status_code)
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        response["WWW-Authenticate"] = _jwt.authenticate_header(None)
+    if isinstance(exc, exceptions.MethodNotAllowed):
+        response["Allow"] = "GET, HEAD"
+    if getattr(exc, "wait", None):
+        response["Retry-After"] = "%d" % exc.wait
+    return response
+
+
+class AsyncReadView:
+    # Minimal async counterpart of a DRF GET view: JWT auth, optional login
+    # requirement, throttling (throttle_scope/throttle_key as in throttling.py),
+    # DRF-shaped errors and the shared response cache.
+    # Subclasses implement `render(request, user, **kwargs)` returning the data,
+    # and `check_access()` when not every caller may see it.
+    login_required = False
+    cache_name = None  # DRF view class whose cache entries are shared
+
+    def get_cache_scopes(self, **kwargs):
+        return None
+
+    # Runs before the cache is consulted; raises to refuse
+    async def check_access(self, user, **kwargs):
+        pass
+
+    @classmethod
+    def as_view(cls):
+        async def view(request, **kwargs):
+            return await cls().dispatch(request, **kwargs)
+
+        view.view_class = cls
+        return view
+
+    async def dispatch(self, request, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return _error(exceptions.MethodNotAllowed(request.method))
+        request = Request(request)
+        try:
+            user = await _jwt.aauthenticate(request)
+            if user is None and self.login_required:
+                raise exceptions.NotAuthenticated()
+            await self.check_throttle(request, user)
+            await self.check_access(user, **kwargs)
+            scopes = self.get_cache_scopes(**kwargs)
+            if not scopes:
+                return _json(await self.render(request, user, **kwargs))
+            return await aserve(
+                request,
+                self.cache_name,
+                scopes,
+                lambda: self._render_json(request, user, kwargs),
+            )
+        except (exceptions.APIException, Http404) as exc:
+            return _error(exc)
+
+    async def check_throttle(self, request, user):
+        bucket = bucket_for(request, self, user, None)
+        if bucket is not None:
+            key, (rate, burst) = bucket
+            wait = await get_store().atake(key, rate, burst)
+            if wait:
+                raise exceptions.Throttled(wait)
+
+    async def _render_json(self, request, user, kwargs):
+        return _json(await self.render(request, user, **kwargs))
+
+    async def render(self, request, user, **kwargs):
+        raise NotImplementedError
+
+
+class InterviewDetailAsyncView(AsyncReadView):
+    cache_name = "InterviewDetailView"
+
+    def get_cache_scopes(self, pk):
+        return [f"interview:{pk}"]
+
+    async def check_access(self, user, pk):
+        await acheck_visible(user, pk)
+
+    async def render(self, request, user, pk):
+        qs = plan_queryset(Interview.objects.all(), InterviewSerializer)
+        try:
+            # One hop to the database for the interview and its prefetched questions
+            interview = await qs.aget(pk=pk)
+        except Interview.DoesNotExist:
+            raise Http404("No Interview matches the given query.")
+        return InterviewSerializer(interview, context={"request": request}).data
+
+
+class QuestionDetailAsyncView(AsyncReadView):
+    cache_name = "QuestionDetailView"
+
+    def get_cache_scopes(self, pk):
+        return [f"question:{pk}"]
+
+    async def render(self, request, user, pk):
+        qs = plan_queryset(Question.objects.all(), QuestionSerializer)
+        try:
+            question = await qs.aget(pk=pk)
+        except Question.DoesNotExist:
+            raise Http404("No Question matches the given query.")
+        return QuestionSerializer(question, context={"request": request}).data
+
+
+class SubmissionListAsyncView(AsyncReadView):
+    login_required = True
+    keyset_ordering = ("-submitted_at", "-id")
+
+    async def render(self, request, user):
+        qs = Submission.objects.filter(candidate=user).order_by("-submitted_at", "-id")
+        qs = plan_queryset(qs, SubmissionSerializer)
+        paginator = HybridPagination()
+        rows = await paginator.apaginate_queryset(qs, request, view=self)
+        data = SubmissionSerializer(rows, many=True, context={"request": request}).data
+        return paginator.get_paginated_response(data).data
+
+
+class InterviewEventsAsyncView:
+    # GET: server-sent events of the interview's new submissions and result
+    # deltas (events.py). Owner and staff only. The connection stays open.
+    @classmethod
+    def as_view(cls):
+        async def view(request, **kwargs):
+            return await cls().dispatch(request, **kwargs)
+
+        view.view_class = cls
+        return view
+
+    async def dispatch(self, request, pk):
+        if request.method != "GET":
+            return _error(exceptions.MethodNotAllowed(request.method))
+        try:
+            user = await _jwt.aauthenticate(Request(request))
+            if user is None:
+                raise exceptions.NotAuthenticated()
+            try:
+                interview = await Interview.objects.only("id", "owner_id").aget(pk=pk)
+            except Interview.DoesNotExist:
+                raise Http404("No Interview matches the given query.")
+            if not (user.is_staff or interview.owner_id == user.id):
+                raise exceptions.PermissionDenied(
+                    "Only the interview owner can follow live submissions."
+                )
+            if bus.is_full(interview.pk):
+                raise TooManyListeners()
+        except (exceptions.APIException, Http404) as exc:
+            return _error(exc)
+
+        response = StreamingHttpResponse(
+            event_stream(interview.pk), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # Ask nginx not to buffer the stream
+        response["X-Accel-Buffering"] = "no"
+        return response
@@ -0,0 +1,180 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from rest_framework import exceptions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# JWT authentication without a user-table read per request.
+#
+# Tokens carry the user's username and is_staff next to the user id. request.user is
+# built from those claims: a User instance with only id, username, is_staff and
+# is_active loaded (other fields load from the database if touched). Whether the
+# token still stands (user exists and is active, password unchanged, claims current)
+# is checked against `user_cache`, an in-process TTL cache of user rows that User
+# saves and deletes evict (signals.py). Code that needs the whole row calls
+# full_user(request.user), which is served from the same cache.
+#
+# The cache is per process: a change made elsewhere is seen here within
+# AUTH_USER_CACHE_TTL seconds.
+
+User = get_user_model()
+
+CLAIM_FIELDS = ("username", "is_staff")
+_LIGHT_FIELDS = ["id", "username", "is_staff", "is_active"]
+
+
+class UserCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = OrderedDict()  # user id -> (expires, {attname: value})
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._rows.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._rows[key]
+                return None
+            self._rows.move_to_end(key)
+            return entry[1]
+
+    def _store(self, key, user):
+        row = {f.attname: getattr(user, f.attname) for f in User._meta.concrete_fields}
+        with self._lock:
+            self._rows[key] = (time.monotonic() + settings.AUTH_USER_CACHE_TTL, row)
+            self._rows.move_to_end(key)
+            while len(self._rows) > settings.AUTH_USER_CACHE_SIZE:
+                self._rows.popitem(last=False)
+        return row
+
+    # The user's row as a dict of attnames, or None if there is no such user
+    def get(self, user_id):
+        key = str(user_id)
+        row = self._lookup(key)
+        if row is None:
+            user = User.objects.filter(**{jwt_settings.USER_ID_FIELD: user_id}).first()
+            row = self._store(key, user) if user is not None else None
+        return row
+
+    async def aget(self, user_id):
+        key = str(user_id)
+        row = self._lookup(key)
+        if row is None:
+            user = await User.objects.filter(**{jwt_settings.USER_ID_FIELD: user_id}).afirst()
+            row = self._store(key, user) if user is not None else None
+        return row
+
+    def forget(self, user_id):
+        with self._lock:
+            self._rows.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+
+
+user_cache = UserCache()
+
+
+# Evict now and again on commit, so a request that read the old row before the
+# commit does not leave it cached
+def forget_user(user_id):
+    user_cache.forget(user_id)
+    transaction.on_commit(lambda: user_cache.forget(user_id))
+
+
+def _from_row(row, fields):
+    return User.from_db(None, fields, [row[f] for f in fields])
+
+
+# Fresh User instance with every field, from the cache
+def full_user(user):
+    row = user_cache.get(getattr(user, jwt_settings.USER_ID_FIELD))
+    if row is None:
+        return user
+    return _from_row(row, [f.attname for f in User._meta.concrete_fields])
+
+
+def add_user_claims(token, user):
+    for name in CLAIM_FIELDS:
+        token[name] = getattr(user, name)
+    return token
+
+
+class ClaimsRefreshToken(RefreshToken):
+    @classmethod
+    def for_user(cls, user):
+        return add_user_claims(super().for_user(user), user)
+
+    # Access tokens minted from a client's refresh token carry the user's current
+    # claims (a token built by for_user already has them)
+    @property
+    def access_token(self):
+        access = super().access_token
+        row = None if self.token is None else user_cache.get(self[jwt_settings.USER_ID_CLAIM])
+        if row is not None:
+            for name in CLAIM_FIELDS:
+                access[name] = row[name]
+        return access
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = ClaimsRefreshToken
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = ClaimsRefreshToken
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        user_id = self._user_id(validated_token)
+        return self._check(validated_token, user_cache.get(user_id))
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        token = self.get_validated_token(raw_token)
+        return self._check(token, await user_cache.aget(self._user_id(token)))
+
+    def _user_id(self, token):
+        try:
+            return token[jwt_settings.USER_ID_CLAIM]
+        except KeyError as exc:
+            raise InvalidToken("Token contained no recognizable user identification") from exc
+
+    # Same checks as JWTAuthentication.get_user, on the cached row, plus the claims
+    # must still match it (a user whose is_staff changed has to log in again)
+    def _check(self, token, row):
+        if row is None:
+            raise exceptions.AuthenticationFailed("User not found", code="user_not_found")
+        if jwt_settings.CHECK_USER_IS_ACTIVE and not row["is_active"]:
+            raise exceptions.AuthenticationFailed("User is inactive", code="user_inactive")
+        if jwt_settings.CHECK_REVOKE_TOKEN and token.get(
+            jwt_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(row["password"]):
+            raise exceptions.AuthenticationFailed(
+                "The user's password has been changed.", code="password_changed"
+            )
+        if any(name in token and token[name] != row[name] for name in CLAIM_FIELDS):
+            raise exceptions.AuthenticationFailed(
+                "Token claims are out of date, log in again.", code="claims_outdated"
+            )
+        return _from_row(row, _LIGHT_FIELDS)
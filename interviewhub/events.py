@@ -0,0 +1,307 @@
+import asyncio
+import json
+import threading
+from collections import Counter, defaultdict, deque
+from datetime import timedelta
+
+import structlog
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import exceptions, status
+
+from .models import Interview, Question, Submission
+from .results import answer_bucket
+
+log = structlog.get_logger(__name__)
+
+# Live submission activity per interview, pushed to facilitators as server-sent
+# events (GET /api/interviews/<id>/events/, see async_views.py).
+#
+# Views hand committed submissions to publish_submissions(). With the default
+# "memory" backend the events go through an in-process bus, so listeners only see
+# writes served by their own process. With EVENTS_BACKEND=poll one task per
+# interview and process reads new submission rows every EVENTS_POLL_INTERVAL
+# seconds instead, which works with any number of workers.
+#
+# Every listener has a queue of at most EVENTS_QUEUE_SIZE events. Publishers never
+# wait: when a slow client lets its queue fill up, the queued events are dropped
+# and it gets a single "resync" event, after which it should re-read results and
+# progress.
+
+
+class TooManyListeners(exceptions.APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many live connections to this interview, retry later."
+    default_code = "too_many_listeners"
+
+
+class EventStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def incr(self, name, n=1):
+        with self._lock:
+            self._counts[name] += n
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self):
+        with self._lock:
+            self._counts = {"published": 0, "delivered": 0, "dropped": 0, "rejected": 0}
+
+
+stats = EventStats()
+
+
+class Subscription:
+    # One listener. push() may be called from any thread, drain() runs on the
+    # listener's event loop.
+    def __init__(self, interview_id, loop, max_pending):
+        self.interview_id = interview_id
+        self.loop = loop
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending = deque()
+        self._overflowed = False
+        self._wakeup = asyncio.Event()
+
+    def push(self, events):
+        with self._lock:
+            if self._overflowed:
+                stats.incr("dropped", len(events))
+            elif len(self._pending) + len(events) > self.max_pending:
+                stats.incr("dropped", len(self._pending) + len(events))
+                self._pending.clear()
+                self._overflowed = True
+            else:
+                self._pending.extend(events)
+        try:
+            self.loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # Loop closed: the listener is gone
+            pass
+
+    # The queued events, waiting up to `timeout` seconds for some; [] on timeout
+    async def drain(self, timeout):
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self._wakeup.clear()
+        with self._lock:
+            events = list(self._pending)
+            self._pending.clear()
+            if self._overflowed:
+                events = [{"event": "resync", "data": {"interview": self.interview_id}}]
+                self._overflowed = False
+        stats.incr("delivered", len(events))
+        return events
+
+
+class EventBus:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._listeners = defaultdict(set)
+        self._pollers = {}
+
+    def has_listeners(self, interview_id):
+        return bool(self._listeners.get(interview_id))
+
+    def is_full(self, interview_id):
+        return (
+            len(self._listeners.get(interview_id, ()))
+            >= settings.EVENTS_MAX_LISTENERS_PER_INTERVIEW
+        )
+
+    def publish(self, interview_id, events):
+        with self._lock:
+            listeners = list(self._listeners.get(interview_id, ()))
+        stats.incr("published", len(events))
+        for listener in listeners:
+            listener.push(events)
+
+    # Called on the listener's event loop
+    def subscribe(self, interview_id):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.is_full(interview_id):
+                stats.incr("rejected")
+                raise TooManyListeners()
+            subscription = Subscription(interview_id, loop, settings.EVENTS_QUEUE_SIZE)
+            self._listeners[interview_id].add(subscription)
+        if settings.EVENTS_BACKEND == "poll" and interview_id not in self._pollers:
+            self._pollers[interview_id] = loop.create_task(_poll(self, interview_id))
+        return subscription
+
+    def unsubscribe(self, subscription):
+        interview_id = subscription.interview_id
+        with self._lock:
+            listeners = self._listeners.get(interview_id, set())
+            listeners.discard(subscription)
+            if not listeners:
+                self._listeners.pop(interview_id, None)
+                poller = self._pollers.pop(interview_id, None)
+                if poller is not None:
+                    poller.cancel()
+
+
+bus = EventBus()
+
+
+# The events of one batch of committed submissions: one "submission" event each
+# and one "results" event with the aggregate deltas. Answer text and candidate
+# are left out for anonymous interviews; the candidate also for submissions
+# flagged is_anonymous (as in exports.py).
+def submission_events(interview, submissions, questions):
+    anonymous = interview.confidentiality == Interview.CONF_ANON
+    events = []
+    responses = Counter()
+    buckets = defaultdict(Counter)
+    for s in submissions:
+        data = {
+            "id": s.pk,
+            "interview": s.interview_id,
+            "question": s.question_id,
+            "candidate": None if anonymous or s.is_anonymous else s.candidate_id,
+            "submitted_at": s.submitted_at,
+        }
+        if not anonymous:
+            data["answer_text"] = s.answer_text
+        events.append({"event": "submission", "data": data})
+
+        responses[s.question_id] += 1
+        bucket = answer_bucket(questions[s.question_id], s.answer_text)
+        if bucket is not None:
+            buckets[s.question_id][bucket] += 1
+
+    deltas = [
+        {"question": qid, "responses": n, "buckets": dict(buckets.get(qid, {}))}
+        for qid, n in responses.items()
+    ]
+    events.append({"event": "results", "data": {"interview": interview.pk, "questions": deltas}})
+    return events
+
+
+# Announce submissions once the surrounding transaction commits. `questions`
+# maps question ids to loaded questions (id, qtype, options) when known.
+def publish_submissions(interview, submissions, questions=None):
+    if settings.EVENTS_BACKEND != "memory" or not submissions:
+        return
+    if questions is None:
+        questions = {s.question_id: s.question for s in submissions}
+
+    def publish():
+        if bus.has_listeners(interview.pk):
+            bus.publish(interview.pk, submission_events(interview, submissions, questions))
+
+    transaction.on_commit(publish)
+
+
+_POLL_FIELDS = (
+    "id",
+    "interview_id",
+    "question_id",
+    "candidate_id",
+    "answer_text",
+    "is_anonymous",
+    "submitted_at",
+)
+
+
+def _lookback():
+    return timezone.now() - timedelta(seconds=settings.EVENTS_POLL_LOOKBACK)
+
+
+# Starting point of a poller: the newest submission id, and the recent rows of
+# the interview, which it must not announce as new
+def _poll_start(interview_id):
+    last_id = Submission.objects.order_by("-id").values_list("id", flat=True).first() or 0
+    seen = dict(
+        Submission.objects.filter(interview_id=interview_id, submitted_at__gte=_lookback())
+        .order_by()
+        .values_list("id", "submitted_at")
+    )
+    return last_id, seen
+
+
+# Submissions of the interview not sent yet, with what their events need. Ids are
+# allocated before commit, so a row can become visible after a higher id was
+# already sent: besides the ids after `last_id`, the rows stamped within
+# EVENTS_POLL_LOOKBACK seconds are read again and those in `seen` (id ->
+# submitted_at of the rows sent in that window) skipped. A write transaction open
+# for longer than the lookback can still be missed.
+def _poll_batch(interview_id, last_id, seen):
+    since = _lookback()
+    for pk in [pk for pk, at in seen.items() if at < since]:
+        del seen[pk]
+    rows = list(
+        Submission.objects.filter(interview_id=interview_id)
+        .filter(Q(id__gt=last_id) | Q(submitted_at__gte=since))
+        .exclude(id__in=list(seen))
+        .order_by("id")
+        .only(*_POLL_FIELDS)[:500]
+    )
+    if not rows:
+        return None, rows, {}
+    interview = Interview.objects.only("id", "confidentiality").get(pk=interview_id)
+    questions = Question.objects.only("id", "qtype", "options").in_bulk(
+        {s.question_id for s in rows}
+    )
+    return interview, rows, questions
+
+
+async def _poll(event_bus, interview_id):
+    last_id, seen = await sync_to_async(_poll_start)(interview_id)
+    while True:
+        await asyncio.sleep(settings.EVENTS_POLL_INTERVAL)
+        try:
+            interview, rows, questions = await sync_to_async(_poll_batch)(
+                interview_id, last_id, seen
+            )
+        except Interview.DoesNotExist:
+            return
+        except Exception:
+            log.exception("events_poll_failed", interview=interview_id)
+            continue
+        if rows:
+            last_id = max(last_id, rows[-1].pk)
+            seen.update((s.pk, s.submitted_at) for s in rows)
+            event_bus.publish(interview_id, submission_events(interview, rows, questions))
+
+
+def format_event(event):
+    data = json.dumps(event["data"], cls=DjangoJSONEncoder, separators=(",", ":"))
+    return f"event: {event['event']}\ndata: {data}\n\n".encode()
+
+
+# The response body of one listener: events as they come, a comment line every
+# EVENTS_HEARTBEAT seconds so proxies keep the connection open, and the end of
+# the stream after EVENTS_MAX_SECONDS (clients reconnect after `retry` ms).
+# The listener only registers once the body is being sent, so a response that
+# never starts (client gone before it) holds no slot.
+async def event_stream(interview_id):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.EVENTS_MAX_SECONDS
+    try:
+        subscription = bus.subscribe(interview_id)
+    except TooManyListeners:
+        # Lost the race for the last slot since the view checked
+        yield b"retry: 3000\n\n"
+        return
+    try:
+        yield b"retry: 3000\n\n"
+        while (remaining := deadline - loop.time()) > 0:
+            events = await subscription.drain(min(settings.EVENTS_HEARTBEAT, remaining))
+            if events:
+                yield b"".join(format_event(e) for e in events)
+            else:
+                yield b": keepalive\n\n"
+    finally:
+        bus.unsubscribe(subscription)
@@ -0,0 +1,124 @@
+import csv
+import datetime
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+from .models import Interview, Submission
+
+EXPORT_COLUMNS = [
+    "id",
+    "interview",
+    "question",
+    "candidate",
+    "candidate_username",
+    "answer_text",
+    "metric_score",
+    "is_anonymous",
+    "consent_given",
+    "meta",
+    "submitted_at",
+]
+
+# values_list() lookups, same order as EXPORT_COLUMNS
+_LOOKUPS = [
+    "id",
+    "interview_id",
+    "question_id",
+    "candidate_id",
+    "candidate__username",
+    "answer_text",
+    "metric_score",
+    "is_anonymous",
+    "consent_given",
+    "meta",
+    "submitted_at",
+]
+_CANDIDATE = EXPORT_COLUMNS.index("candidate")  # followed by candidate_username
+_IS_ANONYMOUS = EXPORT_COLUMNS.index("is_anonymous")
+_META = EXPORT_COLUMNS.index("meta")
+
+
+# Export renderers only exist so DRF content negotiation accepts ?format=csv|ndjson,
+# the export view streams its own response. render() is only used for error payloads.
+class _ExportRenderer(BaseRenderer):
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode() + b"\n"
+
+
+class CSVRenderer(_ExportRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+
+class NDJSONRenderer(_ExportRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+
+# Yield the interview's submissions (id > after_id, at most `limit`) as tuples in
+# EXPORT_COLUMNS order, read through a server-side cursor. Candidate identity is
+# blanked for anonymous interviews and for submissions flagged is_anonymous.
+# Only the live table: archive.submission_rows() adds the archived ones.
+def export_rows(interview, chunk_size=2000, after_id=0, limit=None):
+    anonymous = interview.confidentiality == Interview.CONF_ANON
+    rows = (
+        Submission.objects.filter(interview=interview, id__gt=after_id)
+        .order_by("id")
+        .values_list(*_LOOKUPS)
+    )
+    if limit is not None:
+        rows = rows[:limit]
+    for row in rows.iterator(chunk_size=chunk_size):
+        if anonymous or row[_IS_ANONYMOUS]:
+            row = row[:_CANDIDATE] + (None, None) + row[_CANDIDATE + 2 :]
+        yield row
+
+
+# One row as the JSON object of NDJSON exports (and submission archives)
+def export_record(row):
+    return dict(zip(EXPORT_COLUMNS, (_text(v) for v in row)))
+
+
+def _text(value):
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if value is None or isinstance(value, (bool, int, str, dict, list)):
+        return value
+    return str(value)  # Decimal, kept exact like DRF does
+
+
+class _Echo:
+    # csv.writer target that hands back the line instead of buffering it
+    def write(self, value):
+        return value
+
+
+# Encode rows into byte chunks of roughly `lines` rows each; the header goes out
+# before the first row is fetched.
+def stream_csv(rows, lines=500):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_COLUMNS).encode()
+    buf = []
+    for row in rows:
+        values = [_text(v) for v in row]
+        values[_META] = json.dumps(values[_META])
+        buf.append(writer.writerow(values))
+        if len(buf) >= lines:
+            yield "".join(buf).encode()
+            buf = []
+    if buf:
+        yield "".join(buf).encode()
+
+
+def stream_ndjson(rows, lines=500):
+    buf = []
+    for row in rows:
+        buf.append(json.dumps(export_record(row), separators=(",", ":")) + "\n")
+        if len(buf) >= lines:
+            yield "".join(buf).encode()
+            buf = []
+    if buf:
+        yield "".join(buf).encode()
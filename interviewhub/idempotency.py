@@ -0,0 +1,116 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse
+from rest_framework import exceptions, serializers, status
+
+# Idempotency-Key support for write endpoints (IdempotencyMixin).
+#
+# A client that may retry a POST sends an Idempotency-Key header. The first
+# request with a key claims it; its response (status and body) is then stored for
+# IDEMPOTENCY_TTL seconds under a digest of user, view and key, next to a digest
+# of the request. A retry gets that response back, with Idempotent-Replayed: true,
+# before any validation or query runs. A retry that arrives while the first
+# request is still running gets a 409, a key reused for another request a 422.
+# Server errors release the key so the next retry runs again.
+#
+# Entries live in the IDEMPOTENCY_CACHE_ALIAS cache, which evicts them after the
+# TTL (and the least recently used ones past IDEMPOTENCY_MAX_KEYS). LocMemCache,
+# the default, is per process: with several workers behind a load balancer point
+# IDEMPOTENCY_CACHE_BACKEND at a shared cache.
+
+MAX_KEY_LENGTH = 255
+_PENDING = "pending"
+_DONE = "done"
+
+
+class IdempotencyConflict(exceptions.APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "A request with this Idempotency-Key is still being processed."
+    default_code = "idempotency_conflict"
+
+
+class IdempotencyKeyReused(exceptions.APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "This Idempotency-Key was already used for a different request."
+    default_code = "idempotency_key_reused"
+
+
+def _cache():
+    return caches[settings.IDEMPOTENCY_CACHE_ALIAS]
+
+
+def _entry_key(request, view_name, header):
+    raw = f"{request.user.pk}\x1f{view_name}\x1f{header}".encode()
+    return "idem:" + hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+# Digest of what the request asks for: path with query string, and parsed body
+def _fingerprint(request):
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    raw = f"{request.get_full_path()}\x1f{body}".encode()
+    return hashlib.blake2b(raw, digest_size=8).digest()
+
+
+def _replay(entry):
+    _state, _fingerprint, status_code, body, content_type = entry
+    response = HttpResponse(body, status=status_code, content_type=content_type)
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+class IdempotencyMixin:
+    # POST handlers of views using it honour the Idempotency-Key header.
+    # Requests without the header run as before.
+
+    def post(self, request, *args, **kwargs):
+        self._idempotency = None
+        header = request.headers.get("Idempotency-Key")
+        if header is None:
+            return super().post(request, *args, **kwargs)
+        if not header or len(header) > MAX_KEY_LENGTH:
+            raise serializers.ValidationError(
+                {"Idempotency-Key": [f"Expected 1 to {MAX_KEY_LENGTH} characters."]}
+            )
+
+        cache = _cache()
+        key = _entry_key(request, self.__class__.__name__, header)
+        fingerprint = _fingerprint(request)
+        claim = (_PENDING, fingerprint)
+        if not cache.add(key, claim, settings.IDEMPOTENCY_LOCK_TIMEOUT):
+            entry = cache.get(key)
+            if entry is not None:
+                if entry[1] != fingerprint:
+                    raise IdempotencyKeyReused()
+                if entry[0] == _PENDING:
+                    raise IdempotencyConflict()
+                return _replay(entry)
+            # Expired since add() saw it
+            cache.set(key, claim, settings.IDEMPOTENCY_LOCK_TIMEOUT)
+        self._idempotency = (key, fingerprint)
+        try:
+            return super().post(request, *args, **kwargs)
+        except (exceptions.APIException, Http404, PermissionDenied):
+            # Rendered by DRF, stored by finalize_response()
+            raise
+        except Exception:
+            self._idempotency = None
+            cache.delete(key)
+            raise
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        claim = getattr(self, "_idempotency", None)
+        if claim is not None:
+            key, fingerprint = claim
+            if response.status_code >= 500:
+                _cache().delete(key)
+            else:
+                response.render()
+                body, content_type = response.content, response["Content-Type"]
+                entry = (_DONE, fingerprint, response.status_code, body, content_type)
+                _cache().set(key, entry, settings.IDEMPOTENCY_TTL)
+        return response
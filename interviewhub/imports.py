@@ -0,0 +1,175 @@
+import csv
+import json
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import InterviewQuestion, Question
+from .question_sets import question_set_changed
+from .response_cache import invalidate
+from .serializers import QuestionImportSerializer
+from .tags import sync_questions_tags
+
+# Bulk question import, shared by POST /api/questions/bulk/ and `manage.py import_questions`.
+#
+# Rows are validated with the question rules (QuestionImportSerializer) and written
+# per chunk in one transaction. A row with an external_id upserts on it (INSERT ...
+# ON CONFLICT DO UPDATE); a row without one updates the oldest question with the
+# same title and qtype and no external_id, or creates a question. Invalid rows are
+# reported by index and skipped, the rest of the chunk is saved.
+
+CHUNK_SIZE = 1000
+UPSERT_FIELDS = ["title", "body", "qtype", "options", "tags", "updated_at"]
+LIST_COLUMNS = ("options", "tags")
+# CSV columns whose empty cell means "not given", so that the default applies
+DEFAULTED_COLUMNS = ("qtype",)
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def _key(data):
+    if data["external_id"]:
+        return ("external_id", data["external_id"])
+    return ("title", data["title"], data.get("qtype", Question.OPEN_ENDED))
+
+
+# Validate one chunk; returns [(index, validated data)], errors go to `errors`
+def _validate(serializer, start, chunk, errors):
+    valid = []
+    seen = {}
+    for index, row in enumerate(chunk, start=start):
+        try:
+            if not isinstance(row, dict):
+                raise serializers.ValidationError(
+                    {"non_field_errors": ["Expected an object with the question fields."]}
+                )
+            data = serializer.run_validation(row)
+            data["external_id"] = data.get("external_id") or None
+            key = _key(data)
+            if key in seen:
+                raise serializers.ValidationError(
+                    {"non_field_errors": [f"Same question as row {seen[key]} of the import."]}
+                )
+        except serializers.ValidationError as exc:
+            errors.append({"index": index, "errors": exc.detail})
+            continue
+        seen[key] = index
+        valid.append(data)
+    return valid
+
+
+# Write one chunk of validated rows; returns (created, updated) questions
+def _upsert(rows):
+    keyed = [Question(**data) for data in rows if data["external_id"]]
+    unkeyed = [Question(**data) for data in rows if not data["external_id"]]
+    keys = [q.external_id for q in keyed]
+    existing = set(Question.objects.filter(external_id__in=keys).values_list("id", flat=True))
+
+    if keyed:
+        Question.objects.bulk_create(
+            keyed,
+            update_conflicts=True,
+            unique_fields=["external_id"],
+            update_fields=UPSERT_FIELDS,
+        )
+        ids = dict(Question.objects.filter(external_id__in=keys).values_list("external_id", "id"))
+        for q in keyed:
+            q.pk = ids[q.external_id]
+
+    if unkeyed:
+        matches = {}
+        for pk, title, qtype in (
+            Question.objects.filter(external_id=None, title__in={q.title for q in unkeyed})
+            .order_by("id")
+            .values_list("id", "title", "qtype")
+        ):
+            matches.setdefault((title, qtype), pk)
+        now = timezone.now()
+        changed = []
+        for q in unkeyed:
+            q.pk = matches.get((q.title, q.qtype))
+            if q.pk is not None:
+                q.updated_at = now
+                changed.append(q)
+                existing.add(q.pk)
+        if changed:
+            Question.objects.bulk_update(changed, UPSERT_FIELDS)
+        Question.objects.bulk_create([q for q in unkeyed if q.pk is None])
+
+    questions = keyed + unkeyed
+    created = [q for q in questions if q.pk not in existing]
+    updated = [q for q in questions if q.pk in existing]
+    return created, updated
+
+
+# Bulk writes send no signals: do what the Question post_save handlers would
+def _after_write(questions, updated):
+    sync_questions_tags(questions)
+    if updated:
+        invalidate(*(f"question:{q.pk}" for q in updated))
+        question_set_changed(
+            InterviewQuestion.objects.filter(question_id__in=[q.pk for q in updated])
+            .values_list("interview_id", flat=True)
+            .distinct(),
+            count_changed=False,
+        )
+
+
+# Import `rows` (an iterable of dicts, consumed chunk by chunk).
+# Returns {"created": n, "updated": n, "errors": [{"index": i, "errors": {...}}]}
+def import_questions(rows, chunk_size=CHUNK_SIZE):
+    report = {"created": 0, "updated": 0, "errors": []}
+    serializer = QuestionImportSerializer()
+    start = 0
+    for chunk in _chunks(rows, chunk_size):
+        valid = _validate(serializer, start, chunk, report["errors"])
+        start += len(chunk)
+        if not valid:
+            continue
+        with transaction.atomic():
+            created, updated = _upsert(valid)
+            _after_write(created + updated, updated)
+        report["created"] += len(created)
+        report["updated"] += len(updated)
+    return report
+
+
+def _list_cell(value):
+    # JSON list, or values separated by "|"
+    value = (value or "").strip()
+    if value.startswith("["):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return [v.strip() for v in value.split("|") if v.strip()]
+
+
+# Rows of a CSV file with a header line (external_id,title,body,qtype,options,tags)
+def read_csv(lines):
+    for row in csv.DictReader(lines):
+        row = {k: v for k, v in row.items() if k and v is not None}
+        for name in DEFAULTED_COLUMNS:
+            if not row.get(name, "").strip():
+                row.pop(name, None)
+        for name in LIST_COLUMNS:
+            if name in row:
+                row[name] = _list_cell(row[name])
+        yield row
+
+
+# Rows of a JSON Lines file; a malformed line is reported as an invalid row
+def read_jsonl(lines):
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
@@ -0,0 +1,264 @@
+import contextvars
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+
+import structlog
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from rest_framework import serializers
+
+from .log_pipeline import stats as log_stats
+from .response_cache import stats as cache_stats
+
+log = structlog.get_logger(__name__)
+
+# Per-request instrumentation: query count, SQL time, serializer time, total latency.
+# RequestMetricsMiddleware collects them through a DB execute wrapper and a timed
+# serializer `.data`, then reports them three ways: a "request" structlog event
+# (plus request_id bound on every event of the request), a Server-Timing
+# header, and per-route Prometheus histograms served at GET /metrics.
+
+_current = contextvars.ContextVar("interviewhub_request_metrics", default=None)
+
+
+class RequestMetrics:
+    MAX_DISTINCT_SQL = 200
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.response = None
+        # sql text -> [count, seconds]; parameters are not part of the text,
+        # so an N+1 shows up as one statement with a high count
+        self.statements = defaultdict(lambda: [0, 0.0])
+
+    def record_query(self, sql, seconds):
+        self.queries += 1
+        self.sql_seconds += seconds
+        if sql in self.statements or len(self.statements) < self.MAX_DISTINCT_SQL:
+            entry = self.statements[sql]
+            entry[0] += 1
+            entry[1] += seconds
+
+    def top_statements(self, n=5):
+        ranked = sorted(self.statements.items(), key=lambda kv: kv[1][1], reverse=True)
+        return [
+            {"sql": sql[:1000], "count": count, "ms": round(seconds * 1000, 2)}
+            for sql, (count, seconds) in ranked[:n]
+        ]
+
+
+# Installed on every database connection as it opens (apps.py), so queries are
+# seen in whichever thread runs them (the async ORM uses executor threads with
+# their own connections); it records only while a request is being measured.
+def install_query_timer(sender, connection, **kwargs):
+    if _query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_query_timer)
+
+
+def _query_timer(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record_query(sql, time.perf_counter() - start)
+
+
+class TimedDataMixin:
+    # Adds the time spent building serializer.data to the current request
+    @property
+    def data(self):
+        start = time.perf_counter()
+        try:
+            return super().data
+        finally:
+            metrics = _current.get()
+            if metrics is not None:
+                metrics.serializer_seconds += time.perf_counter() - start
+
+
+class TimedListSerializer(TimedDataMixin, serializers.ListSerializer):
+    pass
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series = {}  # labels -> [bucket counts..., count, sum]
+
+    def observe(self, labels, value):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for labels, series in items:
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {series[-2]}')
+            lines.append(f"{self.name}_count{{{base}}} {series[-2]}")
+            lines.append(f"{self.name}_sum{{{base}}} {series[-1]:.6f}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_SECONDS = Histogram(
+    "interviewhub_request_duration_seconds",
+    "Request latency by route.",
+    [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10],
+)
+REQUEST_QUERIES = Histogram(
+    "interviewhub_request_queries",
+    "SQL queries per request by route.",
+    [0, 1, 2, 3, 5, 10, 20, 50, 100],
+)
+REQUEST_SQL_SECONDS = Histogram(
+    "interviewhub_request_sql_seconds",
+    "Time spent in SQL per request by route.",
+    [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5],
+)
+HISTOGRAMS = [REQUEST_SECONDS, REQUEST_QUERIES, REQUEST_SQL_SECONDS]
+
+
+def _route(request):
+    match = getattr(request, "resolver_match", None)
+    return "/" + match.route if match is not None else "unmatched"
+
+
+class RequestMetricsMiddleware:
+    # Sync and async capable, so async views (async_views.py) stay on the event loop.
+    # The metrics live in a context variable, which the async ORM's executor
+    # threads inherit from the request.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with self._measure(request) as measured:
+            measured.response = self.get_response(request)
+        return measured.response
+
+    async def __acall__(self, request):
+        with self._measure(request) as measured:
+            measured.response = await self.get_response(request)
+        return measured.response
+
+    @contextmanager
+    def _measure(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        request_id = request.META.get("HTTP_X_REQUEST_ID") or uuid.uuid4().hex
+        structlog.contextvars.bind_contextvars(request_id=request_id)
+        start = time.perf_counter()
+        try:
+            yield metrics
+            response = metrics.response
+            self._report(request, response, metrics, time.perf_counter() - start)
+            response["X-Request-ID"] = request_id
+        finally:
+            structlog.contextvars.unbind_contextvars("request_id")
+            _current.reset(token)
+
+    def _report(self, request, response, metrics, seconds):
+        route = _route(request)
+        labels = (("method", request.method), ("route", route), ("status", response.status_code))
+        REQUEST_SECONDS.observe(labels, seconds)
+        REQUEST_QUERIES.observe(labels, metrics.queries)
+        REQUEST_SQL_SECONDS.observe(labels, metrics.sql_seconds)
+
+        total_ms = seconds * 1000
+        sql_ms = metrics.sql_seconds * 1000
+        ser_ms = metrics.serializer_seconds * 1000
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={sql_ms:.2f};desc="{metrics.queries} queries"',
+                f"ser;dur={ser_ms:.2f}",
+                f"total;dur={total_ms:.2f}",
+            ]
+        )
+
+        fields = {
+            "method": request.method,
+            "route": route,
+            "path": request.path,
+            "status": response.status_code,
+            "duration_ms": round(total_ms, 2),
+            "query_count": metrics.queries,
+            "sql_ms": round(sql_ms, 2),
+            "serializer_ms": round(ser_ms, 2),
+        }
+        slow = total_ms >= settings.REQUEST_SLOW_MS
+        chatty = metrics.queries >= settings.REQUEST_MAX_QUERIES
+        if slow or chatty:
+            log.warning(
+                "slow_request" if slow else "high_query_count",
+                top_sql=metrics.top_statements(),
+                **fields,
+            )
+        elif settings.REQUEST_LOG_ENABLED:
+            log.info("request", **fields)
+
+
+def _client_ip(request):
+    return request.META.get("REMOTE_ADDR", "")
+
+
+# GET /metrics: Prometheus text exposition of this process' counters.
+# Restricted to METRICS_ALLOWED_IPS ("*" allows every client).
+def metrics_view(request):
+    allowed = settings.METRICS_ALLOWED_IPS
+    if "*" not in allowed and _client_ip(request) not in allowed:
+        return HttpResponseForbidden("metrics are internal\n")
+
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines += histogram.render()
+    lines += [
+        "# HELP interviewhub_response_cache_total Response cache lookups and invalidations.",
+        "# TYPE interviewhub_response_cache_total counter",
+    ]
+    for result, count in sorted(cache_stats.snapshot().items()):
+        lines.append(f'interviewhub_response_cache_total{{result="{result}"}} {count}')
+    lines += [
+        "# HELP interviewhub_log_records_total Log records queued, dropped or sampled out.",
+        "# TYPE interviewhub_log_records_total counter",
+    ]
+    for outcome, count in sorted(log_stats.snapshot().items()):
+        lines.append(f'interviewhub_log_records_total{{outcome="{outcome}"}} {count}')
+    return HttpResponse(
+        "\n".join(lines) + "\n", content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,138 @@
+import csv
+import io
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from .models import Interview
+from .progress import participants_invited, participants_uninvited
+from .response_cache import invalidate
+
+# Bulk edits of Interview.allowed_participants, shared by
+# POST/DELETE /api/interviews/<id>/participants/ and `manage.py invite_participants`.
+#
+# Users are referenced by id (int) or username (str) and resolved CHUNK_SIZE at a
+# time. Each chunk is written in its own short transaction: one bulk INSERT ... ON
+# CONFLICT DO NOTHING into the through table, or one DELETE ... WHERE user_id IN
+# (...), never an .add()/.remove() per user. Bulk writes send no m2m_changed, so
+# the progress rows and cache invalidation of signals.sync_invited_progress are
+# done here.
+
+CHUNK_SIZE = 2000
+UNKNOWN_SAMPLE = 100  # unmatched references echoed back in the report
+
+_Invited = Interview.allowed_participants.through
+
+
+def _chunks(items, size):
+    items = iter(items)
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+
+def _report():
+    return {"added": 0, "removed": 0, "not_found": 0, "unknown": []}
+
+
+def _not_found(report, refs):
+    report["not_found"] += len(refs)
+    room = UNKNOWN_SAMPLE - len(report["unknown"])
+    report["unknown"].extend(refs[:room])
+
+
+# The user ids of one chunk of references and the references matching no user
+def _resolve(refs):
+    users = get_user_model().objects
+    ids = {r for r in refs if isinstance(r, int)}
+    names = {r for r in refs if isinstance(r, str)}
+    found = set(users.filter(pk__in=ids).values_list("id", flat=True)) if ids else set()
+    by_name = dict(users.filter(username__in=names).values_list("username", "id")) if names else {}
+    missing = [r for r in refs if r not in found and r not in by_name]
+    return found | set(by_name.values()), missing
+
+
+def _remove(interview_id, user_ids, chunk_size):
+    removed = 0
+    for chunk in _chunks(user_ids, chunk_size):
+        with transaction.atomic():
+            removed += _Invited.objects.filter(
+                interview_id=interview_id, user_id__in=chunk
+            ).delete()[0]
+            participants_uninvited([(interview_id, u) for u in chunk])
+    return removed
+
+
+def _changed(interview_id, report):
+    if report["added"] or report["removed"]:
+        invalidate("interviews", f"interview:{interview_id}")
+
+
+# Invite the users of `refs`. With replace=True the list becomes exactly these
+# users: those invited before but not in `refs` are removed afterwards.
+# Returns {"added", "removed", "not_found", "unknown": [first unmatched refs]}
+def invite_participants(interview_id, refs, replace=False, chunk_size=CHUNK_SIZE):
+    report = _report()
+    wanted = set()
+    for chunk in _chunks(refs, chunk_size):
+        user_ids, missing = _resolve(chunk)
+        _not_found(report, missing)
+        wanted |= user_ids
+        with transaction.atomic():
+            invited = _Invited.objects.filter(interview_id=interview_id, user_id__in=user_ids)
+            new = user_ids - set(invited.values_list("user_id", flat=True))
+            _Invited.objects.bulk_create(
+                [_Invited(interview_id=interview_id, user_id=u) for u in new],
+                ignore_conflicts=True,
+            )
+            participants_invited([(interview_id, u) for u in new])
+        report["added"] += len(new)
+    if replace:
+        current = _Invited.objects.filter(interview_id=interview_id).values_list(
+            "user_id", flat=True
+        )
+        report["removed"] = _remove(interview_id, set(current) - wanted, chunk_size)
+    _changed(interview_id, report)
+    return report
+
+
+# Uninvite the users of `refs`; same report as invite_participants()
+def remove_participants(interview_id, refs, chunk_size=CHUNK_SIZE):
+    report = _report()
+    for chunk in _chunks(refs, chunk_size):
+        user_ids, missing = _resolve(chunk)
+        _not_found(report, missing)
+        report["removed"] += _remove(interview_id, user_ids, chunk_size)
+    _changed(interview_id, report)
+    return report
+
+
+# References from a CSV with a header line holding an `id` and/or a `username`
+# column (the id is used when a row has both). Raises ValueError on a bad id.
+def read_csv(lines):
+    reader = csv.DictReader(lines)
+    if not {"id", "username"} & set(reader.fieldnames or ()):
+        raise ValueError("The CSV header needs an `id` or a `username` column.")
+    for line, row in enumerate(reader, start=2):
+        user_id = (row.get("id") or "").strip()
+        username = (row.get("username") or "").strip()
+        if user_id:
+            if not user_id.isdigit():
+                raise ValueError(f"Line {line}: {user_id!r} is not a user id.")
+            yield int(user_id)
+        elif username:
+            yield username
+
+
+class CSVParser(parsers.BaseParser):
+    # text/csv request bodies, read into a list of references
+    media_type = "text/csv"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", "utf-8")
+        try:
+            return list(read_csv(io.StringIO(stream.read().decode(encoding))))
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError(f"CSV parse error - {exc}")
@@ -0,0 +1,158 @@
+import hashlib
+import logging
+import logging.handlers
+import queue
+import random
+import threading
+
+import structlog
+
+# Log records leave the request thread as unrendered structlog event dicts.
+#
+# structlog (config/settings/base.py) ends its processor chain with
+# ProcessorFormatter.wrap_for_formatter, so a log call only builds the event
+# dict. QueuedHandler puts the record on a bounded queue without waiting; a
+# QueueListener thread applies the field policies, renders the JSON and does the
+# blocking write. When the queue is full the record is dropped and counted, so
+# a stalled stderr can't stall requests.
+#
+# SamplingFilter keeps a fraction of the high-volume info events (per event
+# name, LOG_SAMPLING); warnings and errors are always kept.
+#
+# Field policies (LOG_FIELD_POLICIES) rewrite sensitive fields according to the
+# event's `confidentiality` (Interview.confidentiality): "keep", "drop", "hash"
+# (blake2b digest, so equal answers still group) or a maximum length.
+
+
+class LogStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def incr(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self):
+        with self._lock:
+            self._counts = {"queued": 0, "dropped": 0, "sampled_out": 0}
+
+
+stats = LogStats()
+
+
+class _Listener(logging.handlers.QueueListener):
+    # The stop sentinel must get in even when the queue is full
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class QueuedHandler(logging.handlers.QueueHandler):
+    # Non-blocking front of a stream (or file) handler run by a listener thread.
+    # The formatter set on this handler (LOGGING "formatter") renders in that thread.
+    def __init__(self, maxsize=10000, stream=None, filename=None):
+        super().__init__(queue.Queue(maxsize))
+        if filename:
+            self.target = logging.FileHandler(filename, encoding="utf-8")
+        else:
+            self.target = logging.StreamHandler(stream)
+        self.listener = _Listener(self.queue, self.target)
+        self.listener.start()
+
+    def setFormatter(self, fmt):
+        self.target.setFormatter(fmt)
+
+    # Nothing is formatted here: structlog records carry their event dict, other
+    # records get their message merged so later changes to the args don't show
+    def prepare(self, record):
+        if not isinstance(record.msg, dict):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            stats.incr("dropped")
+        else:
+            stats.incr("queued")
+
+    # Writes what is still queued, then stops the thread
+    def close(self):
+        if self.listener._thread is not None:
+            self.listener.stop()
+            self.target.close()
+        super().close()
+
+
+class SamplingFilter(logging.Filter):
+    # rates: {event name: fraction of the events to keep}
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = dict(rates or {})
+
+    def filter(self, record):
+        event = record.msg
+        if record.levelno >= logging.WARNING or not isinstance(event, dict):
+            return True
+        rate = self.rates.get(event.get("event"), 1.0)
+        if rate >= 1.0:
+            return True
+        if random.random() >= rate:
+            stats.incr("sampled_out")
+            return False
+        event["sample_rate"] = rate
+        return True
+
+
+def _apply_policy(event_dict, field, policy):
+    value = event_dict.get(field)
+    if policy == "keep" or value is None:
+        return
+    if policy == "drop":
+        del event_dict[field]
+        return
+    value = str(value)
+    if policy == "hash":
+        digest = hashlib.blake2b(value.encode(), digest_size=8).hexdigest()
+        event_dict[field] = f"blake2b:{digest}"
+        event_dict[f"{field}_length"] = len(value)
+    elif len(value) > policy:
+        event_dict[field] = value[:policy] + "…"
+        event_dict[f"{field}_length"] = len(value)
+
+
+class FieldPolicies:
+    # Structlog processor. policies: {field: {confidentiality: policy}}, with a
+    # "default" entry for events without (or with an unknown) confidentiality.
+    def __init__(self, policies):
+        self.policies = {field: dict(rules) for field, rules in (policies or {}).items()}
+
+    def __call__(self, logger, method_name, event_dict):
+        confidentiality = event_dict.get("confidentiality")
+        for field, rules in self.policies.items():
+            if field in event_dict:
+                policy = rules.get(confidentiality, rules.get("default", "keep"))
+                _apply_policy(event_dict, field, policy)
+        return event_dict
+
+
+# LOGGING formatter factory: field policies, then one JSON line per event.
+# Records from plain stdlib loggers get the level and timestamp first.
+def json_formatter(policies=None):
+    return structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=[
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+        ],
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            FieldPolicies(policies),
+            structlog.processors.JSONRenderer(),
+        ],
+    )
@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from interviewhub.archive import BATCH_SIZE, archivable_interviews, archive_interview
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the submissions of closed interviews whose newest answer is older than "
+        "--older-than days into gzip JSON Lines archives (SUBMISSION_ARCHIVE_DIR). "
+        "Safe to re-run: an interrupted interview resumes where it stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than", type=int, required=True, metavar="DAYS")
+        parser.add_argument(
+            "--interview",
+            type=int,
+            action="append",
+            dest="interviews",
+            help="Only consider this interview (repeatable). Default: all interviews.",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--dry-run", action="store_true", help="List the interviews, move nothing."
+        )
+
+    def handle(
+        self,
+        *args,
+        older_than,
+        interviews=None,
+        batch_size=BATCH_SIZE,
+        dry_run=False,
+        **options,
+    ):
+        if older_than < 0 or batch_size < 1:
+            raise CommandError("--older-than must be >= 0 and --batch-size >= 1.")
+        cutoff = timezone.now() - timedelta(days=older_than)
+        total = 0
+        candidates = archivable_interviews(cutoff, interviews)
+        for interview in candidates:
+            if dry_run:
+                self.stdout.write(
+                    f"Interview {interview.pk}: last answer {interview.newest:%Y-%m-%d}"
+                )
+                continue
+            moved = archive_interview(interview, batch_size=batch_size)
+            total += moved
+            self.stdout.write(f"Interview {interview.pk}: {moved} submissions archived.")
+        if not dry_run:
+            self.stdout.write(self.style.SUCCESS(f"Archived {total} submissions."))
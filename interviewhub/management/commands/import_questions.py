@@ -0,0 +1,46 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from interviewhub.imports import CHUNK_SIZE, import_questions, read_csv, read_jsonl
+
+READERS = {"csv": read_csv, "jsonl": read_jsonl}
+
+
+class Command(BaseCommand):
+    help = (
+        "Create or update questions from a CSV (with header) or JSON Lines file. "
+        "Rows upsert on external_id, or on title + qtype when it is empty."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help='File to import, "-" for stdin.')
+        parser.add_argument(
+            "--format",
+            choices=sorted(READERS),
+            help="Input format. Default: from the file extension (.csv, .jsonl).",
+        )
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, path, format=None, chunk_size=CHUNK_SIZE, **options):
+        if format is None:
+            format = path.rsplit(".", 1)[-1].lower()
+            if format not in READERS:
+                raise CommandError("Pass --format csv or --format jsonl.")
+
+        stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        try:
+            report = import_questions(READERS[format](stream), chunk_size=chunk_size)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        for error in report["errors"]:
+            self.stderr.write(f"row {error['index'] + 1}: {json.dumps(error['errors'])}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported questions: {report['created']} created, {report['updated']} updated, "
+                f"{len(report['errors'])} rejected."
+            )
+        )
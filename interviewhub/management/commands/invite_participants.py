@@ -0,0 +1,79 @@
+import sys
+from itertools import chain
+
+from django.core.management.base import BaseCommand, CommandError
+
+from interviewhub.invitations import (
+    CHUNK_SIZE,
+    invite_participants,
+    read_csv,
+    remove_participants,
+)
+from interviewhub.models import Interview
+
+
+class Command(BaseCommand):
+    help = (
+        "Invite users to an interview (or uninvite them with --remove), given by id, "
+        "username or a CSV file with an `id` and/or `username` column."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("interview", type=int)
+        parser.add_argument("--csv", dest="path", help='CSV file, "-" for stdin.')
+        parser.add_argument("--id", type=int, action="append", dest="ids", default=[])
+        parser.add_argument("--username", action="append", dest="usernames", default=[])
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument("--remove", action="store_true", help="Uninvite the users.")
+        group.add_argument(
+            "--replace",
+            action="store_true",
+            help="Make the list exactly these users: uninvite everyone else.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(
+        self,
+        *args,
+        interview,
+        path=None,
+        ids,
+        usernames,
+        remove=False,
+        replace=False,
+        chunk_size=CHUNK_SIZE,
+        **options,
+    ):
+        if not Interview.objects.filter(pk=interview).exists():
+            raise CommandError(f"Interview {interview} does not exist.")
+
+        if not (path or ids or usernames):
+            raise CommandError("Pass users with --csv, --id or --username.")
+
+        stream = None
+        refs = [*ids, *usernames]
+        if path:
+            stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+            # Read as the chunks go: chunks before a bad line stay applied
+            refs = chain(refs, read_csv(stream))
+        try:
+            if remove:
+                report = remove_participants(interview, refs, chunk_size=chunk_size)
+            else:
+                report = invite_participants(
+                    interview, refs, replace=replace, chunk_size=chunk_size
+                )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        finally:
+            if stream is not None and stream is not sys.stdin:
+                stream.close()
+
+        for ref in report["unknown"]:
+            self.stderr.write(f"no such user: {ref}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Interview {interview}: {report['added']} added, {report['removed']} removed, "
+                f"{report['not_found']} not found."
+            )
+        )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from interviewhub.progress import rebuild_progress
+from interviewhub.results import rebuild_results
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the per-question results aggregates and the participant progress "
+        "from the submissions table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interview",
+            type=int,
+            action="append",
+            dest="interviews",
+            help="Only rebuild this interview (repeatable). Default: all interviews.",
+        )
+
+    def handle(self, *args, interviews=None, **options):
+        buckets = rebuild_results(interviews)
+        participants = rebuild_progress(interviews)
+        scope = f"interviews {interviews}" if interviews else "all interviews"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt results for {scope} ({buckets} buckets, {participants} participants)."
+            )
+        )
@@ -0,0 +1,44 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from interviewhub.scoring import claim_jobs, get_scorer, run_jobs, worker_id
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute Submission.metric_score for queued submissions. "
+        "Run as many workers as needed, they never claim the same job."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=settings.SCORING_BATCH_SIZE)
+        parser.add_argument(
+            "--idle-sleep", type=float, default=2.0, help="Seconds to wait when the queue is empty."
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Drain the due jobs, then exit instead of polling."
+        )
+
+    def handle(self, *args, batch_size, idle_sleep, once, **options):
+        scorer = get_scorer()
+        worker = worker_id()
+        total_done = total_failed = 0
+        self.stdout.write(f"score_worker {worker} using {type(scorer).__name__}")
+        try:
+            while True:
+                ids = claim_jobs(batch_size, worker)
+                if not ids:
+                    if once:
+                        break
+                    time.sleep(idle_sleep)
+                    continue
+                done, failed = run_jobs(ids, scorer, worker)
+                total_done += done
+                total_failed += failed
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(
+            self.style.SUCCESS(f"Scored {total_done} submissions, {total_failed} failed.")
+        )
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviewhub', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnswerBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.CharField(max_length=255)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answer_buckets', to='interviewhub.interview')),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answer_buckets', to='interviewhub.question')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('interview', 'question', 'bucket'), name='uniq_answer_bucket')],
+            },
+        ),
+        migrations.CreateModel(
+            name='QuestionResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('response_count', models.PositiveIntegerField(default=0)),
+                ('score_count', models.PositiveIntegerField(default=0, help_text='Responses with a metric_score')),
+                ('score_sum', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='interviewhub.interview')),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='interviewhub.question')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('interview', 'question'), name='uniq_question_result')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviewhub', '0002_results_aggregates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='interview',
+            options={'ordering': ['-created_at', '-id']},
+        ),
+        migrations.AlterModelOptions(
+            name='question',
+            options={'ordering': ['-created_at', '-id']},
+        ),
+        migrations.AlterModelOptions(
+            name='submission',
+            options={'ordering': ['-submitted_at', '-id']},
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['-created_at', '-id'], name='interview_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['-created_at', '-id'], name='question_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['candidate', '-submitted_at', '-id'], name='submission_candidate_idx'),
+        ),
+    ]
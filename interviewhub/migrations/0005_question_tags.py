@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviewhub', '0004_question_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('question_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-question_count', 'name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='QuestionTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='interviewhub.question')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_links', to='interviewhub.tag')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='indexed_tags',
+            field=models.ManyToManyField(blank=True, related_name='questions', through='interviewhub.QuestionTag', to='interviewhub.tag'),
+        ),
+        migrations.AddIndex(
+            model_name='questiontag',
+            index=models.Index(fields=['tag', 'question'], name='questiontag_tag_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='questiontag',
+            constraint=models.UniqueConstraint(fields=('question', 'tag'), name='uniq_question_tag'),
+        ),
+    ]
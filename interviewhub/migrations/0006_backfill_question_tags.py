@@ -0,0 +1,40 @@
+from collections import Counter
+
+from django.db import migrations
+
+
+def backfill(apps, schema_editor):
+    Question = apps.get_model("interviewhub", "Question")
+    Tag = apps.get_model("interviewhub", "Tag")
+    QuestionTag = apps.get_model("interviewhub", "QuestionTag")
+
+    links = []
+    counts = Counter()
+    for qid, tags in Question.objects.values_list("id", "tags").iterator(chunk_size=2000):
+        names = {t.strip()[:100] for t in tags or [] if isinstance(t, str) and t.strip()}
+        links += [(qid, name) for name in names]
+        counts.update(names)
+
+    Tag.objects.bulk_create(
+        [Tag(name=name, question_count=n) for name, n in counts.items()], batch_size=1000
+    )
+    tag_ids = dict(Tag.objects.values_list("name", "id"))
+    QuestionTag.objects.bulk_create(
+        [QuestionTag(question_id=qid, tag_id=tag_ids[name]) for qid, name in links],
+        batch_size=1000,
+    )
+
+
+def clear(apps, schema_editor):
+    apps.get_model("interviewhub", "QuestionTag").objects.all().delete()
+    apps.get_model("interviewhub", "Tag").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("interviewhub", "0005_question_tags"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, clear),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviewhub', '0007_scoring_jobs'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='submission',
+            unique_together=set(),
+        ),
+        migrations.AlterField(
+            model_name='answerbucket',
+            name='interview',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='answer_buckets', to='interviewhub.interview'),
+        ),
+        migrations.AlterField(
+            model_name='questionresult',
+            name='interview',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='results', to='interviewhub.interview'),
+        ),
+        migrations.AlterField(
+            model_name='questiontag',
+            name='question',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='interviewhub.question'),
+        ),
+        migrations.AlterField(
+            model_name='questiontag',
+            name='tag',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='question_links', to='interviewhub.tag'),
+        ),
+        migrations.AlterField(
+            model_name='submission',
+            name='candidate',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='submissions', to=settings.AUTH_USER_MODEL, verbose_name='Participant'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-created_at', '-id'], name='interview_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['qtype', '-created_at', '-id'], name='question_qtype_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['interview', 'question'], name='submission_question_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['-question_count', 'name'], name='tag_count_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='submission',
+            constraint=models.UniqueConstraint(fields=('candidate', 'interview', 'question'), name='uniq_submission_answer'),
+        ),
+    ]
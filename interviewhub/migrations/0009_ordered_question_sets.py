@@ -0,0 +1,222 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+POSITION_GAP = 1024
+
+
+# Existing links keep their insertion (id) order
+def backfill_positions(apps, schema_editor):
+    InterviewQuestion = apps.get_model("interviewhub", "InterviewQuestion")
+    changed = []
+    last = None
+    for link in InterviewQuestion.objects.order_by("interview_id", "id").only(
+        "id", "interview_id"
+    ).iterator(chunk_size=2000):
+        position = position + POSITION_GAP if link.interview_id == last else POSITION_GAP
+        last = link.interview_id
+        link.position = position
+        changed.append(link)
+        if len(changed) >= 2000:
+            InterviewQuestion.objects.bulk_update(changed, ["position"])
+            changed = []
+    InterviewQuestion.objects.bulk_update(changed, ["position"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("interviewhub", "0008_access_path_indexes"),
+    ]
+
+    operations = [
+        # The auto-created M2M table becomes InterviewQuestion as is, then gains
+        # its position column
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="InterviewQuestion",
+                    fields=[
+                        (
+                            "id",
+                            models.BigAutoField(
+                                auto_created=True,
+                                primary_key=True,
+                                serialize=False,
+                                verbose_name="ID",
+                            ),
+                        ),
+                        (
+                            "interview",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="question_links",
+                                to="interviewhub.interview",
+                            ),
+                        ),
+                        (
+                            "question",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="interview_links",
+                                to="interviewhub.question",
+                            ),
+                        ),
+                    ],
+                    options={
+                        "db_table": "interviewhub_interview_questions",
+                        "unique_together": {("interview", "question")},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name="interview",
+                    name="questions",
+                    field=models.ManyToManyField(
+                        blank=True,
+                        related_name="interviews",
+                        through="interviewhub.InterviewQuestion",
+                        to="interviewhub.question",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="interviewquestion",
+            name="position",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_positions, migrations.RunPython.noop),
+        migrations.AlterModelOptions(
+            name="interviewquestion",
+            options={"ordering": ["position", "id"]},
+        ),
+        migrations.AlterUniqueTogether(
+            name="interviewquestion",
+            unique_together=set(),
+        ),
+        migrations.AlterField(
+            model_name="interviewquestion",
+            name="interview",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="question_links",
+                to="interviewhub.interview",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="interviewquestion",
+            constraint=models.UniqueConstraint(
+                fields=("interview", "question"), name="uniq_interview_question"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="interviewquestion",
+            index=models.Index(
+                fields=["interview", "position", "id"], name="interviewquestion_pos_idx"
+            ),
+        ),
+        # Frozen question sets
+        migrations.CreateModel(
+            name="QuestionVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("digest", models.CharField(max_length=32)),
+                ("title", models.CharField(max_length=200)),
+                ("body", models.TextField(blank=True)),
+                (
+                    "qtype",
+                    models.CharField(
+                        choices=[
+                            ("Multiple Choice", "Multiple Choice"),
+                            ("Open Ended", "Open Ended"),
+                            ("Scale", "Scale (1-5)"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("options", models.JSONField(blank=True, default=list)),
+                ("tags", models.JSONField(blank=True, default=list)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "question",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="versions",
+                        to="interviewhub.question",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("question", "digest"), name="uniq_question_version"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="QuestionSetSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("digest", models.CharField(max_length=32)),
+                (
+                    "question_versions",
+                    models.JSONField(default=list, help_text="QuestionVersion ids, in order"),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "interview",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="snapshots",
+                        to="interviewhub.interview",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("interview", "digest"), name="uniq_question_set_snapshot"
+                    )
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="interview",
+            name="question_set_version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name="interview",
+            name="snapshot",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="interviewhub.questionsetsnapshot",
+            ),
+        ),
+        migrations.AddField(
+            model_name="submission",
+            name="snapshot",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.RESTRICT,
+                related_name="submissions",
+                to="interviewhub.questionsetsnapshot",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviewhub', '0009_ordered_question_sets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='external_id',
+            field=models.CharField(blank=True, help_text='Key of the question in an external bank; imports upsert on it.', max_length=100, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviewhub', '0010_question_external_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParticipantProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('not_started', 'Not started'), ('in_progress', 'In progress'), ('completed', 'Completed')], default='not_started', max_length=12)),
+                ('answered_count', models.PositiveIntegerField(default=0)),
+                ('first_answer_at', models.DateTimeField(blank=True, null=True)),
+                ('last_answer_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='interview_progress', to=settings.AUTH_USER_MODEL)),
+                ('interview', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='progress', to='interviewhub.interview')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['interview', 'status', 'candidate'], name='progress_status_idx')],
+                'constraints': [models.UniqueConstraint(fields=('interview', 'candidate'), name='uniq_participant_progress')],
+            },
+        ),
+    ]
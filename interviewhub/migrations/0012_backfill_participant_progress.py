@@ -0,0 +1,53 @@
+from django.db import migrations
+from django.db.models import Count, Max, Min
+
+
+def backfill(apps, schema_editor):
+    Interview = apps.get_model("interviewhub", "Interview")
+    InterviewQuestion = apps.get_model("interviewhub", "InterviewQuestion")
+    Submission = apps.get_model("interviewhub", "Submission")
+    ParticipantProgress = apps.get_model("interviewhub", "ParticipantProgress")
+
+    totals = dict(
+        InterviewQuestion.objects.order_by()
+        .values("interview_id")
+        .annotate(n=Count("id"))
+        .values_list("interview_id", "n")
+    )
+    rows = {}
+    invited = Interview.allowed_participants.through.objects.values_list("interview_id", "user_id")
+    for interview_id, user_id in invited.iterator(chunk_size=2000):
+        rows[(interview_id, user_id)] = ParticipantProgress(
+            interview_id=interview_id, candidate_id=user_id, status="not_started"
+        )
+    answered = (
+        Submission.objects.order_by()
+        .values("interview_id", "candidate_id")
+        .annotate(n=Count("id"), first=Min("submitted_at"), last=Max("submitted_at"))
+    )
+    for row in answered.iterator(chunk_size=2000):
+        completed = row["n"] >= totals.get(row["interview_id"], 0)
+        rows[(row["interview_id"], row["candidate_id"])] = ParticipantProgress(
+            interview_id=row["interview_id"],
+            candidate_id=row["candidate_id"],
+            answered_count=row["n"],
+            first_answer_at=row["first"],
+            last_answer_at=row["last"],
+            status="completed" if completed else "in_progress",
+            completed_at=row["last"] if completed else None,
+        )
+    ParticipantProgress.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+def clear(apps, schema_editor):
+    apps.get_model("interviewhub", "ParticipantProgress").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("interviewhub", "0011_participant_progress"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, clear),
+    ]
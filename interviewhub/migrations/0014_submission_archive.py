@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviewhub', '0013_interview_visibility_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(help_text='Relative to SUBMISSION_ARCHIVE_DIR.', max_length=255)),
+                ('anonymised', models.BooleanField(default=False, help_text='Rows were stored without candidate identity or meta.')),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('size', models.PositiveBigIntegerField(default=0, help_text='Bytes of complete batches.')),
+                ('last_submission_id', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('interview', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='archive', to='interviewhub.interview')),
+            ],
+        ),
+    ]
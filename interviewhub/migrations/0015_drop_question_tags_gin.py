@@ -0,0 +1,33 @@
+from django.db import migrations
+
+# Tag filters go through Tag/QuestionTag (0005); the GIN index on the `tags` JSON
+# column from 0004 is read by nothing but still updated on every question write.
+QUESTION_TABLE = "interviewhub_question"
+
+POSTGRES_FORWARD = ["DROP INDEX IF EXISTS question_tags_idx"]
+POSTGRES_REVERSE = [
+    f"CREATE INDEX IF NOT EXISTS question_tags_idx ON {QUESTION_TABLE} "
+    "USING GIN (tags jsonb_path_ops)",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        for sql in statements.get(vendor, []):
+            schema_editor.execute(sql)
+
+    return run
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("interviewhub", "0014_submission_archive"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"postgresql": POSTGRES_FORWARD}),
+            _run({"postgresql": POSTGRES_REVERSE}),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 class Question(models.Model):
@@ -14,10 +15,21 @@ class Question(models.Model):
     ]
 
     # Question attrs
+    external_id = models.CharField(
+        max_length=100,
+        unique=True,
+        null=True,
+        blank=True,
+        help_text="Key of the question in an external bank; imports upsert on it.",
+    )
     title = models.CharField(max_length=200, help_text="Short prompt shown to participants.")
     body = models.TextField(blank=True, help_text="Longer guidance or context.")
     qtype = models.CharField(max_length=16, choices=QUESTION_TYPES, default=OPEN_ENDED)
     tags = models.JSONField(default=list, blank=True)
+    # Indexed copy of `tags`, kept in sync on save (see tags.py)
+    indexed_tags = models.ManyToManyField(
+        "Tag", through="QuestionTag", related_name="questions", blank=True
+    )
     options = models.JSONField(
         default=list, blank=True, help_text="For Multiple Choice: ['A', 'B', ...]"
     )
@@ -25,12 +37,51 @@ class Question(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        ordering = ["-created_at"]
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="question_created_idx"),
+            # ?qtype= listing, newest first
+            models.Index(fields=["qtype", "-created_at", "-id"], name="question_qtype_idx"),
+        ]
 
     def __str__(self):
         return f"[{self.qtype}] {self.title}"
 
 
+class Tag(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    question_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-question_count", "name"]
+        # Tag list: used tags, most used first
+        indexes = [models.Index(fields=["-question_count", "name"], name="tag_count_idx")]
+
+    def __str__(self):
+        return self.name
+
+
+class QuestionTag(models.Model):
+    # No single-column FK indexes: the unique constraint and the index below lead
+    # with question and tag respectively
+    question = models.ForeignKey(
+        Question, on_delete=models.CASCADE, related_name="tag_links", db_index=False
+    )
+    tag = models.ForeignKey(
+        Tag, on_delete=models.CASCADE, related_name="question_links", db_index=False
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["question", "tag"], name="uniq_question_tag")
+        ]
+        # Tag -> questions lookups (filters and facets) read only this index
+        indexes = [models.Index(fields=["tag", "question"], name="questiontag_tag_idx")]
+
+    def __str__(self):
+        return f"QuestionTag(q={self.question_id}, tag={self.tag_id})"
+
+
 class Interview(models.Model):
     CONF_PUBLIC = "public"
     CONF_INTERNAL = "internal"
@@ -48,7 +99,11 @@ class Interview(models.Model):
     )
     title = models.CharField("Session title", max_length=200)
     description = models.TextField(blank=True, help_text="Guidance shown to participants")
-    questions = models.ManyToManyField(Question, related_name="interviews", blank=True)
+    # Ordered through InterviewQuestion.position; edit with set_interview_questions()
+    # (question_sets.py), which only writes the rows that change
+    questions = models.ManyToManyField(
+        Question, through="InterviewQuestion", related_name="interviews", blank=True
+    )
     scheduled_at = models.DateTimeField(null=True, blank=True)
     is_published = models.BooleanField(
         default=False, help_text="Visible to participants if enabled."
@@ -68,23 +123,119 @@ class Interview(models.Model):
         blank=True,
         help_text="Empty = any authenticated user.",
     )
+    # Bumped whenever the question set or one of its questions changes. `snapshot`
+    # is the frozen copy of the current version, taken on the first submission
+    # after a change (question_sets.current_snapshot)
+    question_set_version = models.PositiveIntegerField(default=1)
+    snapshot = models.ForeignKey(
+        "QuestionSetSnapshot",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        ordering = ["-created_at"]
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="interview_created_idx"),
+            # Participant-facing listings only ever show published interviews
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(is_published=True),
+                name="interview_published_idx",
+            ),
+            # Holds every column of the visibility filter (visibility.py): counts
+            # of visible interviews read this index, not the table
+            models.Index(fields=["owner", "is_published"], name="interview_visibility_idx"),
+        ]
 
     def __str__(self):
         return self.title
 
 
+class InterviewQuestion(models.Model):
+    # Positions are spaced POSITION_GAP apart, so a question can be moved or
+    # inserted between two others by writing its own row only
+    interview = models.ForeignKey(
+        Interview, on_delete=models.CASCADE, related_name="question_links", db_index=False
+    )
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name="interview_links")
+    position = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        # Reuses the table of the former auto-created M2M
+        db_table = "interviewhub_interview_questions"
+        ordering = ["position", "id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["interview", "question"], name="uniq_interview_question"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["interview", "position", "id"], name="interviewquestion_pos_idx")
+        ]
+
+    def __str__(self):
+        return f"InterviewQuestion(interview={self.interview_id}, q={self.question_id})"
+
+
+class QuestionVersion(models.Model):
+    # Frozen content of a question, written once per distinct content and
+    # shared by every snapshot that saw it. Outlives the question itself.
+    question = models.ForeignKey(
+        Question, on_delete=models.SET_NULL, null=True, related_name="versions"
+    )
+    digest = models.CharField(max_length=32)
+    title = models.CharField(max_length=200)
+    body = models.TextField(blank=True)
+    qtype = models.CharField(max_length=16, choices=Question.QUESTION_TYPES)
+    options = models.JSONField(default=list, blank=True)
+    tags = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["question", "digest"], name="uniq_question_version")
+        ]
+
+    def __str__(self):
+        return f"QuestionVersion(q={self.question_id}, {self.digest[:8]})"
+
+
+class QuestionSetSnapshot(models.Model):
+    # Immutable, ordered list of the question versions an interview showed.
+    # Submissions point at it; identical sets share one row (same digest).
+    interview = models.ForeignKey(
+        Interview, on_delete=models.CASCADE, related_name="snapshots", db_index=False
+    )
+    digest = models.CharField(max_length=32)
+    question_versions = models.JSONField(default=list, help_text="QuestionVersion ids, in order")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["interview", "digest"], name="uniq_question_set_snapshot"
+            )
+        ]
+
+    def __str__(self):
+        return f"QuestionSetSnapshot(interview={self.interview_id}, {self.digest[:8]})"
+
+
 class Submission(models.Model):
     # Submission attrs
+    # candidate needs no index of its own: uniq_submission_answer and
+    # submission_candidate_idx both lead with it
     candidate = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="submissions",
         verbose_name="Participant",
+        db_index=False,
     )
     interview = models.ForeignKey(
         Interview, on_delete=models.CASCADE, related_name="submissions", verbose_name="Session"
@@ -99,11 +250,167 @@ class Submission(models.Model):
     meta = models.JSONField(
         default=dict, blank=True, help_text="Freeform context (dept, office, role)"
     )
+    # Question set the participant answered (question_sets.py); empty for rows
+    # written before snapshots existed
+    snapshot = models.ForeignKey(
+        QuestionSetSnapshot,
+        on_delete=models.RESTRICT,
+        null=True,
+        blank=True,
+        related_name="submissions",
+    )
     submitted_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        unique_together = [("candidate", "interview", "question")]
-        ordering = ["-submitted_at"]
+        ordering = ["-submitted_at", "-id"]
+        constraints = [
+            # One answer per participant, interview and question
+            models.UniqueConstraint(
+                fields=["candidate", "interview", "question"], name="uniq_submission_answer"
+            )
+        ]
+        indexes = [
+            # Per-user listing, newest first (SubmissionListView)
+            models.Index(
+                fields=["candidate", "-submitted_at", "-id"], name="submission_candidate_idx"
+            ),
+            # Per-question answers of an interview (results rebuild, sessions)
+            models.Index(fields=["interview", "question"], name="submission_question_idx"),
+        ]
 
     def __str__(self):
         return f"Submission(user={self.candidate_id}, q={self.question_id})"
+
+
+class QuestionResult(models.Model):
+    # Running totals per (interview, question), maintained on every submission write
+    # interview is covered by uniq_question_result
+    interview = models.ForeignKey(
+        Interview, on_delete=models.CASCADE, related_name="results", db_index=False
+    )
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name="results")
+    response_count = models.PositiveIntegerField(default=0)
+    score_count = models.PositiveIntegerField(default=0, help_text="Responses with a metric_score")
+    score_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["interview", "question"], name="uniq_question_result")
+        ]
+
+    def __str__(self):
+        return f"QuestionResult(interview={self.interview_id}, q={self.question_id})"
+
+
+class AnswerBucket(models.Model):
+    # Answer counts per normalised value: "1".."5" for Scale, option text for Multiple Choice
+    # interview is covered by uniq_answer_bucket
+    interview = models.ForeignKey(
+        Interview, on_delete=models.CASCADE, related_name="answer_buckets", db_index=False
+    )
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name="answer_buckets")
+    bucket = models.CharField(max_length=255)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["interview", "question", "bucket"], name="uniq_answer_bucket"
+            )
+        ]
+
+    def __str__(self):
+        return f"AnswerBucket(q={self.question_id}, {self.bucket!r}={self.count})"
+
+
+class ParticipantProgress(models.Model):
+    # How far one participant is through one interview, maintained with every
+    # submission write (progress.py). Invited participants get a not_started row
+    # as soon as they are added to allowed_participants.
+    NOT_STARTED = "not_started"
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+
+    STATUS_CHOICES = [
+        (NOT_STARTED, "Not started"),
+        (IN_PROGRESS, "In progress"),
+        (COMPLETED, "Completed"),
+    ]
+
+    # interview is covered by uniq_participant_progress
+    interview = models.ForeignKey(
+        Interview, on_delete=models.CASCADE, related_name="progress", db_index=False
+    )
+    candidate = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="interview_progress"
+    )
+    status = models.CharField(max_length=12, choices=STATUS_CHOICES, default=NOT_STARTED)
+    answered_count = models.PositiveIntegerField(default=0)
+    first_answer_at = models.DateTimeField(null=True, blank=True)
+    last_answer_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["interview", "candidate"], name="uniq_participant_progress"
+            )
+        ]
+        # Progress pages: one status of an interview, by participant
+        indexes = [
+            models.Index(fields=["interview", "status", "candidate"], name="progress_status_idx")
+        ]
+
+    def __str__(self):
+        return f"ParticipantProgress(interview={self.interview_id}, user={self.candidate_id})"
+
+
+class ScoringJob(models.Model):
+    # Pending metric_score computation for one submission, consumed by `manage.py score_worker`
+    PENDING = "pending"
+    RUNNING = "running"
+    FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (FAILED, "Failed"),
+    ]
+
+    submission = models.OneToOneField(
+        Submission, on_delete=models.CASCADE, related_name="scoring_job"
+    )
+    status = models.CharField(max_length=8, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now, help_text="Not claimed before this.")
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["run_after", "id"]
+        # Workers claim the oldest due jobs of a status
+        indexes = [models.Index(fields=["status", "run_after", "id"], name="scoringjob_claim_idx")]
+
+    def __str__(self):
+        return f"ScoringJob(submission={self.submission_id}, {self.status})"
+
+
+class SubmissionArchive(models.Model):
+    # Submissions of a closed interview moved out of the live table into a gzip
+    # JSON Lines file under SUBMISSION_ARCHIVE_DIR (archive.py). The file grows one
+    # batch at a time; the counters below describe the batches already deleted
+    # from the table, so an interrupted run resumes where it stopped.
+    interview = models.OneToOneField(Interview, on_delete=models.CASCADE, related_name="archive")
+    path = models.CharField(max_length=255, help_text="Relative to SUBMISSION_ARCHIVE_DIR.")
+    anonymised = models.BooleanField(
+        default=False, help_text="Rows were stored without candidate identity or meta."
+    )
+    row_count = models.PositiveIntegerField(default=0)
+    size = models.PositiveBigIntegerField(default=0, help_text="Bytes of complete batches.")
+    last_submission_id = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"SubmissionArchive(interview={self.interview_id}, rows={self.row_count})"
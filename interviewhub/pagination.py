@@ -0,0 +1,191 @@
+import base64
+import datetime
+import json
+
+from django.conf import settings
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+# Full precision: DjangoJSONEncoder drops microseconds, which breaks the seek on ties
+def _cursor_value(value):
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+def _page_size(request, param, default, maximum):
+    try:
+        size = int(request.query_params[param])
+    except (KeyError, ValueError):
+        return default
+    return min(size, maximum) if size > 0 else default
+
+
+class KeysetPagination(BasePagination):
+    # Seek pagination on the view's keyset_ordering, e.g. ("-submitted_at", "-id").
+    # Each page is a range scan on the matching index: no OFFSET, no COUNT(*).
+    # The cursor holds the ordering values of the edge row and the direction.
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self._page(list(self._window(queryset, request, view)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        return self._page([row async for row in self._window(queryset, request, view)])
+
+    # The page size + 1 rows past the cursor, in scan order
+    def _window(self, queryset, request, view):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = tuple(view.keyset_ordering)
+        self.page_size = _page_size(
+            request,
+            self.page_size_query_param,
+            settings.REST_FRAMEWORK["PAGE_SIZE"],
+            settings.API_MAX_PAGE_SIZE,
+        )
+        self.fields = [queryset.model._meta.get_field(o.lstrip("-")) for o in self.ordering]
+
+        self.cursor = self.decode_cursor(request)
+        self.reverse = self.cursor is not None and self.cursor[1]
+        ordering = self.ordering
+        if self.reverse:
+            ordering = tuple(o[1:] if o.startswith("-") else f"-{o}" for o in ordering)
+
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            queryset = queryset.filter(self._seek(self.cursor[0], ordering))
+        return queryset[: self.page_size + 1]
+
+    def _page(self, rows):
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if self.reverse:
+            rows.reverse()
+
+        # Going forwards there is a previous page if we came from a cursor,
+        # going backwards there is always a next page (the one we came from).
+        self.next_key = self.previous_key = None
+        if rows and (has_more if not self.reverse else True):
+            self.next_key = self._key(rows[-1])
+        if rows and (self.cursor is not None if not self.reverse else has_more):
+            self.previous_key = self._key(rows[0])
+        return rows
+
+    # Rows strictly after `values` in `ordering`:
+    #   a < va OR (a = va AND b < vb) ... for descending columns
+    def _seek(self, values, ordering):
+        cond = Q()
+        for i, (order, value) in enumerate(zip(ordering, values)):
+            name = order.lstrip("-")
+            lookup = "lt" if order.startswith("-") else "gt"
+            step = Q(**{f"{name}__{lookup}": value})
+            for prev, prev_value in zip(ordering[:i], values[:i]):
+                step &= Q(**{prev.lstrip("-"): prev_value})
+            cond |= step
+        return cond
+
+    def _key(self, row):
+        return [getattr(row, f.attname) for f in self.fields]
+
+    def decode_cursor(self, request):
+        raw = request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(raw.encode("ascii")))
+            values = [f.to_python(v) for f, v in zip(self.fields, data["k"], strict=True)]
+            return values, bool(data.get("r"))
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+
+    def encode_cursor(self, key, reverse):
+        data = json.dumps({"k": key, "r": int(reverse)}, default=_cursor_value)
+        token = base64.urlsafe_b64encode(data.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def get_next_link(self):
+        if self.next_key is None:
+            return None
+        return self.encode_cursor(self.next_key, reverse=False)
+
+    def get_previous_link(self):
+        if self.previous_key is None:
+            return None
+        return self.encode_cursor(self.previous_key, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+
+class HybridPagination(PageNumberPagination):
+    # Page numbers by default; keyset pagination when the view declares a
+    # keyset_ordering and the client asks for it (?pagination=cursor or ?cursor=...).
+    # Querysets ordered otherwise (ranked search results) stay page-numbered: the
+    # keyset would replace their order.
+    page_size_query_param = "page_size"
+    max_page_size = settings.API_MAX_PAGE_SIZE
+    keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self._wants_keyset(queryset, request, view):
+            self.keyset = KeysetPagination()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    # Same pages as paginate_queryset, for the async views (async_views.py):
+    # the COUNT and the page rows go through the async ORM.
+    async def apaginate_queryset(self, queryset, request, view=None):
+        if self._wants_keyset(queryset, request, view):
+            self.keyset = KeysetPagination()
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg) from exc
+        bottom = (number - 1) * page_size
+        rows = [row async for row in queryset[bottom : bottom + page_size]]
+        self.page = paginator._get_page(rows, number, paginator)
+        return rows
+
+    def _wants_keyset(self, queryset, request, view):
+        params = request.query_params
+        ordering = tuple(getattr(view, "keyset_ordering", None) or ())
+        if not ordering or not (params.get("pagination") == "cursor" or "cursor" in params):
+            return False
+        return queryset.query.order_by in ((), ordering)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_next_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_next_link()
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_previous_link()
+        return super().get_previous_link()
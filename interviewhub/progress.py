@@ -0,0 +1,264 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    IntegerField,
+    Max,
+    Min,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+
+from .models import (
+    Interview,
+    InterviewQuestion,
+    ParticipantProgress,
+    Submission,
+    SubmissionArchive,
+)
+from .response_cache import cached_fragment, invalidate
+
+# Per-participant progress (ParticipantProgress), kept in step with the submissions.
+#
+# Submission writes adjust the (interview, candidate) rows they touch in the same
+# transaction: one UPDATE per participant, computed from the row's current values,
+# so concurrent answers of one participant add up instead of overwriting each
+# other. Progress reads never touch the submissions table.
+#
+# The per-status summary is a GROUP BY over an interview's rows; it is served
+# from the response cache (progress_summary()) under scope "progress:<id>", which
+# every write below bumps.
+
+STATUSES = (
+    ParticipantProgress.NOT_STARTED,
+    ParticipantProgress.IN_PROGRESS,
+    ParticipantProgress.COMPLETED,
+)
+
+
+def _changed(interview_ids):
+    invalidate(*{f"progress:{i}" for i in interview_ids})
+
+
+# {interview_id: number of questions}
+def question_counts(interview_ids):
+    return dict(
+        InterviewQuestion.objects.filter(interview_id__in=set(interview_ids))
+        .order_by()
+        .values("interview_id")
+        .annotate(n=Count("id"))
+        .values_list("interview_id", "n")
+    )
+
+
+# Apply new submissions to the progress rows. `questions` is the interview's
+# question count when every submission belongs to one interview and the caller
+# already knows it. Call it inside the transaction that writes the submissions.
+def record_progress(submissions, questions=None):
+    if not submissions:
+        return
+    pairs = defaultdict(list)
+    for s in submissions:
+        pairs[(s.interview_id, s.candidate_id)].append(s.submitted_at)
+    if questions is None:
+        totals = question_counts(i for i, _c in pairs)
+    else:
+        totals = dict.fromkeys({i for i, _c in pairs}, questions)
+
+    ParticipantProgress.objects.bulk_create(
+        [ParticipantProgress(interview_id=i, candidate_id=c) for i, c in pairs],
+        ignore_conflicts=True,
+    )
+    _changed(totals)
+    for (interview_id, candidate_id), times in pairs.items():
+        n = len(times)
+        first, last = min(times), max(times)
+        # Right-hand sides see the row as it was before this UPDATE
+        completes = Q(answered_count__gte=totals.get(interview_id, 0) - n)
+        ParticipantProgress.objects.filter(
+            interview_id=interview_id, candidate_id=candidate_id
+        ).update(
+            answered_count=F("answered_count") + n,
+            first_answer_at=Coalesce("first_answer_at", Value(first)),
+            last_answer_at=Value(last),
+            status=Case(
+                When(completes, then=Value(ParticipantProgress.COMPLETED)),
+                default=Value(ParticipantProgress.IN_PROGRESS),
+            ),
+            completed_at=Case(
+                When(completes & Q(completed_at=None), then=Value(last)),
+                When(completes, then=F("completed_at")),
+                default=None,
+            ),
+        )
+
+
+# Recompute the rows of `pairs` ((interview_id, candidate_id)) from their
+# submissions, after deletes. Reads only those participants' answers.
+def refresh_progress(pairs):
+    pairs = set(pairs)
+    if not pairs:
+        return
+    match = Q()
+    for interview_id, candidate_id in pairs:
+        match |= Q(interview_id=interview_id, candidate_id=candidate_id)
+    answered = {
+        (row["interview_id"], row["candidate_id"]): row
+        for row in Submission.objects.filter(match)
+        .order_by()
+        .values("interview_id", "candidate_id")
+        .annotate(n=Count("id"), first=Min("submitted_at"), last=Max("submitted_at"))
+    }
+    totals = question_counts(i for i, _c in pairs)
+
+    with transaction.atomic():
+        _changed(i for i, _c in pairs)
+        for interview_id, candidate_id in pairs:
+            row = answered.get((interview_id, candidate_id))
+            n = row["n"] if row else 0
+            if not n:
+                status = ParticipantProgress.NOT_STARTED
+            elif n >= totals.get(interview_id, 0):
+                status = ParticipantProgress.COMPLETED
+            else:
+                status = ParticipantProgress.IN_PROGRESS
+            ParticipantProgress.objects.filter(
+                interview_id=interview_id, candidate_id=candidate_id
+            ).update(
+                answered_count=n,
+                first_answer_at=row["first"] if row else None,
+                last_answer_at=row["last"] if row else None,
+                status=status,
+                completed_at=(
+                    Coalesce("completed_at", Value(row["last"]))
+                    if status == ParticipantProgress.COMPLETED
+                    else None
+                ),
+            )
+
+
+# The question count of the interviews changed: re-derive every status from the
+# stored answered counts (one UPDATE, no submission reads)
+def question_count_changed(interview_ids):
+    interview_ids = list(interview_ids)
+    if not interview_ids:
+        return
+    total = Subquery(
+        InterviewQuestion.objects.filter(interview_id=OuterRef("interview_id"))
+        .order_by()
+        .values("interview_id")
+        .annotate(n=Count("id"))
+        .values("n"),
+        output_field=IntegerField(),
+    )
+    completes = Q(answered_count__gt=0, answered_count__gte=Coalesce(total, 0))
+    _changed(interview_ids)
+    ParticipantProgress.objects.filter(interview_id__in=interview_ids).update(
+        status=Case(
+            When(answered_count=0, then=Value(ParticipantProgress.NOT_STARTED)),
+            When(completes, then=Value(ParticipantProgress.COMPLETED)),
+            default=Value(ParticipantProgress.IN_PROGRESS),
+        ),
+        completed_at=Case(
+            When(completes, then=Coalesce("completed_at", "last_answer_at")),
+            default=None,
+        ),
+    )
+
+
+def _by_interview(pairs):
+    users = defaultdict(set)
+    for interview_id, user_id in pairs:
+        users[interview_id].add(user_id)
+    return users.items()
+
+
+# Invited participants ((interview_id, user_id) pairs) are listed before they answer
+def participants_invited(pairs):
+    pairs = list(pairs)
+    _changed(i for i, _u in pairs)
+    ParticipantProgress.objects.bulk_create(
+        [ParticipantProgress(interview_id=i, candidate_id=u) for i, u in pairs],
+        ignore_conflicts=True,
+        batch_size=1000,
+    )
+
+
+# Uninvited participants who never answered are dropped; those with answers stay
+def participants_uninvited(pairs):
+    for interview_id, user_ids in _by_interview(pairs):
+        _changed([interview_id])
+        ParticipantProgress.objects.filter(
+            interview_id=interview_id, candidate_id__in=user_ids, answered_count=0
+        ).delete()
+
+
+# Recompute the progress rows from the submissions and allowlists (all interviews
+# or a subset); used by `manage.py rebuild_results`. Archived interviews
+# (archive.py) keep their rows: their answers are no longer in the table.
+def rebuild_progress(interview_ids=None):
+    archived = SubmissionArchive.objects.values("interview_id")
+    subs = Submission.objects.exclude(interview_id__in=archived)
+    invited = Interview.allowed_participants.through.objects.exclude(interview_id__in=archived)
+    stale = ParticipantProgress.objects.exclude(interview_id__in=archived)
+    if interview_ids is not None:
+        subs = subs.filter(interview_id__in=interview_ids)
+        invited = invited.filter(interview_id__in=interview_ids)
+        stale = stale.filter(interview_id__in=interview_ids)
+
+    answered = (
+        subs.order_by()
+        .values("interview_id", "candidate_id")
+        .annotate(n=Count("id"), first=Min("submitted_at"), last=Max("submitted_at"))
+    )
+    rows = {}
+    for interview_id, user_id in invited.values_list("interview_id", "user_id").iterator(
+        chunk_size=2000
+    ):
+        rows[(interview_id, user_id)] = ParticipantProgress(
+            interview_id=interview_id, candidate_id=user_id
+        )
+    for row in answered.iterator(chunk_size=2000):
+        rows[(row["interview_id"], row["candidate_id"])] = ParticipantProgress(
+            interview_id=row["interview_id"],
+            candidate_id=row["candidate_id"],
+            answered_count=row["n"],
+            first_answer_at=row["first"],
+            last_answer_at=row["last"],
+            status=ParticipantProgress.IN_PROGRESS,
+        )
+
+    with transaction.atomic():
+        # Interviews left without rows; the others are bumped by question_count_changed
+        _changed(stale.order_by().values_list("interview_id", flat=True).distinct())
+        stale.delete()
+        ParticipantProgress.objects.bulk_create(rows.values(), batch_size=1000)
+        question_count_changed({i for i, _c in rows})
+    return len(rows)
+
+
+# {"questions": n, "not_started": n, "in_progress": n, "completed": n}. The
+# counts are a GROUP BY over the interview's progress rows (progress_status_idx),
+# run once per change of the "progress:<id>" scope.
+def progress_summary(interview_id):
+    def build():
+        counts = dict(
+            ParticipantProgress.objects.filter(interview_id=interview_id)
+            .order_by()
+            .values("status")
+            .annotate(n=Count("id"))
+            .values_list("status", "n")
+        )
+        return {
+            "questions": question_counts([interview_id]).get(interview_id, 0),
+            **{status: counts.get(status, 0) for status in STATUSES},
+        }
+
+    return cached_fragment("progress_summary", [f"progress:{interview_id}"], build)
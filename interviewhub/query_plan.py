@@ -0,0 +1,62 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+
+
+# Build the only()/prefetch_related() calls a serializer needs to render a queryset.
+# Concrete fields are projected with only(), to-many relations are prefetched with
+# only the columns that will be read. SerializerMethodFields can't be inspected, so
+# serializers declare what they read in Meta.query_plan:
+#   query_plan = {"questions_data": ("questions", ["id", "title"])}
+# Fields of a related row's own foreign keys ("question__title") are joined in
+# with select_related().
+def plan_queryset(queryset, serializer_class):
+    only, related = _plan(queryset.model, serializer_class)
+    prefetches = [
+        Prefetch(relation, queryset=_related_queryset(model, fields))
+        for relation, (model, fields) in related.items()
+    ]
+    return queryset.only(*only).prefetch_related(*prefetches)
+
+
+def _related_queryset(model, fields):
+    joined = sorted({f.split("__")[0] for f in fields if "__" in f})
+    return model._default_manager.select_related(*joined).only(*fields, *joined)
+
+
+@lru_cache(maxsize=None)
+def _plan(model, serializer_class):
+    opts = model._meta
+    only = {opts.pk.attname}
+    related = {}
+    hints = getattr(getattr(serializer_class, "Meta", None), "query_plan", {})
+
+    def need(relation, fields):
+        model_field = opts.get_field(relation)
+        target = model_field.related_model
+        columns = related.setdefault(relation, (target, {target._meta.pk.attname}))[1]
+        columns.update(fields)
+        if model_field.one_to_many:
+            # Reverse FK prefetch matches rows back on the FK column
+            columns.add(model_field.field.attname)
+
+    for name, field in serializer_class().fields.items():
+        if field.write_only:
+            continue
+        if name in hints:
+            need(*hints[name])
+            continue
+        try:
+            model_field = opts.get_field(field.source.split(".")[0])
+        except FieldDoesNotExist:
+            continue
+        if model_field.many_to_many or model_field.one_to_many:
+            need(model_field.name, ())
+        elif model_field.concrete:
+            only.add(model_field.attname)
+
+    return (
+        tuple(sorted(only)),
+        {relation: (target, tuple(sorted(cols))) for relation, (target, cols) in related.items()},
+    )
@@ -0,0 +1,188 @@
+import bisect
+import hashlib
+import json
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import Interview, InterviewQuestion, QuestionSetSnapshot, QuestionVersion
+from .progress import question_count_changed
+from .response_cache import invalidate
+
+# Ordered question sets and their frozen snapshots.
+#
+# InterviewQuestion.position values are spaced POSITION_GAP apart. An edit keeps
+# the longest run of questions that are already in the requested order where they
+# are and only writes the rows around them: moving one question is one UPDATE,
+# whatever the size of the interview. When two neighbours run out of room
+# between them the interview is renumbered once.
+#
+# A snapshot is the ordered list of QuestionVersion ids the interview showed.
+# Versions are stored once per distinct question content and snapshots once per
+# distinct list, so submissions reference history without copying it.
+
+POSITION_GAP = 1024
+CONTENT_FIELDS = ("title", "body", "qtype", "options", "tags")
+
+
+def _digest(value):
+    raw = json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _content(question):
+    return {name: getattr(question, name) for name in CONTENT_FIELDS}
+
+
+# Indexes of the longest strictly increasing subsequence of `values`
+def _longest_increasing(values):
+    tails, tail_idx, prev = [], [], [None] * len(values)
+    for i, value in enumerate(values):
+        k = bisect.bisect_left(tails, value)
+        if k == len(tails):
+            tails.append(value)
+            tail_idx.append(i)
+        else:
+            tails[k] = value
+            tail_idx[k] = i
+        prev[i] = tail_idx[k - 1] if k else None
+    keep = set()
+    i = tail_idx[-1] if tail_idx else None
+    while i is not None:
+        keep.add(i)
+        i = prev[i]
+    return keep
+
+
+# Positions for `wanted` (question ids, in order). `fixed` maps the question ids
+# that keep their row as is to its position; None when everything is renumbered.
+def _positions(wanted, fixed):
+    positions = {}
+    run = []
+    lo = 0
+    for qid in wanted + [None]:
+        if qid is not None and qid not in fixed:
+            run.append(qid)
+            continue
+        hi = fixed[qid] if qid is not None else lo + (len(run) + 1) * POSITION_GAP
+        step = (hi - lo) // (len(run) + 1)
+        if run and step < 1:
+            return None
+        for n, pending in enumerate(run, start=1):
+            positions[pending] = lo + n * step
+        run = []
+        if qid is not None:
+            positions[qid] = lo = hi
+    return positions
+
+
+# Bump the interviews' question set version: the next submission takes a new
+# snapshot, and cached payloads embedding the questions are dropped. When
+# questions were added or removed, progress is re-derived against the new count.
+def question_set_changed(interview_ids, count_changed=True):
+    interview_ids = list(interview_ids)
+    if not interview_ids:
+        return
+    Interview.objects.filter(pk__in=interview_ids).update(
+        question_set_version=F("question_set_version") + 1, snapshot=None
+    )
+    if count_changed:
+        question_count_changed(interview_ids)
+    invalidate(*(f"interview:{pk}" for pk in interview_ids), "interviews")
+
+
+# Make the interview's questions `questions`, in that order, writing only the
+# links that are added, removed or moved. Returns the counts of each.
+def set_interview_questions(interview, questions):
+    wanted = list(dict.fromkeys(q.pk for q in questions))
+    with transaction.atomic():
+        links = list(
+            InterviewQuestion.objects.filter(interview=interview)
+            .only("id", "question_id", "position")
+            .order_by("position", "id")
+        )
+        current = {link.question_id: link for link in links}
+        removed = [link.pk for link in links if link.question_id not in set(wanted)]
+
+        kept = [current[qid] for qid in wanted if qid in current]
+        stay = _longest_increasing([link.position for link in kept])
+        fixed = {link.question_id: link.position for i, link in enumerate(kept) if i in stay}
+        positions = _positions(wanted, fixed)
+        if positions is None:
+            positions = {qid: n * POSITION_GAP for n, qid in enumerate(wanted, start=1)}
+
+        moved = []
+        for qid in wanted:
+            link = current.get(qid)
+            if link is not None and link.position != positions[qid]:
+                link.position = positions[qid]
+                moved.append(link)
+        added = [
+            InterviewQuestion(interview=interview, question_id=qid, position=positions[qid])
+            for qid in wanted
+            if qid not in current
+        ]
+
+        if removed:
+            InterviewQuestion.objects.filter(pk__in=removed).delete()
+        if moved:
+            InterviewQuestion.objects.bulk_update(moved, ["position"], batch_size=1000)
+        if added:
+            InterviewQuestion.objects.bulk_create(added, batch_size=1000)
+        if removed or moved or added:
+            question_set_changed([interview.pk], count_changed=bool(removed or added))
+    return {"added": len(added), "removed": len(removed), "moved": len(moved)}
+
+
+# The interview's questions in position order, loading only `fields`
+def ordered_questions(interview_id, *fields):
+    links = InterviewQuestion.objects.filter(interview_id=interview_id).select_related("question")
+    if fields:
+        links = links.only("question", *(f"question__{name}" for name in fields))
+    return [link.question for link in links.order_by("position", "id")]
+
+
+# Six queries whatever the number of questions: existing versions and snapshots
+# are kept by the inserts' conflict handling and read back
+def freeze_question_set(interview):
+    version = interview.question_set_version
+    questions = ordered_questions(interview.pk, "id", *CONTENT_FIELDS)
+    digests = {q.pk: _digest(_content(q)) for q in questions}
+
+    QuestionVersion.objects.bulk_create(
+        [QuestionVersion(question=q, digest=digests[q.pk], **_content(q)) for q in questions],
+        ignore_conflicts=True,
+    )
+    versions = {
+        (question_id, digest): pk
+        for pk, question_id, digest in QuestionVersion.objects.filter(
+            question_id__in=list(digests), digest__in=set(digests.values())
+        ).values_list("id", "question_id", "digest")
+    }
+    ids = [versions[(q.pk, digests[q.pk])] for q in questions]
+
+    digest = _digest(ids)
+    QuestionSetSnapshot.objects.bulk_create(
+        [QuestionSetSnapshot(interview=interview, digest=digest, question_versions=ids)],
+        ignore_conflicts=True,
+    )
+    snapshot = QuestionSetSnapshot.objects.only("id").get(interview=interview, digest=digest)
+    # Only if no edit landed meanwhile; otherwise the next submission freezes again
+    Interview.objects.filter(pk=interview.pk, question_set_version=version).update(
+        snapshot=snapshot
+    )
+    return snapshot
+
+
+# Snapshot id for a submission to `interview` (a loaded row): the stored one,
+# or a new freeze of the current questions after a change
+def current_snapshot(interview):
+    if interview.snapshot_id is None:
+        interview.snapshot_id = freeze_question_set(interview).pk
+    return interview.snapshot_id
+
+
+# The question versions of a snapshot, in order
+def snapshot_questions(snapshot):
+    versions = QuestionVersion.objects.in_bulk(snapshot.question_versions)
+    return [versions[pk] for pk in snapshot.question_versions]
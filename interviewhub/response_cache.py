@@ -0,0 +1,242 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+
+# Rendered JSON of read-heavy GET endpoints, keyed by the version of what they show.
+#
+# Each cached response depends on one or more scopes ("question:5", "interview:3",
+# "interviews"). A scope's version lives in the cache too and is bumped by the
+# model signals (signals.py); bumping makes every entry built on the old version
+# unreachable, so nothing has to be deleted. Hits and 304s touch no database.
+#
+# LocMemCache (the default) is per process: run a shared backend (API_CACHE_BACKEND)
+# when several workers serve the API, or writes in one worker go unseen by the others
+# until API_CACHE_TIMEOUT.
+
+
+class CacheStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def incr(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self):
+        with self._lock:
+            self._counts = {"hit": 0, "miss": 0, "not_modified": 0, "invalidation": 0}
+
+
+stats = CacheStats()
+
+
+def _cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def _version_key(scope):
+    return f"ver:{scope}"
+
+
+def scope_versions(scopes):
+    cache = _cache()
+    keys = [_version_key(s) for s in scopes]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            # Never restart at a small number: entries from an evicted version
+            # counter could still be around and would look current again
+            cache.add(key, time.time_ns())
+            found[key] = cache.get(key)
+    return [found[k] for k in keys]
+
+
+async def ascope_versions(scopes):
+    cache = _cache()
+    keys = [_version_key(s) for s in scopes]
+    found = await cache.aget_many(keys)
+    for key in keys:
+        if key not in found:
+            await cache.aadd(key, time.time_ns())
+            found[key] = await cache.aget(key)
+    return [found[k] for k in keys]
+
+
+def _bump(scopes):
+    cache = _cache()
+    for scope in scopes:
+        try:
+            cache.incr(_version_key(scope))
+        except ValueError:
+            cache.add(_version_key(scope), time.time_ns())
+    stats.incr("invalidation")
+
+
+# Bump now, so this process stops serving the old data right away, and again on
+# commit, so a response rendered from pre-commit rows by a concurrent reader is
+# not left behind under the new version.
+def invalidate(*scopes):
+    scopes = [s for s in scopes if s]
+    if not scopes:
+        return
+    _bump(scopes)
+    transaction.on_commit(lambda: _bump(scopes))
+
+
+def _etag(body):
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def _matches(request, etag):
+    header = request.META.get("HTTP_IF_NONE_MATCH", "")
+    return etag in [t.strip().removeprefix("W/") for t in header.split(",")] or header == "*"
+
+
+# Entries are shared by the DRF view and its async twin (async_views.py):
+# both key on the DRF view class name and render the same JSON.
+def response_key(name, versions, request):
+    return "resp:{}:{}:{}".format(
+        name,
+        ".".join(str(v) for v in versions),
+        hashlib.blake2b(request.get_full_path().encode(), digest_size=12).hexdigest(),
+    )
+
+
+def cached_response(request, entry):
+    body, etag = entry
+    if _matches(request, etag):
+        stats.incr("not_modified")
+        response = HttpResponseNotModified()
+    else:
+        stats.incr("hit")
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    response["X-Cache"] = "HIT"
+    return response
+
+
+# Set the ETag of a rendered 200 response; returns the response to send (a 304
+# when the client already holds this body)
+def etag_response(request, response):
+    etag = _etag(response.content)
+    response["ETag"] = etag
+    if _matches(request, etag):
+        response = HttpResponseNotModified(headers={"ETag": etag})
+    return response
+
+
+# Tag a freshly rendered 200 response; returns the cache entry and the response
+# to send (a 304 when the client already holds this version)
+def fresh_response(request, response):
+    body = response.content
+    response["X-Cache"] = "MISS"
+    response = etag_response(request, response)
+    return (body, response["ETag"]), response
+
+
+# Async views (async_views.py): serve `name`'s entry for the scopes, or await
+# `render()` for a fresh JSON response and store it when it is a 200
+async def aserve(request, name, scopes, render):
+    if not settings.API_CACHE_ENABLED:
+        return await render()
+    cache = _cache()
+    key = response_key(name, await ascope_versions(scopes), request)
+    entry = await cache.aget(key)
+    if entry is not None:
+        response = cached_response(request, entry)
+    else:
+        stats.incr("miss")
+        response = await render()
+        if response.status_code == 200:
+            entry, response = fresh_response(request, response)
+            await cache.aset(key, entry)
+    patch_vary_headers(response, ["Accept"])
+    return response
+
+
+# Cached piece of a response that is shared by every caller (the per-user part is
+# added by the view): build() runs when the scopes moved on since it was stored
+def cached_fragment(name, scopes, build):
+    if not settings.API_CACHE_ENABLED:
+        return build()
+    cache = _cache()
+    versions = scope_versions(scopes)
+    key = "frag:{}:{}".format(name, ".".join(f"{s}={v}" for s, v in zip(scopes, versions)))
+    data = cache.get(key)
+    if data is None:
+        stats.incr("miss")
+        data = build()
+        cache.set(key, data)
+    else:
+        stats.incr("hit")
+    return data
+
+
+# cached_fragment() for async views; build() returns an awaitable
+async def acached_fragment(name, scopes, build):
+    if not settings.API_CACHE_ENABLED:
+        return await build()
+    cache = _cache()
+    versions = await ascope_versions(scopes)
+    key = "frag:{}:{}".format(name, ".".join(f"{s}={v}" for s, v in zip(scopes, versions)))
+    data = await cache.aget(key)
+    if data is None:
+        stats.incr("miss")
+        data = await build()
+        await cache.aset(key, data)
+    else:
+        stats.incr("hit")
+    return data
+
+
+class CachedResponseMixin:
+    # GET handlers of views that set get_cache_scopes() are served from the cache.
+    # Only JSON 200 responses are stored; anything else passes through.
+
+    def get_cache_scopes(self):
+        raise NotImplementedError
+
+    # Views whose payload depends on who asks return a key part per audience
+    def get_cache_variant(self):
+        return ""
+
+    def _cache_key(self, request):
+        if not settings.API_CACHE_ENABLED or request.accepted_renderer.format != "json":
+            return None
+        versions = scope_versions(self.get_cache_scopes())
+        name = self.__class__.__name__
+        if variant := self.get_cache_variant():
+            name = f"{name}:{variant}"
+        return response_key(name, versions, request)
+
+    def get(self, request, *args, **kwargs):
+        key = self._cache_key(request)
+        self._response_cache_key = key
+        entry = _cache().get(key) if key else None
+        if entry is None:
+            if key:
+                stats.incr("miss")
+            return super().get(request, *args, **kwargs)
+        return cached_response(request, entry)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, "_response_cache_key", None)
+        if key and request.method == "GET" and response.status_code == 200:
+            if not response.get("X-Cache"):
+                response.render()
+                entry, response = fresh_response(request, response)
+                _cache().set(key, entry)
+            patch_vary_headers(response, ["Accept"])
+        return response
@@ -0,0 +1,221 @@
+from collections import Counter, defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, IntegerField, Q, Sum, Value, When
+
+from .models import AnswerBucket, Question, QuestionResult, Submission, SubmissionArchive
+from .question_sets import ordered_questions
+
+SCALE_BUCKETS = [str(v) for v in range(1, 6)]
+
+
+# Normalise an answer to the bucket it is counted in.
+# Multiple Choice accepts the option text or its index (see validate_answer),
+# both map to the option text. Open Ended answers are not bucketed.
+def answer_bucket(question, answer_text):
+    if question.qtype == Question.MULTIPLE_CHOICE:
+        options = question.options or []
+        if answer_text in options:
+            return answer_text
+        try:
+            idx = int(answer_text)
+        except (ValueError, TypeError):
+            return None
+        return options[idx] if 0 <= idx < len(options) else None
+
+    if question.qtype == Question.SCALE:
+        try:
+            val = int(answer_text)
+        except (ValueError, TypeError):
+            return None
+        return str(val) if 1 <= val <= 5 else None
+
+    return None
+
+
+# Apply the submissions to the aggregate tables: sign=1 on create, sign=-1 on delete.
+# Runs a fixed number of queries whatever the batch size, call it inside the
+# transaction that writes the submissions.
+def record_submissions(submissions, questions=None, sign=1):
+    if not submissions:
+        return
+    if questions is None:
+        questions = Question.objects.only("id", "qtype", "options").in_bulk(
+            {s.question_id for s in submissions}
+        )
+
+    totals = defaultdict(lambda: [0, 0, Decimal(0)])  # responses, scored, score sum
+    buckets = Counter()
+    for s in submissions:
+        key = (s.interview_id, s.question_id)
+        totals[key][0] += sign
+        if s.metric_score is not None:
+            totals[key][1] += sign
+            totals[key][2] += sign * Decimal(s.metric_score)
+        bucket = answer_bucket(questions[s.question_id], s.answer_text)
+        if bucket is not None:
+            buckets[key + (bucket,)] += sign
+
+    _apply_deltas(totals, buckets, create=sign > 0)
+
+
+# Apply metric_score changes to the score totals: changes are (submission, old score)
+# pairs, with the new score already set on the submission.
+def record_scores(changes):
+    totals = defaultdict(lambda: [0, 0, Decimal(0)])
+    for s, old in changes:
+        key = (s.interview_id, s.question_id)
+        new = s.metric_score
+        totals[key][1] += (new is not None) - (old is not None)
+        totals[key][2] += Decimal(new or 0) - Decimal(old or 0)
+    if totals:
+        _apply_deltas(totals, {}, create=True)
+
+
+# One bulk upsert of missing counter rows plus one UPDATE per table, whatever the
+# number of keys: totals {(interview, question): [responses, scored, score sum]},
+# buckets {(interview, question, bucket): count}.
+def _apply_deltas(totals, buckets, create):
+    with transaction.atomic():
+        if create:
+            # Make sure every counter row exists before incrementing it
+            QuestionResult.objects.bulk_create(
+                [QuestionResult(interview_id=i, question_id=q) for i, q in totals],
+                ignore_conflicts=True,
+            )
+            AnswerBucket.objects.bulk_create(
+                [AnswerBucket(interview_id=i, question_id=q, bucket=b) for i, q, b in buckets],
+                ignore_conflicts=True,
+            )
+
+        int_field = IntegerField()
+        dec_field = DecimalField(max_digits=14, decimal_places=2)
+
+        def deltas(pos, output_field):
+            return [
+                When(interview_id=i, question_id=q, then=Value(v[pos], output_field))
+                for (i, q), v in totals.items()
+            ]
+
+        QuestionResult.objects.filter(_match(totals)).update(
+            response_count=_increment("response_count", deltas(0, int_field), int_field),
+            score_count=_increment("score_count", deltas(1, int_field), int_field),
+            score_sum=_increment("score_sum", deltas(2, dec_field), dec_field),
+        )
+        if buckets:
+            whens = [
+                When(interview_id=i, question_id=q, bucket=b, then=Value(n, int_field))
+                for (i, q, b), n in buckets.items()
+            ]
+            AnswerBucket.objects.filter(_match(buckets)).update(
+                count=_increment("count", whens, int_field)
+            )
+
+
+def _increment(column, whens, output_field):
+    return F(column) + Case(*whens, default=Value(0, output_field), output_field=output_field)
+
+
+def _match(keys):
+    cond = Q()
+    for key in keys:
+        match = Q(interview_id=key[0], question_id=key[1])
+        if len(key) > 2:
+            match &= Q(bucket=key[2])
+        cond |= match
+    return cond
+
+
+# Recompute the aggregates from the submissions table (all interviews or a subset).
+# Grouping happens in the database, only the option index/text merge is done here.
+# Archived interviews (archive.py) keep their aggregates: their answers are no
+# longer in the table.
+def rebuild_results(interview_ids=None):
+    archived = SubmissionArchive.objects.values("interview_id")
+    subs = Submission.objects.exclude(interview_id__in=archived)
+    if interview_ids is not None:
+        subs = subs.filter(interview_id__in=interview_ids)
+
+    totals = subs.values("interview_id", "question_id").annotate(
+        responses=Count("id"), scored=Count("metric_score"), score_sum=Sum("metric_score")
+    )
+    answers = subs.values("interview_id", "question_id", "answer_text").annotate(n=Count("id"))
+
+    questions = Question.objects.only("id", "qtype", "options").in_bulk(
+        set(subs.order_by().values_list("question_id", flat=True).distinct())
+    )
+    buckets = Counter()
+    for row in answers.order_by():
+        bucket = answer_bucket(questions[row["question_id"]], row["answer_text"])
+        if bucket is not None:
+            buckets[(row["interview_id"], row["question_id"], bucket)] += row["n"]
+
+    with transaction.atomic():
+        stale_results = QuestionResult.objects.exclude(interview_id__in=archived)
+        stale_buckets = AnswerBucket.objects.exclude(interview_id__in=archived)
+        if interview_ids is not None:
+            stale_results = stale_results.filter(interview_id__in=interview_ids)
+            stale_buckets = stale_buckets.filter(interview_id__in=interview_ids)
+        stale_results.delete()
+        stale_buckets.delete()
+
+        QuestionResult.objects.bulk_create(
+            [
+                QuestionResult(
+                    interview_id=row["interview_id"],
+                    question_id=row["question_id"],
+                    response_count=row["responses"],
+                    score_count=row["scored"],
+                    score_sum=row["score_sum"] or 0,
+                )
+                for row in totals.order_by()
+            ],
+            batch_size=1000,
+        )
+        AnswerBucket.objects.bulk_create(
+            [
+                AnswerBucket(interview_id=i, question_id=q, bucket=b, count=n)
+                for (i, q, b), n in buckets.items()
+            ],
+            batch_size=1000,
+        )
+    return len(buckets)
+
+
+# Build the results payload of one interview from the aggregate tables
+def interview_results(interview):
+    questions = ordered_questions(interview.pk, "id", "title", "qtype", "options")
+    results = {
+        r.question_id: r
+        for r in QuestionResult.objects.filter(interview=interview).only(
+            "question_id", "response_count", "score_count", "score_sum"
+        )
+    }
+    counts = defaultdict(dict)
+    for b in AnswerBucket.objects.filter(interview=interview, count__gt=0).only(
+        "question_id", "bucket", "count"
+    ):
+        counts[b.question_id][b.bucket] = b.count
+
+    data = []
+    for q in questions:
+        r = results.get(q.pk)
+        item = {
+            "question": q.pk,
+            "title": q.title,
+            "qtype": q.qtype,
+            "responses": r.response_count if r else 0,
+            "mean_metric_score": (
+                round(r.score_sum / r.score_count, 2) if r and r.score_count else None
+            ),
+        }
+        if q.qtype == Question.SCALE:
+            item["histogram"] = {b: counts[q.pk].get(b, 0) for b in SCALE_BUCKETS}
+        elif q.qtype == Question.MULTIPLE_CHOICE:
+            item["options"] = [
+                {"index": idx, "option": opt, "count": counts[q.pk].get(opt, 0)}
+                for idx, opt in enumerate(q.options or [])
+            ]
+        data.append(item)
+    return {"interview": interview.pk, "questions": data}
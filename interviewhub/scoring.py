@@ -0,0 +1,219 @@
+import os
+import re
+import socket
+from datetime import timedelta
+from decimal import Decimal
+
+import structlog
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Question, ScoringJob, Submission
+from .results import record_scores
+
+log = structlog.get_logger(__name__)
+
+# Background metric_score pipeline.
+# Submission writes enqueue a ScoringJob in their own transaction (one INSERT per
+# batch); `manage.py score_worker` processes claim due jobs, score them with the
+# configured scorer, write the scores with one bulk_update and delete the jobs.
+# Failed jobs are retried with exponential backoff, then parked as "failed".
+
+
+class BaseScorer:
+    # Return one Decimal (or None for "no score") per submission, in order.
+    # Submissions come with their question loaded (qtype, options).
+    def score_many(self, submissions):
+        raise NotImplementedError
+
+
+class LexiconSentimentScorer(BaseScorer):
+    # Local, dependency free sentiment in [-1, 1]:
+    # Open Ended text is scored from a small word list with negation handling,
+    # Scale answers map 1..5 onto -1..1, Multiple Choice gets no score.
+    POSITIVE = frozenset(
+        """
+        good great excellent amazing awesome clear helpful happy love like enjoy
+        positive supportive productive efficient easy fair motivated proud trust
+        improved better best fantastic smooth valuable useful satisfied collaborative
+        transparent empowered confident respected appreciated flexible calm
+        """.split()
+    )
+    NEGATIVE = frozenset(
+        """
+        bad poor terrible awful unclear confusing unhappy hate dislike negative
+        stressful stressed slow hard difficult unfair frustrated frustrating toxic
+        worse worst broken useless angry overwhelmed burnout burned chaotic blocked
+        ignored disrespected micromanaged tired anxious late messy
+        """.split()
+    )
+    NEGATIONS = frozenset("not no never hardly isn't wasn't don't doesn't didn't can't".split())
+    _token = re.compile(r"[a-z']+")
+
+    def score_many(self, submissions):
+        return [self.score(s) for s in submissions]
+
+    def score(self, submission):
+        qtype = submission.question.qtype
+        if qtype == Question.SCALE:
+            try:
+                return (Decimal(int(submission.answer_text) - 3) / 2).quantize(Decimal("0.01"))
+            except ValueError:
+                return None
+        if qtype != Question.OPEN_ENDED:
+            return None
+
+        pos = neg = 0
+        negate = False
+        for word in self._token.findall(submission.answer_text.lower()):
+            if word in self.NEGATIONS:
+                negate = True
+                continue
+            polarity = (word in self.POSITIVE) - (word in self.NEGATIVE)
+            if negate:
+                polarity = -polarity
+            pos += polarity > 0
+            neg += polarity < 0
+            negate = False
+        if not pos and not neg:
+            return Decimal("0.00")
+        return (Decimal(pos - neg) / (pos + neg)).quantize(Decimal("0.01"))
+
+
+def get_scorer():
+    return import_string(settings.METRIC_SCORER)()
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_scoring(submissions):
+    ScoringJob.objects.bulk_create([ScoringJob(submission=s) for s in submissions])
+
+
+# Same for submissions whose answer changed: a job they already have starts over
+def requeue_scoring(submissions):
+    ScoringJob.objects.bulk_create(
+        [ScoringJob(submission=s) for s in submissions],
+        update_conflicts=True,
+        unique_fields=["submission"],
+        update_fields=["status", "attempts", "run_after", "locked_at", "locked_by", "last_error"],
+    )
+
+
+# Lock up to `size` due jobs for this worker. Where the database supports it the
+# rows are picked with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers
+# never wait on each other or get the same job. Jobs left running by a dead worker
+# are taken over once SCORING_LOCK_TIMEOUT has passed.
+def claim_jobs(size, worker):
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.SCORING_LOCK_TIMEOUT)
+    due = ScoringJob.objects.filter(
+        Q(status=ScoringJob.PENDING, run_after__lte=now)
+        | Q(status=ScoringJob.RUNNING, locked_at__lt=stale)
+    ).order_by("run_after", "id")
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        ids = list(due.values_list("id", flat=True)[:size])
+        ScoringJob.objects.filter(pk__in=ids).update(
+            status=ScoringJob.RUNNING, locked_at=now, locked_by=worker
+        )
+    return ids
+
+
+# Score the jobs claimed by `worker`
+def run_jobs(job_ids, scorer, worker):
+    jobs = list(
+        ScoringJob.objects.filter(pk__in=job_ids)
+        .select_related("submission__question")
+        .only(
+            "id",
+            "attempts",
+            "submission__id",
+            "submission__interview_id",
+            "submission__question_id",
+            "submission__answer_text",
+            "submission__metric_score",
+            "submission__question__qtype",
+            "submission__question__options",
+        )
+    )
+    if not jobs:
+        return 0, 0
+
+    try:
+        scores = scorer.score_many([j.submission for j in jobs])
+        errors = [None] * len(jobs)
+    except Exception:
+        # Isolate the offending submissions instead of retrying the whole batch
+        scores, errors = [], []
+        for job in jobs:
+            try:
+                scores.extend(scorer.score_many([job.submission]))
+                errors.append(None)
+            except Exception as exc:
+                scores.append(None)
+                errors.append(exc)
+
+    done = [(j, score) for j, score, err in zip(jobs, scores, errors) if err is None]
+    failed = [(j, err) for j, err in zip(jobs, errors) if err is not None]
+
+    with transaction.atomic():
+        # The answer may have been edited since the claim: the upsert changed the
+        # score and requeued the job (requeue_scoring). Submissions, then jobs, are
+        # locked in the upsert's order; only jobs still running under this worker
+        # are finished, from the score the submission has now.
+        current = dict(
+            Submission.objects.select_for_update()
+            .filter(pk__in=[j.submission_id for j in jobs])
+            .values_list("id", "metric_score")
+        )
+        held = set(
+            ScoringJob.objects.select_for_update()
+            .filter(pk__in=job_ids, status=ScoringJob.RUNNING, locked_by=worker)
+            .values_list("id", flat=True)
+        )
+        done = [(j, score) for j, score in done if j.pk in held and j.submission_id in current]
+        failed = [(j, err) for j, err in failed if j.pk in held]
+        changes = []
+        for job, score in done:
+            sub = job.submission
+            changes.append((sub, current[sub.pk]))
+            sub.metric_score = score
+        Submission.objects.bulk_update([s for s, _old in changes], ["metric_score"])
+        record_scores(changes)
+        ScoringJob.objects.filter(pk__in=[j.pk for j, _score in done]).delete()
+        _retry_later(failed)
+
+    return len(done), len(failed)
+
+
+def _retry_later(failed):
+    now = timezone.now()
+    for job, exc in failed:
+        job.attempts += 1
+        job.last_error = f"{type(exc).__name__}: {exc}"[:2000]
+        job.locked_at = None
+        job.locked_by = ""
+        if job.attempts >= settings.SCORING_MAX_ATTEMPTS:
+            job.status = ScoringJob.FAILED
+        else:
+            job.status = ScoringJob.PENDING
+            delay = settings.SCORING_RETRY_BASE * 2 ** (job.attempts - 1)
+            job.run_after = now + timedelta(seconds=min(delay, settings.SCORING_RETRY_MAX))
+        log.warning(
+            "score_submission_failed",
+            submission=job.submission_id,
+            attempts=job.attempts,
+            error=job.last_error,
+        )
+    if failed:
+        ScoringJob.objects.bulk_update(
+            [job for job, _exc in failed],
+            ["attempts", "last_error", "locked_at", "locked_by", "status", "run_after"],
+        )
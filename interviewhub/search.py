@@ -0,0 +1,99 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+from django.db import connections
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+
+# Full-text search over Question.title/body.
+# Postgres: GIN index on a tsvector expression (migration 0004), ranked with ts_rank.
+# SQLite: FTS5 external-content table kept in sync by triggers, ranked with bm25.
+# Every word of the query must match as a prefix ("lead cla" finds "Leadership clarity").
+
+QUESTION_TABLE = "interviewhub_question"
+FTS_TABLE = "interviewhub_question_fts"
+PG_VECTOR = "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(body, ''))"
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(text):
+    return _WORD.findall(text or "")[:16]
+
+
+def search_questions(queryset, text):
+    terms = search_terms(text)
+    if not terms:
+        return queryset.none()
+    vendor = connections[queryset.db].vendor
+
+    if vendor == "postgresql":
+        # The vector is written as in the index so that the planner can use it
+        vector = RawSQL(PG_VECTOR, [], output_field=SearchVectorField())
+        query = SearchQuery(
+            " & ".join(f"{t}:*" for t in terms), config="english", search_type="raw"
+        )
+        return (
+            queryset.alias(search_vector=vector)
+            .filter(search_vector=query)
+            .annotate(search_rank=SearchRank(vector, query))
+            .order_by("-search_rank", "-created_at", "-id")
+        )
+
+    if vendor == "sqlite":
+        match = " ".join('"{}"*'.format(t.replace('"', "")) for t in terms)
+        # bm25() is only defined inside a MATCH query on the FTS table, hence the
+        # correlated subquery (a rowid lookup) for the rank
+        matching = RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+        rank = RawSQL(
+            f"SELECT bm25({FTS_TABLE}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = {QUESTION_TABLE}.id",
+            [match],
+            output_field=FloatField(),
+        )
+        return (
+            queryset.filter(id__in=matching)
+            .annotate(search_rank=rank)
+            .order_by("search_rank", "-created_at", "-id")
+        )
+
+    # Other backends: unindexed substring match on every word
+    for t in terms:
+        queryset = queryset.filter(Q(title__icontains=t) | Q(body__icontains=t))
+    return queryset
+
+
+# SQLite drops a table's triggers whenever a migration rebuilds it (e.g. AddField),
+# so the FTS sync triggers from migration 0004 are re-created after every migrate.
+SQLITE_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {QUESTION_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {QUESTION_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, body
+        ON {QUESTION_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+]
+
+
+def install_search_triggers(using="default", **kwargs):
+    conn = connections[using]
+    if conn.vendor != "sqlite" or FTS_TABLE not in conn.introspection.table_names():
+        return
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s",
+            [QUESTION_TABLE],
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        for sql in SQLITE_TRIGGERS:
+            cursor.execute(sql)
+        if not {f"{FTS_TABLE}_ai", f"{FTS_TABLE}_ad", f"{FTS_TABLE}_au"} <= existing:
+            # Rows written while the triggers were missing
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
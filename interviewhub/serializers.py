@@ -1,11 +1,69 @@
 from rest_framework import serializers
 
-from .models import Interview, Question, Submission
+from .archive import InterviewArchived, has_archive
+from .instrumentation import TimedDataMixin, TimedListSerializer
+from .models import Interview, ParticipantProgress, Question, Submission, Tag
+from .question_sets import set_interview_questions
+from .visibility import visible_interviews
 
 
-class SubmissionSerializer(serializers.ModelSerializer):
+# Check answer_text against the question type rules.
+# Shared by the single and bulk submission paths.
+def validate_answer(question, answer_text):
+    if question.qtype == Question.MULTIPLE_CHOICE:
+        # Accept either the answer text of the option or the index
+        if not question.options:
+            raise serializers.ValidationError(
+                {"answer_text": "Multiple Choice requires 'options' on the question."}
+            )
+        valid = False
+        if answer_text in question.options:
+            valid = True
+        else:
+            try:
+                idx = int(answer_text)
+                if 0 <= idx < len(question.options):
+                    valid = True
+            except (ValueError, TypeError):
+                pass
+        if not valid:
+            raise serializers.ValidationError(
+                {
+                    "answer_text": "For Multiple Choice, \
+                    provide either the option text or a zero-based index of the option."
+                }
+            )
+
+    elif question.qtype == Question.SCALE:
+        # Accept only int between 1 and 5 as answer
+        try:
+            val = int(answer_text)
+        except (ValueError, TypeError):
+            raise serializers.ValidationError(
+                {"answer_text": "For SCALE, answer_text must be an integer."}
+            )
+        lo = 1
+        hi = 5
+        if not (lo <= val <= hi):
+            raise serializers.ValidationError(
+                {"answer_text": f"Scale answer must be between {lo} and {hi}."}
+            )
+
+
+class VisibleInterviewField(serializers.PrimaryKeyRelatedField):
+    # Accepts only interviews the requesting user may see: the same "does not
+    # exist" error for unknown, unpublished and not-invited interviews
+    def get_queryset(self):
+        request = self.context.get("request")
+        return visible_interviews(getattr(request, "user", None)).annotate(archived=has_archive())
+
+
+class SubmissionSerializer(TimedDataMixin, serializers.ModelSerializer):
+    interview = VisibleInterviewField()
+
     class Meta:
         model = Submission
+        list_serializer_class = TimedListSerializer
         fields = [
             "id",
             "interview",
@@ -15,15 +73,19 @@ class SubmissionSerializer(serializers.ModelSerializer):
             "consent_given",
             "meta",
             "metric_score",
+            "snapshot",
             "submitted_at",
         ]
-        read_only_fields = ["metric_score", "submitted_at"]
+        read_only_fields = ["metric_score", "snapshot", "submitted_at"]
 
     def validate(self, attrs):
         interview = attrs.get("interview")
         question = attrs.get("question")
         answer_text = attrs.get("answer_text", "")
 
+        if getattr(interview, "archived", False):
+            raise InterviewArchived()
+
         # Check if Question belong to Interview
         if interview and question:
             if not interview.questions.filter(pk=question.pk).exists():
@@ -32,52 +94,25 @@ class SubmissionSerializer(serializers.ModelSerializer):
                 )
 
         if question:
-            if question.qtype == Question.MULTIPLE_CHOICE:
-                # Accept either the answer text of the option or the index
-                if not question.options:
-                    raise serializers.ValidationError(
-                        {"answer_text": "Multiple Choice requires 'options' on the question."}
-                    )
-                valid = False
-                if answer_text in question.options:
-                    valid = True
-                else:
-                    try:
-                        idx = int(answer_text)
-                        if 0 <= idx < len(question.options):
-                            valid = True
-                    except (ValueError, TypeError):
-                        pass
-                if not valid:
-                    raise serializers.ValidationError(
-                        {
-                            "answer_text": "For Multiple Choice, \
-                            provide either the option text or a zero-based index of the option."
-                        }
-                    )
-
-            elif question.qtype == Question.SCALE:
-                # Accept only int between 1 and 5 as answer
-                try:
-                    val = int(answer_text)
-                except (ValueError, TypeError):
-                    raise serializers.ValidationError(
-                        {"answer_text": "For SCALE, answer_text must be an integer."}
-                    )
-                lo = 1
-                hi = 5
-                if not (lo <= val <= hi):
-                    raise serializers.ValidationError(
-                        {"answer_text": f"Scale answer must be between {lo} and {hi}."}
-                    )
+            validate_answer(question, answer_text)
 
         return attrs
 
 
-class QuestionSerializer(serializers.ModelSerializer):
+class SubmissionBulkItemSerializer(serializers.Serializer):
+    # One answer inside a bulk submission; interview comes from the URL
+    question = serializers.IntegerField()
+    answer_text = serializers.CharField(required=False, allow_blank=True, default="")
+    is_anonymous = serializers.BooleanField(required=False, default=False)
+    consent_given = serializers.BooleanField(required=False, default=False)
+    meta = serializers.JSONField(required=False, default=dict)
+
+
+class QuestionSerializer(TimedDataMixin, serializers.ModelSerializer):
     class Meta:
         model = Question
-        fields = ["id", "title", "body", "qtype", "options", "tags", "created_at"]
+        list_serializer_class = TimedListSerializer
+        fields = ["id", "external_id", "title", "body", "qtype", "options", "tags", "created_at"]
 
     def validate(self, attrs):
         qtype = attrs.get("qtype", getattr(self.instance, "qtype", None))
@@ -100,11 +135,65 @@ class QuestionSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class InterviewSerializer(serializers.ModelSerializer):
-    # On write validates each Question ID exists and gives list of Questions
-    # On read shows questions as a list of IDs
-    questions = serializers.PrimaryKeyRelatedField(
-        queryset=Question.objects.all(), many=True, required=False
+class QuestionImportSerializer(QuestionSerializer):
+    # One row of a bulk import (imports.py). external_id has no uniqueness check
+    # here: rows that match an existing question update it.
+    external_id = serializers.CharField(
+        max_length=100, required=False, allow_null=True, allow_blank=True, default=None
+    )
+
+    class Meta(QuestionSerializer.Meta):
+        fields = ["external_id", "title", "body", "qtype", "options", "tags"]
+
+
+class TagSerializer(TimedDataMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Tag
+        list_serializer_class = TimedListSerializer
+        fields = ["name", "question_count"]
+
+
+class ParticipantProgressSerializer(TimedDataMixin, serializers.ModelSerializer):
+    username = serializers.CharField(source="candidate.username", read_only=True)
+    completed = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ParticipantProgress
+        list_serializer_class = TimedListSerializer
+        fields = [
+            "candidate",
+            "username",
+            "status",
+            "completed",
+            "answered_count",
+            "first_answer_at",
+            "last_answer_at",
+            "completed_at",
+        ]
+
+    def get_completed(self, obj):
+        return obj.status == ParticipantProgress.COMPLETED
+
+
+class SessionInterviewSerializer(serializers.ModelSerializer):
+    # Interview part of the participant session (sessions.py)
+    class Meta:
+        model = Interview
+        fields = ["id", "title", "description", "scheduled_at", "confidentiality", "updated_at"]
+
+
+class OrderedQuestionsField(serializers.ManyRelatedField):
+    # Reads an interview's questions from its links, in position order
+    def get_attribute(self, instance):
+        return [link.question for link in instance.question_links.all()]
+
+
+class InterviewSerializer(TimedDataMixin, serializers.ModelSerializer):
+    # On write validates each Question ID exists and gives list of Questions, in order
+    # On read shows questions as a list of IDs, in order
+    questions = OrderedQuestionsField(
+        child_relation=serializers.PrimaryKeyRelatedField(queryset=Question.objects.all()),
+        required=False,
     )
 
     # On read only gives an array of questions existent in the Interview
@@ -112,6 +201,7 @@ class InterviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Interview
+        list_serializer_class = TimedListSerializer
         fields = [
             "id",
             "title",
@@ -124,8 +214,17 @@ class InterviewSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["created_at", "updated_at"]
+        # questions and questions_data read these columns from the ordered links
+        # (see query_plan.py)
+        query_plan = {
+            "questions": ("question_links", ["position", "question__id"]),
+            "questions_data": (
+                "question_links",
+                ["question__title", "question__qtype", "question__tags"],
+            ),
+        }
 
-    # Called on read to build the list from obj.questions.all()
+    # Called on read to build the list from the interview's ordered links
     def get_questions_data(self, obj):
         return [
             {
@@ -134,7 +233,7 @@ class InterviewSerializer(serializers.ModelSerializer):
                 "qtype": q.qtype,
                 "tags": q.tags,
             }
-            for q in obj.questions.all()
+            for q in (link.question for link in obj.question_links.all())
         ]
 
     def create(self, validated_data):
@@ -143,8 +242,8 @@ class InterviewSerializer(serializers.ModelSerializer):
         # Create the Interview row on DB
         interview = Interview.objects.create(**validated_data)
         if questions:
-            # Writes the Many-to-Many join rows
-            interview.questions.set(questions)
+            # Writes the ordered join rows
+            set_interview_questions(interview, questions)
         return interview
 
     def update(self, instance, validated_data):
@@ -153,7 +252,6 @@ class InterviewSerializer(serializers.ModelSerializer):
             setattr(instance, k, v)
         instance.save()
         if questions is not None:
-            instance.questions.set(
-                questions
-            )  # If questions provided, replace the M2M set with .set(questions)
+            # Only the links that are added, removed or moved are written
+            set_interview_questions(instance, questions)
         return instance
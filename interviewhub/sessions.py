@@ -0,0 +1,34 @@
+from .models import Submission
+from .query_plan import plan_queryset
+from .question_sets import ordered_questions
+from .response_cache import cached_fragment
+from .serializers import QuestionSerializer, SessionInterviewSerializer, SubmissionSerializer
+from .visibility import interview_for
+
+# GET /api/interviews/<id>/session/: what a participant needs to start answering,
+# in one response. Three queries at most: the interview with the caller's access,
+# its questions (skipped while the interview payload is cached) and the caller's
+# answers.
+
+
+# The interview row, or NotFound/PermissionDenied for the user (visibility.py)
+def session_interview(user, pk):
+    return interview_for(user, pk, *SessionInterviewSerializer.Meta.fields)
+
+
+def _interview_data(interview):
+    data = SessionInterviewSerializer(interview).data
+    data["questions"] = QuestionSerializer(ordered_questions(interview.pk), many=True).data
+    return data
+
+
+def session_data(user, interview):
+    # Same for every participant: cached until the interview or a question changes
+    data = cached_fragment(
+        "session", [f"interview:{interview.pk}"], lambda: _interview_data(interview)
+    )
+    answers = plan_queryset(
+        Submission.objects.filter(candidate=user, interview=interview).order_by("question_id"),
+        SubmissionSerializer,
+    )
+    return {**data, "answers": SubmissionSerializer(answers, many=True).data}
@@ -0,0 +1,147 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .archive import archive_path
+from .authentication import forget_user
+from .models import Interview, InterviewQuestion, Question, Submission, SubmissionArchive
+from .progress import (
+    participants_invited,
+    participants_uninvited,
+    rebuild_progress,
+    refresh_progress,
+)
+from .question_sets import question_set_changed
+from .response_cache import invalidate
+from .results import record_submissions
+from .tags import forget_question_tags, sync_question_tags
+
+
+# Creates are recorded by the views in the same transaction as the INSERT
+# (bulk_create sends no signals). Deletes come from the admin or cascades;
+# when the interview or question itself goes, its aggregates cascade with it.
+# A deleted question's interviews have their progress rebuilt once (see below).
+@receiver(post_delete, sender=Submission)
+def forget_deleted_submission(sender, instance, origin=None, **kwargs):
+    origin_model = getattr(origin, "model", type(origin))
+    if origin_model in (Interview, Question):
+        return
+    record_submissions([instance], sign=-1)
+    if origin_model is not get_user_model():
+        refresh_progress([(instance.interview_id, instance.candidate_id)])
+
+
+@receiver(post_save, sender=Question)
+def sync_saved_question_tags(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and "tags" not in update_fields):
+        return
+    sync_question_tags(instance)
+
+
+@receiver(pre_delete, sender=Question)
+def forget_deleted_question_tags(sender, instance, **kwargs):
+    forget_question_tags(instance)
+
+
+# Response cache invalidation (response_cache.py) and question set versions
+# (question_sets.py). Interview payloads embed question data, so a question change
+# also bumps every interview it belongs to and the interview list.
+def _question_interviews(question_id):
+    return InterviewQuestion.objects.filter(question_id=question_id).values_list(
+        "interview_id", flat=True
+    )
+
+
+@receiver(post_save, sender=Question)
+def invalidate_saved_question(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate(f"question:{instance.pk}")
+        question_set_changed(_question_interviews(instance.pk), count_changed=False)
+
+
+@receiver(pre_delete, sender=Question)
+def invalidate_deleted_question(sender, instance, **kwargs):
+    invalidate(f"question:{instance.pk}")
+    instance._interview_ids = list(_question_interviews(instance.pk))
+    question_set_changed(instance._interview_ids)
+
+
+# Its answers went with it: recount those interviews' progress
+@receiver(post_delete, sender=Question)
+def rebuild_deleted_question_progress(sender, instance, **kwargs):
+    interview_ids = getattr(instance, "_interview_ids", None)
+    if interview_ids:
+        rebuild_progress(interview_ids)
+
+
+@receiver(post_save, sender=Interview)
+@receiver(post_delete, sender=Interview)
+def invalidate_interview(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate(f"interview:{instance.pk}", "interviews")
+
+
+# Links written one by one (admin inline); set_interview_questions() writes in
+# bulk and reports the change itself
+@receiver(post_save, sender=InterviewQuestion)
+@receiver(post_delete, sender=InterviewQuestion)
+def invalidate_interview_question(sender, instance, raw=False, origin=None, **kwargs):
+    if raw or getattr(origin, "model", type(origin)) in (Interview, Question):
+        return
+    question_set_changed([instance.interview_id])
+
+
+@receiver(m2m_changed, sender=Interview.questions.through)
+def invalidate_interview_questions(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith("post_"):
+            question_set_changed([instance.pk])
+        return
+    # question.interviews.add/remove/clear(); for clear the rows are read before they go
+    if action == "pre_clear":
+        interview_ids = list(_question_interviews(instance.pk))
+    elif action in ("post_add", "post_remove"):
+        interview_ids = pk_set
+    else:
+        return
+    question_set_changed(interview_ids)
+
+
+# Invited participants get a not_started progress row (progress.py); removing
+# one drops the row unless they already answered. The allowlist also decides who
+# sees the interview (visibility.py), so the list and access caches move on.
+@receiver(m2m_changed, sender=Interview.allowed_participants.through)
+def sync_invited_progress(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        if reverse:
+            pk_set = set(instance.invited_interviews.values_list("id", flat=True))
+        else:
+            pk_set = set(instance.allowed_participants.values_list("id", flat=True))
+    elif action not in ("post_add", "post_remove"):
+        return
+    # Forward: instance is the interview and pk_set users; reverse: the other way round
+    pairs = [(pk, instance.pk) if reverse else (instance.pk, pk) for pk in pk_set]
+    if pairs:
+        invalidate("interviews", *{f"interview:{interview_id}" for interview_id, _ in pairs})
+    if action == "post_add":
+        participants_invited(pairs)
+    else:
+        participants_uninvited(pairs)
+
+
+# JWT authentication reads users from an in-process cache (authentication.py):
+# deactivation, password and is_staff changes must reach it
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def forget_cached_user(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+    forget_user(instance.pk)
+
+
+# An archive file goes with its interview (or archive row) once the delete commits
+@receiver(post_delete, sender=SubmissionArchive)
+def remove_archive_file(sender, instance, **kwargs):
+    path = archive_path(instance)
+    transaction.on_commit(lambda: path.unlink(missing_ok=True))
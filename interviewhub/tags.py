@@ -0,0 +1,107 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import QuestionTag, Tag
+
+TAG_MODE_ANY = "any"
+TAG_MODE_ALL = "all"
+
+
+def normalize_tags(tags):
+    # Same tag twice or with surrounding blanks counts once; non-strings are ignored
+    if not isinstance(tags, list):
+        return []
+    seen = {}
+    for t in tags:
+        if isinstance(t, str) and t.strip():
+            seen.setdefault(t.strip()[:100], None)
+    return list(seen)
+
+
+# Bring the indexed tag links of `question` in line with its JSON `tags`.
+# Only the added and removed links are written; Tag.question_count follows.
+def sync_question_tags(question):
+    wanted = set(normalize_tags(question.tags))
+    current = dict(QuestionTag.objects.filter(question=question).values_list("tag__name", "tag_id"))
+    added = wanted - current.keys()
+    removed = [current[name] for name in current.keys() - wanted]
+    if not added and not removed:
+        return
+
+    with transaction.atomic():
+        if removed:
+            QuestionTag.objects.filter(question=question, tag_id__in=removed).delete()
+            Tag.objects.filter(pk__in=removed).update(question_count=F("question_count") - 1)
+        if added:
+            Tag.objects.bulk_create([Tag(name=name) for name in added], ignore_conflicts=True)
+            ids = list(Tag.objects.filter(name__in=added).values_list("id", flat=True))
+            QuestionTag.objects.bulk_create(
+                [QuestionTag(question=question, tag_id=tag_id) for tag_id in ids]
+            )
+            Tag.objects.filter(pk__in=ids).update(question_count=F("question_count") + 1)
+
+
+# sync_question_tags for many questions at once (imports): a fixed number of
+# queries whatever the number of questions
+def sync_questions_tags(questions):
+    wanted = {q.pk: set(normalize_tags(q.tags)) for q in questions}
+    current = defaultdict(dict)
+    for link_id, question_id, name, tag_id in QuestionTag.objects.filter(
+        question_id__in=list(wanted)
+    ).values_list("id", "question_id", "tag__name", "tag_id"):
+        current[question_id][name] = (link_id, tag_id)
+
+    removed = []
+    added = []  # (question_id, name)
+    deltas = Counter()
+    for question_id, names in wanted.items():
+        have = current.get(question_id, {})
+        for name, (link_id, tag_id) in have.items():
+            if name not in names:
+                removed.append(link_id)
+                deltas[tag_id] -= 1
+        added += [(question_id, name) for name in names - have.keys()]
+    if not added and not removed:
+        return
+
+    with transaction.atomic():
+        if removed:
+            QuestionTag.objects.filter(pk__in=removed).delete()
+        if added:
+            names = {name for _question_id, name in added}
+            Tag.objects.bulk_create([Tag(name=name) for name in names], ignore_conflicts=True)
+            ids = dict(Tag.objects.filter(name__in=names).values_list("name", "id"))
+            QuestionTag.objects.bulk_create(
+                [QuestionTag(question_id=q, tag_id=ids[name]) for q, name in added],
+                batch_size=1000,
+            )
+            deltas.update(ids[name] for _question_id, name in added)
+        by_delta = defaultdict(list)
+        for tag_id, delta in deltas.items():
+            if delta:
+                by_delta[delta].append(tag_id)
+        for delta, tag_ids in by_delta.items():
+            Tag.objects.filter(pk__in=tag_ids).update(question_count=F("question_count") + delta)
+
+
+# Called before a question is deleted, while its links still exist
+def forget_question_tags(question):
+    Tag.objects.filter(question_links__question=question).update(
+        question_count=F("question_count") - 1
+    )
+
+
+# Restrict a Question queryset to the given tags through the (tag, question) index.
+# mode "any": at least one of the tags, mode "all": every tag.
+def filter_questions_by_tags(queryset, names, mode=TAG_MODE_ANY):
+    names = normalize_tags(names)
+    if not names:
+        return queryset
+    links = QuestionTag.objects.filter(tag__name__in=names)
+    if mode == TAG_MODE_ALL and len(names) > 1:
+        links = (
+            links.values("question_id").annotate(matched=Count("tag_id")).filter(matched=len(names))
+        )
+    return queryset.filter(pk__in=links.values("question_id"))
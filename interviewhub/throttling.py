@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.throttling import BaseThrottle
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+# Token bucket rate limiting (TokenBucketThrottle, REST_FRAMEWORK default).
+#
+# Every (scope, client) pair has a bucket of `burst` tokens, refilled at the
+# scope's rate. A request takes one token; an empty bucket refuses it with a 429
+# whose Retry-After says when the next token is due. THROTTLE_RATES maps scopes
+# to "<requests>/<s|min|hour|day>[:<burst>]" (burst defaults to the request count),
+# scopes without a rate are not limited.
+#
+# Views choose their scope with `throttle_scope` ("default" otherwise) and how
+# the client is identified with `throttle_key`:
+#   "user"     request.user id, the client IP for anonymous requests (default)
+#   "subject"  the user id claim of the verified JWT, the IP without one
+#   "ip"       the client IP (REST_FRAMEWORK NUM_PROXIES applies)
+# Scopes have buckets of their own: reads that empty a client's "default" or
+# "search" bucket leave its "submit" bucket, and so the write path, untouched.
+#
+# Buckets live in THROTTLE_STORE. LocalBucketStore, the default, keeps them in
+# this process, in shards of least recently used order so that concurrent
+# requests rarely share a lock and idle buckets are dropped past
+# THROTTLE_MAX_BUCKETS (a dropped bucket is as good as full). With several
+# workers every process allows the full rate; CacheBucketStore shares the
+# buckets through the THROTTLE_CACHE_ALIAS cache instead.
+
+DEFAULT_SCOPE = "default"
+_PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_ip = BaseThrottle()
+
+
+# "120/min:20" -> (2.0 tokens per second, burst of 20)
+@lru_cache(maxsize=64)
+def parse_rate(rate):
+    rate, _, burst = rate.partition(":")
+    count, period = rate.split("/")
+    return int(count) / _PERIODS[period[0]], int(burst or count)
+
+
+class LocalBucketStore:
+    def __init__(self, shards=16, max_buckets=100_000):
+        self._shards = [(threading.Lock(), OrderedDict()) for _ in range(shards)]
+        self._per_shard = max(1, max_buckets // shards)
+
+    # Take a token from the bucket; returns 0 or the seconds until one is due
+    def take(self, key, rate, burst):
+        now = time.monotonic()
+        lock, buckets = self._shards[hash(key) % len(self._shards)]
+        with lock:
+            entry = buckets.pop(key, None)
+            tokens = burst if entry is None else min(burst, entry[0] + (now - entry[1]) * rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0
+            else:
+                wait = (1 - tokens) / rate
+            buckets[key] = (tokens, now)
+            if len(buckets) > self._per_shard:
+                buckets.popitem(last=False)
+        return wait
+
+    async def atake(self, key, rate, burst):
+        return self.take(key, rate, burst)
+
+    def clear(self):
+        for lock, buckets in self._shards:
+            with lock:
+                buckets.clear()
+
+
+class CacheBucketStore:
+    # Buckets in a shared cache. Read and write are two round trips, not one
+    # atomic step: clients racing on the same bucket may get a few requests over.
+
+    def __init__(self, shards=None, max_buckets=None):
+        self.cache = caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def _apply(self, entry, rate, burst, now):
+        tokens = burst if entry is None else min(burst, entry[0] + (now - entry[1]) * rate)
+        if tokens >= 1:
+            return 0, (tokens - 1, now)
+        return (1 - tokens) / rate, (tokens, now)
+
+    def take(self, key, rate, burst):
+        name = "throttle:%s:%s" % key
+        wait, entry = self._apply(self.cache.get(name), rate, burst, time.time())
+        # Gone once it would be full again
+        self.cache.set(name, entry, int(burst / rate) + 1)
+        return wait
+
+    async def atake(self, key, rate, burst):
+        name = "throttle:%s:%s" % key
+        wait, entry = self._apply(await self.cache.aget(name), rate, burst, time.time())
+        await self.cache.aset(name, entry, int(burst / rate) + 1)
+        return wait
+
+    def clear(self):
+        self.cache.clear()
+
+
+@lru_cache(maxsize=1)
+def get_store():
+    return import_string(settings.THROTTLE_STORE)(
+        shards=settings.THROTTLE_SHARDS, max_buckets=settings.THROTTLE_MAX_BUCKETS
+    )
+
+
+# User id (an int) or client IP (a str)
+def client_ident(request, key_by, user, token):
+    if key_by == "user" and user is not None and user.is_authenticated:
+        return user.pk
+    if key_by == "subject" and token is not None:
+        return token.get(jwt_settings.USER_ID_CLAIM)
+    return _ip.get_ident(request)
+
+
+# Bucket key (scope, client) and (rate, burst) for a request to a view, None
+# when the scope is not limited
+def bucket_for(request, view, user, token):
+    scope = getattr(view, "throttle_scope", None) or DEFAULT_SCOPE
+    rate = settings.THROTTLE_RATES.get(scope)
+    if not rate:
+        return None
+    ident = client_ident(request, getattr(view, "throttle_key", "user"), user, token)
+    return (scope, ident), parse_rate(rate)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    def allow_request(self, request, view):
+        self.retry_after = None
+        bucket = bucket_for(request, view, request.user, request.auth)
+        if bucket is None:
+            return True
+        key, (rate, burst) = bucket
+        self.retry_after = get_store().take(key, rate, burst) or None
+        return self.retry_after is None
+
+    def wait(self):
+        return self.retry_after
@@ -1,13 +1,71 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import async_views, views
+
+# Participant-facing reads: async views under ASGI (see async_views.py)
+if settings.API_ASYNC_READS:
+    interview_detail = async_views.InterviewDetailAsyncView.as_view()
+    question_detail = async_views.QuestionDetailAsyncView.as_view()
+    submission_list = async_views.SubmissionListAsyncView.as_view()
+    # Long-lived streams need the event loop: only routed under ASGI
+    streaming = [
+        path(
+            "interviews/<int:pk>/events/",
+            async_views.InterviewEventsAsyncView.as_view(),
+            name="interview-events",
+        ),
+    ]
+else:
+    interview_detail = views.InterviewDetailView.as_view()
+    question_detail = views.QuestionDetailView.as_view()
+    submission_list = views.SubmissionListView.as_view()
+    streaming = []
 
 urlpatterns = [
     path("whoami/", views.WhoAmIView.as_view(), name="whoami"),
+    path("cache/stats/", views.CacheStatsView.as_view(), name="cache-stats"),
     path("questions/", views.QuestionListCreateView.as_view(), name="question-list"),
-    path("questions/<int:pk>/", views.QuestionDetailView.as_view(), name="question-detail"),
-    path("submissions/", views.SubmissionListView.as_view(), name="submissions"),
+    path("questions/bulk/", views.QuestionBulkUpsertView.as_view(), name="question-bulk"),
+    path("questions/<int:pk>/", question_detail, name="question-detail"),
+    path("tags/", views.TagListView.as_view(), name="tag-list"),
+    path("submissions/", submission_list, name="submissions"),
     path("submissions/create/", views.SubmissionCreateView.as_view(), name="submission-create"),
     path("interviews/", views.InterviewListCreateView.as_view(), name="interview-list"),
-    path("interviews/<int:pk>/", views.InterviewDetailView.as_view(), name="interview-detail"),
-]
+    path("interviews/<int:pk>/", interview_detail, name="interview-detail"),
+    path(
+        "interviews/<int:pk>/submissions/",
+        views.InterviewSubmissionBulkCreateView.as_view(),
+        name="interview-submissions-bulk",
+    ),
+    path(
+        "interviews/<int:pk>/session/",
+        views.InterviewSessionView.as_view(),
+        name="interview-session",
+    ),
+    path(
+        "interviews/<int:pk>/results/",
+        views.InterviewResultsView.as_view(),
+        name="interview-results",
+    ),
+    path(
+        "interviews/<int:pk>/progress/",
+        views.InterviewProgressView.as_view(),
+        name="interview-progress",
+    ),
+    path(
+        "interviews/<int:pk>/progress/summary/",
+        views.InterviewProgressSummaryView.as_view(),
+        name="interview-progress-summary",
+    ),
+    path(
+        "interviews/<int:pk>/participants/",
+        views.InterviewParticipantsView.as_view(),
+        name="interview-participants",
+    ),
+    path(
+        "interviews/<int:pk>/export/",
+        views.InterviewExportView.as_view(),
+        name="interview-export",
+    ),
+] + streaming
@@ -1,12 +1,42 @@
 import structlog
-from django.db import IntegrityError
-from django.db.models import Q
-from rest_framework import generics, permissions, serializers
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from rest_framework import generics, parsers, permissions, serializers, status
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Interview, Question, Submission
-from .serializers import InterviewSerializer, QuestionSerializer, SubmissionSerializer
+from .archive import check_not_archived, submission_rows
+from .authentication import full_user
+from .events import publish_submissions
+from .exports import CSVRenderer, NDJSONRenderer, stream_csv, stream_ndjson
+from .idempotency import IdempotencyMixin
+from .imports import import_questions
+from .invitations import CSVParser, invite_participants, remove_participants
+from .models import Interview, ParticipantProgress, Question, Submission, Tag
+from .pagination import KeysetPagination
+from .progress import progress_summary, record_progress
+from .query_plan import plan_queryset
+from .question_sets import current_snapshot
+from .response_cache import CachedResponseMixin, etag_response
+from .response_cache import stats as cache_stats
+from .results import interview_results, record_submissions
+from .scoring import enqueue_scoring, requeue_scoring
+from .search import search_questions
+from .serializers import (
+    InterviewSerializer,
+    ParticipantProgressSerializer,
+    QuestionSerializer,
+    SubmissionBulkItemSerializer,
+    SubmissionSerializer,
+    TagSerializer,
+    validate_answer,
+)
+from .sessions import session_data, session_interview
+from .tags import TAG_MODE_ANY, filter_questions_by_tags
+from .visibility import audience, check_visible, interview_for, visible_interviews
 
 log = structlog.get_logger(__name__)
 
@@ -16,6 +46,9 @@ class WhoAmIView(APIView):
 
     def get(self, request):
         u = request.user
+        if u.is_authenticated:
+            # request.user only holds the token claims
+            u = full_user(u)
         return Response(
             {
                 "id": u.id,
@@ -32,25 +65,34 @@ class QuestionListCreateView(generics.ListCreateAPIView):
 
     serializer_class = QuestionSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    keyset_ordering = ("-created_at", "-id")
+
+    # Searches cost more than a page of the list: smaller bucket (throttling.py)
+    @property
+    def throttle_scope(self):
+        return "search" if self.request.query_params.get("search") else "default"
 
     # Override get_queryset to have the results ordered by creation date and
     # allow filters (question type, tag or search)
     def get_queryset(self):
-        qs = Question.objects.all().order_by("-created_at")
+        qs = Question.objects.all().order_by("-created_at", "-id")
 
         qtype = self.request.query_params.get("qtype")
         if qtype:
             qs = qs.filter(qtype=qtype)
 
-        tag = self.request.query_params.get("tag")
-        if tag:
-            qs = qs.filter(tags__icontains=tag)
+        # ?tag=a&tag=b matches any of them, add tag_mode=all to require every tag
+        tags = self.request.query_params.getlist("tag")
+        if tags:
+            mode = self.request.query_params.get("tag_mode", TAG_MODE_ANY)
+            qs = filter_questions_by_tags(qs, tags, mode)
 
+        # Full-text, prefix matched and ranked (see search.py)
         search = self.request.query_params.get("search")
         if search:
-            qs = qs.filter(Q(title__icontains=search) | Q(body__icontains=search))
+            qs = search_questions(qs, search)
 
-        return qs
+        return plan_queryset(qs, self.get_serializer_class())
 
     # Override perform_create to include logger
     def perform_create(self, serializer):
@@ -63,40 +105,123 @@ class QuestionListCreateView(generics.ListCreateAPIView):
         )
 
 
-class QuestionDetailView(generics.RetrieveAPIView):
-    queryset = Question.objects.all()
+class QuestionBulkUpsertView(APIView):
+    # POST: create or update many questions in one request (see imports.py)
+    # Body: [{"external_id": "...", "title": "...", "qtype": "...", ...}, ...]
+    # Invalid rows are reported per index, the rest are saved. Staff only: an
+    # upsert rewrites questions other interviews use.
+    permission_classes = [permissions.IsAdminUser]
+    max_items = 5000
+
+    def post(self, request):
+        rows = request.data
+        if not isinstance(rows, list) or not rows:
+            raise serializers.ValidationError(
+                {"non_field_errors": ["Expected a non-empty list of questions."]}
+            )
+        if len(rows) > self.max_items:
+            raise serializers.ValidationError(
+                {
+                    "non_field_errors": [
+                        f"At most {self.max_items} questions per request, "
+                        "use `manage.py import_questions` for larger files."
+                    ]
+                }
+            )
+
+        report = import_questions(rows)
+        log.info(
+            "import_questions",
+            created=report["created"],
+            updated=report["updated"],
+            rejected=len(report["errors"]),
+            user=request.user.username,
+        )
+        saved = report["created"] + report["updated"]
+        return Response(report, status=status.HTTP_200_OK if saved else status.HTTP_400_BAD_REQUEST)
+
+
+class QuestionDetailView(CachedResponseMixin, generics.RetrieveAPIView):
     serializer_class = QuestionSerializer
     permission_classes = [permissions.AllowAny]
 
+    def get_cache_scopes(self):
+        return [f"question:{self.kwargs['pk']}"]
+
+    def get_queryset(self):
+        return plan_queryset(Question.objects.all(), self.get_serializer_class())
+
+
+class TagListView(generics.ListAPIView):
+    # GET: tags with their question counts, most used first
+    # ?prefix= narrows to tags starting with the given text (autocomplete)
+    serializer_class = TagSerializer
+    permission_classes = [permissions.AllowAny]
+
+    def get_queryset(self):
+        qs = Tag.objects.filter(question_count__gt=0)
+        prefix = self.request.query_params.get("prefix")
+        if prefix:
+            qs = qs.filter(name__istartswith=prefix.strip())
+        return plan_queryset(qs, self.get_serializer_class())
+
 
 class SubmissionListView(generics.ListAPIView):
     # GET: list the user's submissions
     serializer_class = SubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    keyset_ordering = ("-submitted_at", "-id")
 
     # Override get_queryset to have the results ordered by submission date
     def get_queryset(self):
-        return Submission.objects.filter(candidate=self.request.user).order_by("-submitted_at")
+        qs = Submission.objects.filter(candidate=self.request.user).order_by("-submitted_at", "-id")
+        return plan_queryset(qs, self.get_serializer_class())
 
 
-class SubmissionCreateView(generics.CreateAPIView):
+class SubmissionCreateView(IdempotencyMixin, generics.CreateAPIView):
     # POST: create a submission
     # Body must include: interview (id), question (id), answer_text
+    # ?upsert=1: replace the caller's answer to that question if there is one (200)
+    # Retries with the same Idempotency-Key header get the first response back.
     serializer_class = SubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "submit"
+
+    def create(self, request, *args, **kwargs):
+        self.created = True
+        response = super().create(request, *args, **kwargs)
+        if not self.created:
+            response.status_code = status.HTTP_200_OK
+        return response
 
     # Override perform_create to include logger and to set the candidate as the logged-in user
     def perform_create(self, serializer):
+        if self.request.query_params.get("upsert") in ("1", "true"):
+            submission = self._upsert(serializer)
+        else:
+            submission = self._insert(serializer)
+        # `answer` is cut or hashed per confidentiality (LOG_FIELD_POLICIES)
+        log.info(
+            "create_submission" if self.created else "update_submission",
+            submission_id=submission.id,
+            interview=submission.interview_id,
+            question=submission.question_id,
+            user=self.request.user.username,
+            answer=submission.answer_text,
+            confidentiality=serializer.validated_data["interview"].confidentiality,
+        )
+
+    def _insert(self, serializer):
         try:
-            submission = serializer.save(candidate=self.request.user)
-            log.info(
-                "create_submission",
-                submission_id=submission.id,
-                interview=submission.interview_id,
-                question=submission.question_id,
-                user=self.request.user.username,
-                answer=submission.answer_text,
-            )
+            with transaction.atomic():
+                # Answers reference the frozen question set they were given
+                snapshot_id = current_snapshot(serializer.validated_data["interview"])
+                submission = serializer.save(candidate=self.request.user, snapshot_id=snapshot_id)
+                record_submissions([submission])
+                record_progress([submission])
+                enqueue_scoring([submission])
+                publish_submissions(serializer.validated_data["interview"], [submission])
+            return submission
         except IntegrityError:
             # No unique_together (candidate, interview, question)
             raise serializers.ValidationError(
@@ -107,17 +232,211 @@ class SubmissionCreateView(generics.CreateAPIView):
                 }
             )
 
+    # An edit is one INSERT ... ON CONFLICT DO UPDATE on uniq_submission_answer,
+    # with the previous answer read under a row lock: it is taken out of the
+    # aggregates and the new one counted, and the answer is scored again. Whether
+    # the answer is new is decided by the INSERT itself: when none was locked the
+    # row is inserted in a savepoint, and one that a concurrent request inserted in
+    # between makes it fail and turns the request into an edit of that row.
+    # Edits are not published as live events (events.py counts each event as a
+    # new response).
+    def _upsert(self, serializer):
+        data = serializer.validated_data
+        interview, question = data["interview"], data["question"]
+        questions = {question.pk: question}
+        with transaction.atomic():
+            submission = Submission(
+                candidate=self.request.user, snapshot_id=current_snapshot(interview), **data
+            )
+            previous = self._locked_answer(interview, question)
+            if previous is None:
+                try:
+                    with transaction.atomic():
+                        submission.save(force_insert=True)
+                except IntegrityError:
+                    previous = self._locked_answer(interview, question)
+                    if previous is None:
+                        raise
+                    submission.pk = None
+                else:
+                    record_submissions([submission], questions)
+                    record_progress([submission])
+                    publish_submissions(interview, [submission], questions)
+            if previous is not None:
+                Submission.objects.bulk_create(
+                    [submission],
+                    update_conflicts=True,
+                    unique_fields=["candidate", "interview", "question"],
+                    update_fields=[
+                        "answer_text",
+                        "is_anonymous",
+                        "consent_given",
+                        "meta",
+                        "metric_score",
+                        "snapshot",
+                    ],
+                )
+                submission.pk = previous.pk
+                submission.submitted_at = previous.submitted_at
+                record_submissions([previous], questions, sign=-1)
+                record_submissions([submission], questions)
+                self.created = False
+            requeue_scoring([submission])
+        serializer.instance = submission
+        return submission
+
+    def _locked_answer(self, interview, question):
+        return (
+            Submission.objects.select_for_update()
+            .filter(candidate=self.request.user, interview=interview, question=question)
+            .only("interview_id", "question_id", "answer_text", "metric_score", "submitted_at")
+            .first()
+        )
+
+
+class InterviewSubmissionBulkCreateView(IdempotencyMixin, generics.GenericAPIView):
+    # POST: submit a list of answers for one interview in a single transaction
+    # Body: [{"question": id, "answer_text": "..."}, ...]
+    # Invalid or already answered items are reported per index, the rest are saved
+    # Retries with the same Idempotency-Key header get the first response back.
+    serializer_class = SubmissionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "submit"
+    max_items = 500
+
+    def post(self, request, pk):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise serializers.ValidationError(
+                {"non_field_errors": ["Expected a non-empty list of answers."]}
+            )
+        if len(items) > self.max_items:
+            raise serializers.ValidationError(
+                {"non_field_errors": [f"At most {self.max_items} answers per request."]}
+            )
+
+        interview = interview_for(request.user, pk)
+        check_not_archived(interview.pk)
+        # One query for every question the answers may point at
+        questions = {q.pk: q for q in interview.questions.only("id", "qtype", "options")}
+
+        errors = []
+        pending = {}  # question_id -> (index, validated item)
+        for index, item in enumerate(items):
+            item_serializer = SubmissionBulkItemSerializer(data=item)
+            try:
+                item_serializer.is_valid(raise_exception=True)
+                data = item_serializer.validated_data
+                question = questions.get(data["question"])
+                if question is None:
+                    raise serializers.ValidationError(
+                        {"question": "This question is not part of the selected interview."}
+                    )
+                validate_answer(question, data["answer_text"])
+                if data["question"] in pending:
+                    raise serializers.ValidationError(
+                        {"question": "This question is answered twice in the request."}
+                    )
+            except serializers.ValidationError as exc:
+                errors.append({"index": index, "errors": exc.detail})
+                continue
+            pending[data["question"]] = (index, data)
+
+        created = self._create(request.user, interview, questions, pending, errors)
+        errors.sort(key=lambda e: e["index"])
 
-class InterviewListCreateView(generics.ListCreateAPIView):
-    # GET: list interviews
+        log.info(
+            "create_submissions_bulk",
+            interview=interview.id,
+            user=request.user.username,
+            created=len(created),
+            rejected=len(errors),
+        )
+        return Response(
+            {
+                "created": self.get_serializer(created, many=True).data,
+                "errors": errors,
+            },
+            status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST,
+        )
+
+    # Drop the items already answered, then write the rest with one bulk_create.
+    # A concurrent writer can still win the race for a row; in that case the
+    # transaction is rolled back and the conflicts are re-read once.
+    def _create(self, user, interview, questions, pending, errors):
+        for _attempt in range(2):
+            answered = set(
+                Submission.objects.filter(
+                    candidate=user, interview=interview, question_id__in=list(pending)
+                )
+                .order_by()
+                .values_list("question_id", flat=True)
+            )
+            for question_id in answered:
+                index, _data = pending.pop(question_id)
+                errors.append(
+                    {
+                        "index": index,
+                        "errors": {
+                            "non_field_errors": [
+                                "You have already answered this question for this interview."
+                            ]
+                        },
+                    }
+                )
+            if not pending:
+                return []
+            snapshot_id = current_snapshot(interview)
+            objs = [
+                Submission(
+                    candidate=user,
+                    interview=interview,
+                    question_id=question_id,
+                    answer_text=data["answer_text"],
+                    is_anonymous=data["is_anonymous"],
+                    consent_given=data["consent_given"],
+                    meta=data["meta"],
+                    snapshot_id=snapshot_id,
+                )
+                for question_id, (_index, data) in pending.items()
+            ]
+            try:
+                with transaction.atomic():
+                    created = Submission.objects.bulk_create(objs)
+                    record_submissions(created, questions)
+                    record_progress(created, len(questions))
+                    enqueue_scoring(created)
+                    publish_submissions(interview, created, questions)
+                    return created
+            except IntegrityError:
+                continue
+        raise serializers.ValidationError(
+            {"non_field_errors": ["Conflicting concurrent submissions, please retry."]}
+        )
+
+
+class InterviewListCreateView(CachedResponseMixin, generics.ListCreateAPIView):
+    # GET: list the interviews the caller may see (visibility.py), served from
+    # the response cache per audience when unchanged
     # POST: create an interview
     serializer_class = InterviewSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    keyset_ordering = ("-created_at", "-id")
+
+    def get_cache_scopes(self):
+        return ["interviews"]
+
+    def get_cache_variant(self):
+        return audience(self.request.user)
 
     # Override get_queryset to have the results ordered by creation date
     def get_queryset(self):
-        # Show all interviews
-        return Interview.objects.all().order_by("-created_at")
+        # Questions are prefetched for the whole page
+        qs = visible_interviews(self.request.user).order_by("-created_at", "-id")
+        # ?published=1: only published ones (served by interview_published_idx)
+        if self.request.query_params.get("published") in ("1", "true"):
+            qs = qs.filter(is_published=True)
+        return plan_queryset(qs, self.get_serializer_class())
 
     # Override perform_create to include logger and to set the current user as Owner
     def perform_create(self, serializer):
@@ -130,7 +449,214 @@ class InterviewListCreateView(generics.ListCreateAPIView):
         )
 
 
-class InterviewDetailView(generics.RetrieveAPIView):
-    queryset = Interview.objects.all()
+class InterviewDetailView(CachedResponseMixin, generics.RetrieveAPIView):
     serializer_class = InterviewSerializer
     permission_classes = [permissions.AllowAny]
+
+    def get_cache_scopes(self):
+        return [f"interview:{self.kwargs['pk']}"]
+
+    # The payload is the same for everyone who may see the interview: check the
+    # caller before serving it from the cache
+    def get(self, request, *args, **kwargs):
+        check_visible(request.user, kwargs["pk"])
+        return super().get(request, *args, **kwargs)
+
+    def get_queryset(self):
+        return plan_queryset(Interview.objects.all(), self.get_serializer_class())
+
+
+class InterviewSessionView(APIView):
+    # GET: everything a participant needs to start answering in one call: the
+    # interview, its questions in full (body, options) and the caller's answers
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        interview = session_interview(request.user, pk)
+        return Response(session_data(request.user, interview))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method == "GET" and response.status_code == 200:
+            # Holds the caller's answers: only the client may keep it, and
+            # revalidate with If-None-Match
+            response.render()
+            response = etag_response(request, response)
+            response["Cache-Control"] = "private, no-cache"
+        return response
+
+
+class InterviewResultsView(APIView):
+    # GET: per-question results of an interview, read from the aggregate tables
+    # Visible to the owner and staff, or when results are public to any user who
+    # may see the interview (visibility.py)
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        user = request.user
+        interview = interview_for(user, pk, "confidentiality")
+        if not (
+            user.is_staff
+            or interview.owner_id == user.id
+            or interview.confidentiality == Interview.CONF_PUBLIC
+        ):
+            raise PermissionDenied("Results of this interview are not shared with you.")
+        return Response(interview_results(interview))
+
+
+def _progress_interview(user, pk):
+    interview = get_object_or_404(Interview.objects.only("id", "owner_id"), pk=pk)
+    if not (user.is_staff or interview.owner_id == user.id):
+        raise PermissionDenied("Only the interview owner can follow participant progress.")
+    return interview
+
+
+class InterviewProgressView(generics.ListAPIView):
+    # GET: per-participant progress of an interview, read from the progress table
+    # (progress.py), never from the submissions. Owner and staff only.
+    # ?status=not_started|in_progress|completed, ?candidate=<user id>
+    # Keyset pages by participant id; the status counts are served by
+    # InterviewProgressSummaryView.
+    serializer_class = ParticipantProgressSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("candidate_id",)
+
+    def get_queryset(self):
+        interview = _progress_interview(self.request.user, self.kwargs["pk"])
+        qs = ParticipantProgress.objects.filter(interview=interview)
+        params = self.request.query_params
+        progress_status = params.get("status")
+        if progress_status:
+            if progress_status not in dict(ParticipantProgress.STATUS_CHOICES):
+                raise serializers.ValidationError({"status": "Unknown status."})
+            qs = qs.filter(status=progress_status)
+        candidate = params.get("candidate")
+        if candidate:
+            if not candidate.isdigit():
+                raise serializers.ValidationError({"candidate": "Expected a user id."})
+            qs = qs.filter(candidate_id=candidate)
+        return qs.select_related("candidate").only(
+            "candidate__username",
+            "status",
+            "answered_count",
+            "first_answer_at",
+            "last_answer_at",
+            "completed_at",
+        )
+
+
+class InterviewProgressSummaryView(APIView):
+    # GET: question count and number of participants per status (owner and staff),
+    # cached until the interview's progress changes
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        interview = _progress_interview(request.user, pk)
+        return Response(progress_summary(interview.pk))
+
+
+class InterviewParticipantsView(APIView):
+    # POST: invite users to an interview, DELETE: uninvite them (invitations.py)
+    # Body: JSON list of user ids (numbers) and usernames (strings), or a text/csv
+    # body with an `id` and/or `username` column. POST ?replace=1 also uninvites
+    # everyone not listed. Returns added/removed/not_found counts. Owner and staff.
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [parsers.JSONParser, CSVParser]
+    max_items = 50000
+
+    def _interview(self, request, pk):
+        interview = get_object_or_404(Interview.objects.only("id", "owner_id"), pk=pk)
+        user = request.user
+        if not (user.is_staff or interview.owner_id == user.id):
+            raise PermissionDenied("Only the interview owner can manage participants.")
+        return interview
+
+    def _refs(self, request):
+        refs = request.data
+        if not isinstance(refs, list) or not refs:
+            raise serializers.ValidationError(
+                {"non_field_errors": ["Expected a non-empty list of user ids or usernames."]}
+            )
+        if len(refs) > self.max_items:
+            raise serializers.ValidationError(
+                {
+                    "non_field_errors": [
+                        f"At most {self.max_items} users per request, "
+                        "use `manage.py invite_participants` for larger lists."
+                    ]
+                }
+            )
+        if any(isinstance(r, bool) or not isinstance(r, (int, str)) for r in refs):
+            raise serializers.ValidationError(
+                {"non_field_errors": ["Users are given by id (number) or username (string)."]}
+            )
+        return refs
+
+    def _respond(self, request, interview, action, report):
+        log.info(
+            action,
+            interview_id=interview.id,
+            added=report["added"],
+            removed=report["removed"],
+            not_found=report["not_found"],
+            user=request.user.username,
+        )
+        return Response(report)
+
+    def post(self, request, pk):
+        interview = self._interview(request, pk)
+        replace = request.query_params.get("replace") in ("1", "true")
+        report = invite_participants(interview.id, self._refs(request), replace=replace)
+        return self._respond(request, interview, "invite_participants", report)
+
+    def delete(self, request, pk):
+        interview = self._interview(request, pk)
+        report = remove_participants(interview.id, self._refs(request))
+        return self._respond(request, interview, "remove_participants", report)
+
+
+class InterviewExportView(APIView):
+    # GET: stream every submission of an interview as CSV (default) or NDJSON,
+    # archived ones included (archive.py). ?format=csv|ndjson. Owner and staff only.
+    permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = [CSVRenderer, NDJSONRenderer]
+    chunk_size = 2000
+
+    def get(self, request, pk, format=None):
+        interview = get_object_or_404(Interview, pk=pk)
+        if not (request.user.is_staff or interview.owner_id == request.user.id):
+            raise PermissionDenied("Only the interview owner can export submissions.")
+
+        rows = submission_rows(interview, chunk_size=self.chunk_size)
+        if request.accepted_renderer.format == "ndjson":
+            response = StreamingHttpResponse(
+                stream_ndjson(rows), content_type=NDJSONRenderer.media_type
+            )
+        else:
+            response = StreamingHttpResponse(stream_csv(rows), content_type="text/csv")
+        filename = f"interview-{interview.id}-submissions.{request.accepted_renderer.format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+        log.info(
+            "export_submissions",
+            interview=interview.id,
+            format=request.accepted_renderer.format,
+            user=request.user.username,
+        )
+        return response
+
+    # Errors are JSON whatever export format was asked for (or failed to negotiate)
+    def handle_exception(self, exc):
+        response = super().handle_exception(exc)
+        self.request.accepted_renderer = JSONRenderer()
+        self.request.accepted_media_type = JSONRenderer.media_type
+        return response
+
+
+class CacheStatsView(APIView):
+    # GET: response cache counters of this process (staff only)
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(cache_stats.snapshot())
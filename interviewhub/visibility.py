@@ -0,0 +1,111 @@
+from django.db.models import Exists, OuterRef, Q
+from rest_framework.exceptions import NotFound, PermissionDenied
+
+from .models import Interview
+from .response_cache import acached_fragment, cached_fragment
+
+# Who may see which interview, in one place:
+#   - staff see everything, owners their own interviews (published or not);
+#   - everyone else sees published interviews whose allowed_participants list is
+#     empty, or that list them (anonymous callers: only the unrestricted ones).
+#
+# Filters are EXISTS probes on the allowlist's (interview_id, user_id) unique
+# index: one index lookup per candidate interview, whatever the number of people
+# invited to it. No join, no DISTINCT.
+
+_Invited = Interview.allowed_participants.through
+
+
+def _restricted():
+    return Exists(_Invited.objects.filter(interview_id=OuterRef("pk")))
+
+
+def _invited(user_id):
+    return Exists(_Invited.objects.filter(interview_id=OuterRef("pk"), user_id=user_id))
+
+
+def _user_id(user):
+    return user.pk if user is not None and user.is_authenticated else None
+
+
+def _is_staff(user):
+    return user is not None and user.is_authenticated and user.is_staff
+
+
+# The interviews of `queryset` (default: all) that `user` may see
+def visible_interviews(user, queryset=None):
+    qs = Interview.objects.all() if queryset is None else queryset
+    if _is_staff(user):
+        return qs
+    user_id = _user_id(user)
+    if user_id is None:
+        return qs.filter(Q(is_published=True) & ~_restricted())
+    return qs.filter(
+        Q(owner_id=user_id) | Q(is_published=True) & (~_restricted() | _invited(user_id))
+    )
+
+
+# Cache key variant for payloads filtered by visible_interviews()
+def audience(user):
+    if _is_staff(user):
+        return "staff"
+    user_id = _user_id(user)
+    return "public" if user_id is None else f"user:{user_id}"
+
+
+# Raise NotFound/PermissionDenied unless `user` may see the interview described by
+# `facts` (owner_id, is_published, restricted); `invited()` is only asked when
+# it decides
+def _check(user, facts, invited):
+    if facts is None:
+        raise NotFound()
+    if _is_staff(user) or facts["owner_id"] == _user_id(user):
+        return
+    if not facts["is_published"]:
+        raise NotFound()
+    if facts["restricted"] and not invited():
+        raise PermissionDenied("You are not invited to this interview.")
+
+
+def _facts_queryset(pk):
+    return (
+        Interview.objects.filter(pk=pk)
+        .annotate(restricted=_restricted())
+        .values("owner_id", "is_published", "restricted")
+    )
+
+
+def _invited_queryset(user, pk):
+    return _Invited.objects.filter(interview_id=pk, user_id=_user_id(user))
+
+
+# The interview row (only `fields`, all when none) if `user` may see it.
+# One query: the access checks are annotations of the row.
+def interview_for(user, pk, *fields):
+    qs = Interview.objects.filter(pk=pk).annotate(
+        restricted=_restricted(), invited=_invited(_user_id(user))
+    )
+    if fields:
+        qs = qs.only("owner_id", "is_published", *fields)
+    interview = qs.first()
+    facts = None if interview is None else vars(interview)
+    _check(user, facts, lambda: interview.invited)
+    return interview
+
+
+# Access check for views serving a cached interview payload. The facts are
+# cached with the payload (scope interview:<pk>), so a cache hit only queries
+# the allowlist for restricted interviews.
+def check_visible(user, pk):
+    facts = cached_fragment("access", [f"interview:{pk}"], lambda: _facts_queryset(pk).first())
+    _check(user, facts, lambda: _invited_queryset(user, pk).exists())
+
+
+async def acheck_visible(user, pk):
+    facts = await acached_fragment(
+        "access", [f"interview:{pk}"], lambda: _facts_queryset(pk).afirst()
+    )
+    invited = None
+    if facts is not None and facts["restricted"] and user is not None:
+        invited = await _invited_queryset(user, pk).aexists()
+    _check(user, facts, lambda: invited)
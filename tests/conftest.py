@@ -0,0 +1,50 @@
+import pytest
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from rest_framework.test import APIClient
+
+from interviewhub.authentication import user_cache
+from interviewhub.models import Interview, Question
+from interviewhub.response_cache import stats
+from interviewhub.throttling import get_store
+
+
+@pytest.fixture(autouse=True)
+def _clear_response_cache():
+    # Primary keys are reused across tests, cached responses must not be
+    caches[settings.API_CACHE_ALIAS].clear()
+    caches[settings.IDEMPOTENCY_CACHE_ALIAS].clear()
+    stats.reset()
+    user_cache.clear()
+    get_store().clear()
+
+
+@pytest.fixture
+def facilitator(db):
+    return User.objects.create_user(username="fiona", password="pw", is_staff=True)
+
+
+@pytest.fixture
+def participant(db):
+    return User.objects.create_user(username="alice", password="pw")
+
+
+@pytest.fixture
+def client():
+    return APIClient()
+
+
+@pytest.fixture
+def interview(facilitator):
+    # Published interview with one question of each type
+    scale = Question.objects.create(title="Leadership clarity", qtype=Question.SCALE)
+    choice = Question.objects.create(
+        title="Preferred tool",
+        qtype=Question.MULTIPLE_CHOICE,
+        options=["Jira", "Confluence", "Slack"],
+    )
+    open_ended = Question.objects.create(title="Anything else?", qtype=Question.OPEN_ENDED)
+    iv = Interview.objects.create(owner=facilitator, title="Org Health Pulse", is_published=True)
+    iv.questions.set([scale, choice, open_ended])
+    return iv
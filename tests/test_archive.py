@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from interviewhub.archive import archive_interview, archive_path, archived_rows
+from interviewhub.exports import EXPORT_COLUMNS
+from interviewhub.models import Interview, Question, Submission, SubmissionArchive
+from interviewhub.results import rebuild_results
+
+
+def _body(resp):
+    return b"".join(resp.streaming_content).decode()
+
+
+@pytest.fixture
+def closed(settings, tmp_path, interview, participant, django_user_model):
+    settings.SUBMISSION_ARCHIVE_DIR = str(tmp_path)
+    bob = django_user_model.objects.create_user(username="bob", password="pw")
+    for user in (participant, bob):
+        for question in interview.questions.all():
+            Submission.objects.create(
+                candidate=user,
+                interview=interview,
+                question=question,
+                answer_text={Question.SCALE: "4", Question.MULTIPLE_CHOICE: "0"}.get(
+                    question.qtype, "Fine"
+                ),
+                meta={"dept": "ops"},
+            )
+    Submission.objects.update(submitted_at=timezone.now() - timedelta(days=400))
+    rebuild_results()
+    interview.is_published = False
+    interview.save()
+    return interview
+
+
+@pytest.mark.django_db
+def test_archive_moves_rows_and_reads_through(
+    client, facilitator, closed, capsys, django_capture_on_commit_callbacks
+):
+    client.force_authenticate(facilitator)
+    export = f"/api/interviews/{closed.id}/export/?format=ndjson"
+    before_export = _body(client.get(export))
+    before_results = client.get(f"/api/interviews/{closed.id}/results/").json()
+
+    call_command("archive_submissions", older_than=500)
+    assert "Archived 0 submissions." in capsys.readouterr().out
+    call_command("archive_submissions", older_than=365, batch_size=4)
+    assert "Interview %d: 6 submissions archived." % closed.id in capsys.readouterr().out
+
+    assert not Submission.objects.exists()
+    archive = SubmissionArchive.objects.get(interview=closed)
+    assert archive.row_count == 6 and not archive.anonymised
+    assert _body(client.get(export)) == before_export
+    # Aggregates keep the archived answers, also through a rebuild
+    rebuild_results()
+    assert client.get(f"/api/interviews/{closed.id}/results/").json() == before_results
+
+    # Archived answers no longer hold their unique keys: new answers are refused
+    question = closed.questions.first()
+    answer = {"question": question.id, "answer_text": "4"}
+    resp = client.post(
+        "/api/submissions/create/", {**answer, "interview": closed.id}, format="json"
+    )
+    assert resp.status_code == 409
+    resp = client.post(f"/api/interviews/{closed.id}/submissions/", [answer], format="json")
+    assert resp.status_code == 409
+    assert not Submission.objects.exists()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        closed.delete()
+    assert not archive_path(archive).exists()
+
+
+@pytest.mark.django_db
+def test_interrupted_batch_is_discarded_and_anonymous_rows_are_stripped(closed):
+    closed.confidentiality = Interview.CONF_ANON
+    closed.save()
+    assert archive_interview(closed, batch_size=4) == 6
+    archive = SubmissionArchive.objects.get(interview=closed)
+    size = archive.size
+
+    # A batch written to the file whose deletes never committed
+    with open(archive_path(archive), "ab") as fh:
+        fh.write(b"\x1f\x8b partial")
+    Submission.objects.create(
+        candidate=closed.owner, interview=closed, question=closed.questions.first()
+    )
+    assert archive_interview(closed) == 1
+    archive.refresh_from_db()
+    assert archive.anonymised and archive.row_count == 7 and archive.size > size
+
+    records = [dict(zip(EXPORT_COLUMNS, row)) for row in archived_rows(closed)]
+    assert len(records) == 7
+    assert all(r["candidate"] is None and r["meta"] == {} for r in records)
@@ -0,0 +1,82 @@
+import pytest
+from rest_framework_simplejwt.tokens import AccessToken
+
+from interviewhub.models import Submission
+
+
+def _login(client, username="alice", password="pw"):
+    resp = client.post(
+        "/api/auth/token/", {"username": username, "password": password}, format="json"
+    )
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def _bearer(client, access):
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+
+@pytest.mark.django_db
+def test_requests_authenticate_from_claims_and_cache(
+    client, interview, participant, django_assert_num_queries
+):
+    tokens = _login(client)
+    claims = AccessToken(tokens["access"])
+    assert claims["username"] == "alice" and claims["is_staff"] is False
+    _bearer(client, tokens["access"])
+
+    question = interview.questions.get(qtype="Scale")
+    resp = client.post(
+        "/api/submissions/create/",
+        {"interview": interview.id, "question": question.id, "answer_text": "4"},
+        format="json",
+    )
+    assert resp.status_code == 201
+    assert Submission.objects.get().candidate_id == participant.id
+
+    # The user row was cached at login: COUNT + page only, no user query
+    with django_assert_num_queries(2):
+        assert client.get("/api/submissions/").status_code == 200
+
+    # Fields outside the claims come from the cached full row
+    participant.email = "alice@example.com"
+    participant.save()
+    assert client.get("/api/whoami/").json()["email"] == "alice@example.com"
+
+
+@pytest.mark.django_db
+def test_deactivation_and_password_change_revoke_tokens(client, participant):
+    _bearer(client, _login(client)["access"])
+    assert client.get("/api/submissions/").status_code == 200
+
+    participant.is_active = False
+    participant.save()
+    assert client.get("/api/submissions/").json()["detail"] == "User is inactive"
+
+    participant.is_active = True
+    participant.save()
+    assert client.get("/api/submissions/").status_code == 200
+
+    participant.set_password("new-pw")
+    participant.save()
+    assert client.get("/api/submissions/").status_code == 401
+    _bearer(client, _login(client, password="new-pw")["access"])
+    assert client.get("/api/submissions/").status_code == 200
+
+
+@pytest.mark.django_db
+def test_stale_claims_are_refused_and_refresh_updates_them(client, participant):
+    tokens = _login(client)
+    participant.is_staff = True
+    participant.save()
+
+    _bearer(client, tokens["access"])
+    resp = client.get("/api/submissions/")
+    assert resp.status_code == 401
+    assert resp.json()["detail"] == "Token claims are out of date, log in again."
+
+    client.credentials()
+    refreshed = client.post("/api/auth/refresh/", {"refresh": tokens["refresh"]}, format="json")
+    assert AccessToken(refreshed.json()["access"])["is_staff"] is True
+    _bearer(client, refreshed.json()["access"])
+    assert client.get("/api/cache/stats/").status_code == 200
@@ -0,0 +1,33 @@
+import pytest
+
+from benchmarks.fixtures import seed
+from benchmarks.suite import compare, run_suite
+
+
+@pytest.mark.django_db
+def test_benchmark_suite_runs_on_a_tiny_dataset():
+    data = seed(users=6, questions=9, interviews=2, per_interview=3)
+
+    results = run_suite(data, requests=2, warmup=1)
+
+    assert set(results) == {
+        "token_obtain",
+        "question_search",
+        "interview_list",
+        "interview_detail",
+        "submission_create",
+        "submission_list",
+    }
+    for name, r in results.items():
+        assert all(200 <= s < 300 for s in r["statuses"]), name
+        assert r["p99_ms"] >= r["p50_ms"] > 0
+
+
+def test_compare_flags_query_and_latency_regressions():
+    baseline = {"scenarios": {"list": {"queries_per_request": 2, "p95_ms": 10.0}}}
+
+    ok = {"scenarios": {"list": {"queries_per_request": 2, "p95_ms": 12.0}}}
+    slow = {"scenarios": {"list": {"queries_per_request": 3, "p95_ms": 20.0}}}
+
+    assert compare(ok, baseline, tolerance=0.5) == []
+    assert len(compare(slow, baseline, tolerance=0.5)) == 2
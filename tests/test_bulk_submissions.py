@@ -0,0 +1,68 @@
+import pytest
+
+from interviewhub.models import Question, Submission
+from interviewhub.question_sets import current_snapshot
+
+
+def _questions(interview):
+    return {q.qtype: q for q in interview.questions.all()}
+
+
+@pytest.mark.django_db
+def test_bulk_submit_creates_all_answers(client, participant, interview):
+    qs = _questions(interview)
+    client.force_authenticate(participant)
+
+    resp = client.post(
+        f"/api/interviews/{interview.id}/submissions/",
+        [
+            {"question": qs[Question.SCALE].id, "answer_text": "4"},
+            {"question": qs[Question.MULTIPLE_CHOICE].id, "answer_text": "2"},
+            {"question": qs[Question.OPEN_ENDED].id, "answer_text": "All good"},
+        ],
+        format="json",
+    )
+
+    assert resp.status_code == 201
+    assert len(resp.data["created"]) == 3
+    assert resp.data["errors"] == []
+    assert Submission.objects.filter(candidate=participant, interview=interview).count() == 3
+
+
+@pytest.mark.django_db
+def test_bulk_submit_reports_errors_per_item(
+    client, participant, interview, django_assert_max_num_queries
+):
+    qs = _questions(interview)
+    Submission.objects.create(
+        candidate=participant, interview=interview, question=qs[Question.SCALE], answer_text="3"
+    )
+    # Taken once by the first submission after an edit (question_sets.py)
+    interview.refresh_from_db()
+    current_snapshot(interview)
+    client.force_authenticate(participant)
+
+    # Includes the participant's progress row: one upsert and one UPDATE
+    with django_assert_max_num_queries(14):
+        resp = client.post(
+            f"/api/interviews/{interview.id}/submissions/",
+            [
+                {"question": qs[Question.SCALE].id, "answer_text": "5"},  # already answered
+                {"question": qs[Question.MULTIPLE_CHOICE].id, "answer_text": "Email"},
+                {"question": 999999, "answer_text": "x"},
+                {"question": qs[Question.OPEN_ENDED].id, "answer_text": "Fine"},
+                {"question": qs[Question.OPEN_ENDED].id, "answer_text": "Twice"},
+            ],
+            format="json",
+        )
+
+    assert resp.status_code == 201
+    assert [s["question"] for s in resp.data["created"]] == [qs[Question.OPEN_ENDED].id]
+    assert [e["index"] for e in resp.data["errors"]] == [0, 1, 2, 4]
+    assert Submission.objects.get(question=qs[Question.SCALE]).answer_text == "3"
+
+
+@pytest.mark.django_db
+def test_bulk_submit_requires_auth(client, interview):
+    resp = client.post(f"/api/interviews/{interview.id}/submissions/", [], format="json")
+    assert resp.status_code == 401
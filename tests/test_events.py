@@ -0,0 +1,173 @@
+import asyncio
+import json
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import AsyncRequestFactory
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from interviewhub.async_views import InterviewEventsAsyncView
+from interviewhub.events import _poll_batch, _poll_start, bus, stats
+from interviewhub.models import Interview, Question, Submission
+
+factory = AsyncRequestFactory()
+view = InterviewEventsAsyncView.as_view()
+
+
+async def _connect(interview, user=None):
+    headers = {}
+    if user is not None:
+        headers["Authorization"] = f"Bearer {AccessToken.for_user(user)}"
+    return await view(factory.get("/", headers=headers), pk=interview.pk)
+
+
+def _events(chunk):
+    events = []
+    for block in chunk.decode().strip().split("\n\n"):
+        name, data = block.split("\n")
+        events.append((name.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def _answer(user, interview, capture):
+    client = APIClient()
+    client.force_authenticate(user)
+    scale = interview.questions.get(qtype=Question.SCALE)
+    choice = interview.questions.get(qtype=Question.MULTIPLE_CHOICE)
+    with capture(execute=True):
+        client.post(
+            f"/api/interviews/{interview.id}/submissions/",
+            [
+                {"question": scale.id, "answer_text": "4"},
+                {"question": choice.id, "answer_text": "1", "is_anonymous": True},
+            ],
+            format="json",
+        )
+    return scale, choice
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("confidentiality", [Interview.CONF_INTERNAL, Interview.CONF_ANON])
+def test_committed_submissions_are_pushed(
+    interview, participant, confidentiality, django_capture_on_commit_callbacks
+):
+    interview.confidentiality = confidentiality
+    interview.save()
+
+    async def listen():
+        resp = await _connect(interview, interview.owner)
+        assert resp["Content-Type"] == "text/event-stream"
+        stream = resp.streaming_content
+        assert await anext(stream) == b"retry: 3000\n\n"
+        questions = await sync_to_async(_answer)(
+            participant, interview, django_capture_on_commit_callbacks
+        )
+        chunk = await asyncio.wait_for(anext(stream), 5)
+        await stream.aclose()
+        return questions, _events(chunk)
+
+    (scale, choice), events = async_to_sync(listen)()
+    assert [name for name, _data in events] == ["submission", "submission", "results"]
+    first, second = events[0][1], events[1][1]
+    if confidentiality == Interview.CONF_ANON:
+        assert "answer_text" not in first and first["candidate"] is None
+    else:
+        assert first["answer_text"] == "4" and first["candidate"] == participant.id
+        # Flagged anonymous by the participant
+        assert second["candidate"] is None
+    assert events[2][1]["questions"] == [
+        {"question": scale.id, "responses": 1, "buckets": {"4": 1}},
+        {"question": choice.id, "responses": 1, "buckets": {"Confluence": 1}},
+    ]
+    # Closing the stream unsubscribes
+    assert not bus.has_listeners(interview.id)
+
+
+@pytest.mark.django_db
+def test_listeners_are_capped_and_restricted(interview, participant, settings):
+    settings.EVENTS_MAX_LISTENERS_PER_INTERVIEW = 1
+
+    async def connect_twice():
+        first = await _connect(interview, interview.owner)
+        stream = first.streaming_content
+        await anext(stream)
+        second = await _connect(interview, interview.owner)
+        await stream.aclose()
+        return first.status_code, second.status_code
+
+    assert async_to_sync(connect_twice)() == (200, 503)
+    assert async_to_sync(_connect)(interview, participant).status_code == 403
+    assert async_to_sync(_connect)(interview).status_code == 401
+
+
+@pytest.mark.django_db
+def test_slow_listener_gets_a_resync_instead_of_a_backlog(settings):
+    settings.EVENTS_QUEUE_SIZE = 3
+    stats.reset()
+
+    async def flood():
+        subscription = bus.subscribe(42)
+        bus.publish(42, [{"event": "submission", "data": {"id": n}} for n in range(2)])
+        bus.publish(42, [{"event": "submission", "data": {"id": n}} for n in range(2, 5)])
+        bus.publish(42, [{"event": "submission", "data": {"id": 5}}])
+        overflowed = await subscription.drain(1)
+        bus.publish(42, [{"event": "submission", "data": {"id": 6}}])
+        caught_up = await subscription.drain(1)
+        bus.unsubscribe(subscription)
+        return overflowed, caught_up
+
+    overflowed, caught_up = async_to_sync(flood)()
+    assert overflowed == [{"event": "resync", "data": {"interview": 42}}]
+    assert caught_up == [{"event": "submission", "data": {"id": 6}}]
+    assert stats.snapshot()["dropped"] == 6
+
+
+@pytest.mark.django_db
+def test_poll_backend_reads_new_rows(interview, participant, settings):
+    settings.EVENTS_BACKEND = "poll"
+    settings.EVENTS_POLL_INTERVAL = 0.01
+    question = interview.questions.get(qtype=Question.OPEN_ENDED)
+
+    async def listen():
+        resp = await _connect(interview, interview.owner)
+        stream = resp.streaming_content
+        await anext(stream)
+        # Let the poller take its starting point
+        await asyncio.sleep(0.1)
+        await Submission.objects.acreate(
+            candidate=participant, interview=interview, question=question, answer_text="Fine"
+        )
+        chunk = await asyncio.wait_for(anext(stream), 5)
+        await stream.aclose()
+        return _events(chunk)
+
+    events = async_to_sync(listen)()
+    assert events[0][1]["answer_text"] == "Fine"
+    assert events[1] == (
+        "results",
+        {
+            "interview": interview.id,
+            "questions": [{"question": question.id, "responses": 1, "buckets": {}}],
+        },
+    )
+
+
+@pytest.mark.django_db
+def test_poll_batch_picks_up_rows_committed_after_a_higher_id(interview, participant):
+    before = Submission.objects.create(
+        candidate=participant, interview=interview, question=interview.questions.first()
+    )
+    last_id, seen = _poll_start(interview.id)
+    assert seen == {before.id: before.submitted_at}
+    late, sent = (
+        Submission.objects.create(candidate=participant, interview=interview, question=q)
+        for q in interview.questions.all()[1:]
+    )
+    # `sent` went out first, `late` (lower id) only became visible afterwards
+    last_id, seen[sent.id] = sent.id, sent.submitted_at
+
+    _interview, rows, _questions = _poll_batch(interview.id, last_id, seen)
+    assert [r.id for r in rows] == [late.id]
+    seen[late.id] = late.submitted_at
+    assert _poll_batch(interview.id, last_id, seen)[1] == []
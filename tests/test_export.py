@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+
+import pytest
+
+from interviewhub.models import Interview, Question, Submission
+
+
+def _body(resp):
+    return b"".join(resp.streaming_content).decode()
+
+
+@pytest.fixture
+def answered(interview, participant, django_user_model):
+    bob = django_user_model.objects.create_user(username="bob", password="pw")
+    scale = interview.questions.get(qtype=Question.SCALE)
+    Submission.objects.create(
+        candidate=participant,
+        interview=interview,
+        question=scale,
+        answer_text="4",
+        meta={"dept": "ops"},
+    )
+    Submission.objects.create(
+        candidate=bob, interview=interview, question=scale, answer_text="2", is_anonymous=True
+    )
+    return interview
+
+
+@pytest.mark.django_db
+def test_export_csv_streams_rows_and_redacts_anonymous(client, facilitator, answered):
+    client.force_authenticate(facilitator)
+
+    resp = client.get(f"/api/interviews/{answered.id}/export/?format=csv")
+
+    assert resp.status_code == 200 and resp.streaming
+    rows = list(csv.DictReader(io.StringIO(_body(resp))))
+    assert [r["candidate_username"] for r in rows] == ["alice", ""]
+    assert json.loads(rows[0]["meta"]) == {"dept": "ops"}
+
+
+@pytest.mark.django_db
+def test_export_ndjson_redacts_anonymous_interviews(client, facilitator, answered):
+    answered.confidentiality = Interview.CONF_ANON
+    answered.save()
+    client.force_authenticate(facilitator)
+
+    resp = client.get(f"/api/interviews/{answered.id}/export/?format=ndjson")
+
+    records = [json.loads(line) for line in _body(resp).splitlines()]
+    assert len(records) == 2
+    assert all(r["candidate"] is None and r["candidate_username"] is None for r in records)
+
+
+@pytest.mark.django_db
+def test_export_is_owner_only(client, participant, answered):
+    client.force_authenticate(participant)
+    assert client.get(f"/api/interviews/{answered.id}/export/?format=csv").status_code == 403
+
+
+@pytest.mark.django_db
+def test_export_errors_are_json(client, facilitator, participant, answered):
+    client.force_authenticate(facilitator)
+    missing = client.get("/api/interviews/999999/export/?format=csv")
+    assert missing.status_code == 404
+    assert missing["Content-Type"] == "application/json"
+    assert "detail" in missing.json()
+
+    client.force_authenticate(participant)
+    denied = client.get(f"/api/interviews/{answered.id}/export/?format=ndjson")
+    assert denied.status_code == 403
+    assert denied["Content-Type"] == "application/json"
@@ -0,0 +1,97 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from interviewhub.models import Question, ScoringJob, Submission
+
+
+def _payload(interview, qtype, answer):
+    question = interview.questions.get(qtype=qtype)
+    return {"interview": interview.id, "question": question.id, "answer_text": answer}
+
+
+@pytest.mark.django_db
+def test_retry_replays_first_response_without_queries(client, participant, interview):
+    client.force_authenticate(participant)
+    payload = _payload(interview, Question.SCALE, "4")
+    first = client.post(
+        "/api/submissions/create/", payload, format="json", HTTP_IDEMPOTENCY_KEY="k1"
+    )
+    assert first.status_code == 201
+
+    with CaptureQueriesContext(connection) as ctx:
+        retry = client.post(
+            "/api/submissions/create/", payload, format="json", HTTP_IDEMPOTENCY_KEY="k1"
+        )
+    # force_authenticate: no user lookup either
+    assert len(ctx.captured_queries) == 0
+    assert retry.status_code == 201 and retry["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert Submission.objects.count() == 1
+
+    other = client.post(
+        "/api/submissions/create/",
+        {**payload, "answer_text": "5"},
+        format="json",
+        HTTP_IDEMPOTENCY_KEY="k1",
+    )
+    assert other.status_code == 422
+    # Without a key the duplicate is still rejected
+    again = client.post("/api/submissions/create/", payload, format="json")
+    assert again.status_code == 400
+
+
+@pytest.mark.django_db
+def test_upsert_replaces_the_answer_and_moves_the_results(
+    client, participant, facilitator, interview
+):
+    client.force_authenticate(participant)
+    url = "/api/submissions/create/?upsert=1"
+    created = client.post(url, _payload(interview, Question.MULTIPLE_CHOICE, "0"), format="json")
+    assert created.status_code == 201
+    updated = client.post(url, _payload(interview, Question.MULTIPLE_CHOICE, "2"), format="json")
+    assert updated.status_code == 200
+    assert updated.json()["id"] == created.json()["id"]
+
+    submission = Submission.objects.get()
+    assert submission.answer_text == "2"
+    assert ScoringJob.objects.get(submission=submission).status == ScoringJob.PENDING
+
+    client.force_authenticate(facilitator)
+    results = client.get(f"/api/interviews/{interview.id}/results/").json()
+    choice = next(q for q in results["questions"] if q["qtype"] == Question.MULTIPLE_CHOICE)
+    assert choice["responses"] == 1
+    assert [o["count"] for o in choice["options"]] == [0, 0, 1]
+
+
+@pytest.mark.django_db
+def test_upsert_losing_the_insert_race_becomes_an_edit(
+    client, participant, facilitator, interview, monkeypatch
+):
+    from interviewhub.views import SubmissionCreateView
+
+    client.force_authenticate(participant)
+    url = "/api/submissions/create/?upsert=1"
+    payload = _payload(interview, Question.MULTIPLE_CHOICE, "0")
+    assert client.post(url, payload, format="json").status_code == 201
+
+    # The lookup ran before a concurrent first answer was committed: it found nothing
+    locked = SubmissionCreateView._locked_answer
+    calls = []
+
+    def racing(view, *args):
+        calls.append(args)
+        return None if len(calls) == 1 else locked(view, *args)
+
+    monkeypatch.setattr(SubmissionCreateView, "_locked_answer", racing)
+    resp = client.post(url, {**payload, "answer_text": "2"}, format="json")
+    assert resp.status_code == 200 and len(calls) == 2
+    assert Submission.objects.get().answer_text == "2"
+
+    client.force_authenticate(facilitator)
+    results = client.get(f"/api/interviews/{interview.id}/results/").json()
+    choice = next(q for q in results["questions"] if q["qtype"] == Question.MULTIPLE_CHOICE)
+    assert choice["responses"] == 1
+    assert [o["count"] for o in choice["options"]] == [0, 0, 1]
+    progress = client.get(f"/api/interviews/{interview.id}/progress/").json()
+    assert progress["results"][0]["answered_count"] == 1
@@ -0,0 +1,46 @@
+import pytest
+from structlog.testing import capture_logs
+
+from interviewhub.instrumentation import HISTOGRAMS
+
+
+@pytest.fixture(autouse=True)
+def _clear_histograms():
+    for histogram in HISTOGRAMS:
+        histogram.clear()
+
+
+@pytest.mark.django_db
+def test_server_timing_and_metrics_endpoint(client, interview):
+    resp = client.get(f"/api/interviews/{interview.id}/", HTTP_X_REQUEST_ID="abc123")
+    assert resp["X-Request-ID"] == "abc123"
+    timing = resp["Server-Timing"]
+    assert timing.startswith("db;dur=") and "ser;dur=" in timing and "total;dur=" in timing
+
+    metrics = client.get("/metrics")
+    assert metrics.status_code == 200
+    body = metrics.content.decode()
+    assert (
+        'interviewhub_request_duration_seconds_count{method="GET",'
+        'route="/api/interviews/<int:pk>/",status="200"} 1'
+    ) in body
+    # The detail payload and its access facts (visibility.py)
+    assert 'interviewhub_response_cache_total{result="miss"} 2' in body
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_is_restricted(client, settings):
+    settings.METRICS_ALLOWED_IPS = ["10.0.0.1"]
+    assert client.get("/metrics").status_code == 403
+
+
+@pytest.mark.django_db
+def test_query_threshold_logs_offending_sql(client, interview, participant, settings):
+    settings.REQUEST_MAX_QUERIES = 1
+    client.force_authenticate(participant)
+    with capture_logs() as logs:
+        client.get("/api/submissions/")
+    warning = next(e for e in logs if e["event"] == "high_query_count")
+    assert warning["route"] == "/api/submissions/"
+    assert warning["query_count"] >= 1
+    assert any("interviewhub_submission" in s["sql"] for s in warning["top_sql"])
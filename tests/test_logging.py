@@ -0,0 +1,73 @@
+import io
+import json
+import logging
+import threading
+import time
+
+import structlog
+from django.conf import settings
+
+from interviewhub.log_pipeline import QueuedHandler, SamplingFilter, json_formatter, stats
+
+
+def _logger(name, handler):
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.propagate = False
+    return structlog.get_logger(name)
+
+
+class _StalledStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, text):
+        self.release.wait(5)
+        return super().write(text)
+
+
+def test_full_queue_drops_instead_of_blocking():
+    stats.reset()
+    stream = _StalledStream()
+    handler = QueuedHandler(maxsize=2, stream=stream)
+    handler.setFormatter(json_formatter())
+    log = _logger("tests.logging.stalled", handler)
+
+    start = time.perf_counter()
+    for n in range(20):
+        log.info("create_submission", n=n)
+    assert time.perf_counter() - start < 1
+    counts = stats.snapshot()
+    # One record held by the stalled writer, two queued, the rest dropped
+    assert counts["queued"] + counts["dropped"] == 20 and counts["dropped"] >= 17
+
+    stream.release.set()
+    handler.close()
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert len(lines) == counts["queued"] and lines[0]["n"] == 0
+
+
+def test_answers_follow_confidentiality_and_sampling():
+    stats.reset()
+    stream = io.StringIO()
+    handler = QueuedHandler(stream=stream)
+    handler.setFormatter(json_formatter(settings.LOG_FIELD_POLICIES))
+    handler.addFilter(SamplingFilter({"request": 0.0}))
+    log = _logger("tests.logging.policies", handler)
+
+    answer = "My manager " * 50
+    log.info("create_submission", answer=answer, confidentiality="internal")
+    log.info("create_submission", answer=answer, confidentiality="anonymous")
+    log.info("create_submission", answer=answer)
+    log.info("request", path="/api/")
+    log.warning("request", path="/api/slow/")
+    handler.close()
+
+    internal, anonymous, unknown, slow = map(json.loads, stream.getvalue().splitlines())
+    assert internal["answer"] == answer[:200] + "…" and internal["answer_length"] == 550
+    assert anonymous["answer"].startswith("blake2b:") and "manager" not in anonymous["answer"]
+    assert unknown["answer"] == anonymous["answer"]
+    # Sampled-out info event, warning kept
+    assert slow["path"] == "/api/slow/"
+    assert stats.snapshot()["sampled_out"] == 1
@@ -0,0 +1,75 @@
+import pytest
+
+from interviewhub.models import Interview, Question, Submission
+
+
+def _walk(client, url, key="next"):
+    ids = []
+    while url:
+        resp = client.get(url)
+        assert resp.status_code == 200
+        assert "count" not in resp.data
+        ids += [row["id"] for row in resp.data["results"]]
+        url = resp.data[key]
+    return ids
+
+
+@pytest.mark.django_db
+def test_keyset_pagination_walks_submissions_in_order(client, participant, facilitator):
+    iv = Interview.objects.create(owner=facilitator, title="Pulse")
+    questions = Question.objects.bulk_create([Question(title=f"Q{i}") for i in range(7)])
+    iv.questions.set(questions)
+    # Same submitted_at for every row: ties are broken on id
+    subs = Submission.objects.bulk_create(
+        [Submission(candidate=participant, interview=iv, question=q) for q in questions]
+    )
+    Submission.objects.update(submitted_at=subs[0].submitted_at)
+    expected = sorted(s.id for s in subs)[::-1]
+    client.force_authenticate(participant)
+
+    assert _walk(client, "/api/submissions/?pagination=cursor&page_size=3") == expected
+
+    # And back again from the last page
+    last = client.get("/api/submissions/?pagination=cursor&page_size=3")
+    while last.data["next"]:
+        last = client.get(last.data["next"])
+    back = _walk(client, last.data["previous"], key="previous")
+    assert back == expected[3:6] + expected[0:3]
+
+
+@pytest.mark.django_db
+def test_page_number_pagination_is_still_the_default(client):
+    Question.objects.bulk_create([Question(title=f"Q{i}") for i in range(12)])
+
+    resp = client.get("/api/questions/?page_size=5&page=2")
+
+    assert resp.data["count"] == 12
+    assert len(resp.data["results"]) == 5
+
+
+@pytest.mark.django_db
+def test_keyset_page_size_is_capped(client, settings):
+    Question.objects.bulk_create([Question(title=f"Q{i}") for i in range(5)])
+    settings.API_MAX_PAGE_SIZE = 2
+
+    resp = client.get("/api/questions/?pagination=cursor&page_size=50")
+
+    assert len(resp.data["results"]) == 2
+
+
+@pytest.mark.django_db
+def test_ranked_search_keeps_page_numbers(client):
+    Question.objects.create(title="Tooling survey", body="tool tool tool")
+    Question.objects.create(title="Tool")
+    Question.objects.create(title="Team health")
+
+    ranked = client.get("/api/questions/?search=tool")
+    resp = client.get("/api/questions/?search=tool&pagination=cursor")
+
+    assert resp.data["count"] == 2
+    assert resp.data["results"] == ranked.data["results"]
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_is_404(client):
+    assert client.get("/api/interviews/?cursor=not-a-cursor").status_code == 404
@@ -0,0 +1,84 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from interviewhub.models import ParticipantProgress
+
+
+def _invited(interview):
+    return set(interview.allowed_participants.values_list("username", flat=True))
+
+
+@pytest.mark.django_db
+def test_invite_and_remove_by_id_and_username(client, interview, facilitator, participant):
+    bob = User.objects.create_user(username="bob", password="pw")
+    url = f"/api/interviews/{interview.id}/participants/"
+
+    client.force_authenticate(participant)
+    assert client.post(url, [participant.id], format="json").status_code == 403
+
+    client.force_authenticate(facilitator)
+    resp = client.post(url, [participant.id, "bob", "nobody", 999999], format="json")
+    assert resp.status_code == 200
+    assert resp.json() == {"added": 2, "removed": 0, "not_found": 2, "unknown": ["nobody", 999999]}
+    assert _invited(interview) == {"alice", "bob"}
+    assert ParticipantProgress.objects.filter(interview=interview).count() == 2
+    # The list now hides the interview from people outside it
+    client.force_authenticate(User.objects.create_user(username="carol", password="pw"))
+    assert client.get("/api/interviews/").json()["results"] == []
+
+    client.force_authenticate(facilitator)
+    assert client.post(url, ["bob"], format="json").json()["added"] == 0
+    resp = client.delete(url, [bob.id], format="json")
+    assert resp.json()["removed"] == 1 and _invited(interview) == {"alice"}
+    assert client.post(url, {"users": [1]}, format="json").status_code == 400
+    assert client.post(url, [True], format="json").status_code == 400
+
+
+@pytest.mark.django_db
+def test_csv_replace_writes_in_chunks(client, interview, facilitator, participant):
+    users = User.objects.bulk_create([User(username=f"u{i}") for i in range(1200)])
+    interview.allowed_participants.add(participant)
+    body = "username\n" + "\n".join(u.username for u in users) + "\n"
+
+    client.force_authenticate(facilitator)
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.post(
+            f"/api/interviews/{interview.id}/participants/?replace=1",
+            body,
+            content_type="text/csv",
+        )
+    assert resp.json() == {"added": 1200, "removed": 1, "not_found": 0, "unknown": []}
+    assert interview.allowed_participants.count() == 1200
+    # Set-based: the query count follows the chunks, not the users
+    assert len(ctx.captured_queries) < 30
+
+    bad = client.post(
+        f"/api/interviews/{interview.id}/participants/", "id\nabc\n", content_type="text/csv"
+    )
+    assert bad.status_code == 400
+
+
+@pytest.mark.django_db
+def test_invite_command(tmp_path, capsys, interview, participant):
+    User.objects.create_user(username="bob", password="pw")
+    csv_file = tmp_path / "team.csv"
+    csv_file.write_text(f"id,username\n{participant.id},\n,bob\n,ghost\n")
+
+    call_command("invite_participants", interview.id, csv=str(csv_file), chunk_size=2)
+    out = capsys.readouterr()
+    assert "2 added, 0 removed, 1 not found" in out.out
+    assert out.err == "no such user: ghost\n"
+
+    call_command("invite_participants", interview.id, username=["bob"], remove=True)
+    assert "0 added, 1 removed, 0 not found" in capsys.readouterr().out
+    assert _invited(interview) == {"alice"}
+
+    # The file is read as it is applied: a bad line stops before --replace uninvites
+    bad_file = tmp_path / "bad.csv"
+    bad_file.write_text("id\nabc\n")
+    with pytest.raises(CommandError, match="not a user id"):
+        call_command("invite_participants", interview.id, csv=str(bad_file), replace=True)
+    assert _invited(interview) == {"alice"}
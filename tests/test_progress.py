@@ -0,0 +1,114 @@
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from interviewhub.models import ParticipantProgress, Question, Submission
+from interviewhub.progress import rebuild_progress
+
+
+def _progress(interview):
+    return {
+        p.candidate.username: (p.status, p.answered_count, p.completed_at is not None)
+        for p in ParticipantProgress.objects.filter(interview=interview).select_related("candidate")
+    }
+
+
+@pytest.mark.django_db
+def test_progress_follows_invitations_and_answers(client, interview, participant):
+    bob = User.objects.create_user(username="bob", password="pw")
+    carol = User.objects.create_user(username="carol", password="pw")
+    interview.allowed_participants.add(participant, bob, carol)
+    scale, choice, open_ended = interview.questions.order_by("id")
+
+    client.force_authenticate(participant)
+    client.post(
+        "/api/submissions/create/",
+        {"interview": interview.id, "question": scale.id, "answer_text": "4"},
+        format="json",
+    )
+    client.force_authenticate(bob)
+    client.post(
+        f"/api/interviews/{interview.id}/submissions/",
+        [
+            {"question": scale.id, "answer_text": "2"},
+            {"question": choice.id, "answer_text": "Jira"},
+            {"question": open_ended.id, "answer_text": "No"},
+        ],
+        format="json",
+    )
+    assert _progress(interview) == {
+        "alice": ("in_progress", 1, False),
+        "bob": ("completed", 3, True),
+        "carol": ("not_started", 0, False),
+    }
+
+    url = f"/api/interviews/{interview.id}/progress/"
+    assert client.get(url).status_code == 403
+
+    client.force_authenticate(interview.owner)
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get(url, {"page_size": 2})
+    assert resp.status_code == 200
+    # Served from the progress table alone
+    assert not any("interviewhub_submission" in q["sql"] for q in ctx.captured_queries)
+    page = resp.json()
+    assert "summary" not in page
+    assert [row["username"] for row in page["results"]] == ["alice", "bob"]
+    assert page["results"][1]["completed"] is True
+    rest = client.get(page["next"]).json()
+    assert [row["username"] for row in rest["results"]] == ["carol"]
+
+    completed = client.get(url, {"status": "completed"}).json()["results"]
+    assert [row["candidate"] for row in completed] == [bob.id]
+    assert client.get(url, {"candidate": carol.id}).json()["results"][0]["status"] == "not_started"
+    assert client.get(url, {"status": "done"}).status_code == 400
+
+    summary = f"{url}summary/"
+    expected = {"questions": 3, "not_started": 1, "in_progress": 1, "completed": 1}
+    assert client.get(summary).json() == expected
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get(summary).json() == expected
+    assert not any("interviewhub_participantprogress" in q["sql"] for q in ctx.captured_queries)
+    # A write to the progress rows refreshes it
+    client.force_authenticate(carol)
+    client.post(
+        f"/api/interviews/{interview.id}/submissions/",
+        [{"question": choice.id, "answer_text": "Jira"}],
+        format="json",
+    )
+    client.force_authenticate(interview.owner)
+    assert client.get(summary).json() == {**expected, "not_started": 0, "in_progress": 2}
+
+
+@pytest.mark.django_db
+def test_progress_tracks_deletes_question_changes_and_rebuilds(client, interview, participant):
+    bob = User.objects.create_user(username="bob", password="pw")
+    interview.allowed_participants.add(participant, bob)
+    scale, choice, open_ended = interview.questions.order_by("id")
+    client.force_authenticate(participant)
+    client.post(
+        f"/api/interviews/{interview.id}/submissions/",
+        [
+            {"question": scale.id, "answer_text": "3"},
+            {"question": choice.id, "answer_text": "0"},
+            {"question": open_ended.id, "answer_text": "Fine"},
+        ],
+        format="json",
+    )
+    assert _progress(interview)["alice"] == ("completed", 3, True)
+
+    # A new question re-opens the interview for everyone who finished it
+    interview.questions.add(Question.objects.create(title="Follow-up"))
+    assert _progress(interview)["alice"] == ("in_progress", 3, False)
+
+    Submission.objects.filter(candidate=participant).first().delete()
+    assert _progress(interview)["alice"] == ("in_progress", 2, False)
+
+    # Uninvited before answering: the row goes
+    interview.allowed_participants.remove(bob)
+    assert set(_progress(interview)) == {"alice"}
+
+    maintained = _progress(interview)
+    rebuild_progress([interview.id])
+    assert _progress(interview) == maintained
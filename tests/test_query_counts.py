@@ -0,0 +1,69 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from interviewhub.models import Interview, Question, Submission
+
+
+def _count_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get(url)
+    assert resp.status_code == 200
+    return len(ctx.captured_queries)
+
+
+def assert_constant_queries(client, url, seed, small=2, large=10):
+    # Same number of queries whether the page holds `small` or `large` rows
+    seed(small)
+    before = _count_queries(client, url)
+    seed(large - small)
+    after = _count_queries(client, url)
+    assert before == after, f"{url}: {before} queries for {small} rows, {after} for {large}"
+
+
+def _questions(n):
+    return Question.objects.bulk_create(
+        [Question(title=f"Q{i}", qtype=Question.OPEN_ENDED, tags=["t"]) for i in range(n)]
+    )
+
+
+@pytest.mark.django_db
+def test_interview_list_queries_do_not_grow_with_page(client, facilitator):
+    def seed(n):
+        questions = _questions(3)
+        for i in range(n):
+            Interview.objects.create(
+                owner=facilitator, title=f"I{i}", is_published=True
+            ).questions.set(questions)
+
+    assert_constant_queries(client, "/api/interviews/", seed)
+
+
+@pytest.mark.django_db
+def test_interview_detail_queries_do_not_grow_with_questions(client, facilitator):
+    iv = Interview.objects.create(owner=facilitator, title="Pulse", is_published=True)
+
+    def seed(n):
+        iv.questions.add(*_questions(n))
+
+    assert_constant_queries(client, f"/api/interviews/{iv.id}/", seed)
+
+
+@pytest.mark.django_db
+def test_question_list_queries_do_not_grow_with_page(client):
+    assert_constant_queries(client, "/api/questions/", _questions)
+
+
+@pytest.mark.django_db
+def test_submission_list_queries_do_not_grow_with_page(client, participant, facilitator):
+    iv = Interview.objects.create(owner=facilitator, title="Pulse")
+    client.force_authenticate(participant)
+
+    def seed(n):
+        questions = _questions(n)
+        iv.questions.add(*questions)
+        Submission.objects.bulk_create(
+            [Submission(candidate=participant, interview=iv, question=q) for q in questions]
+        )
+
+    assert_constant_queries(client, "/api/submissions/", seed)
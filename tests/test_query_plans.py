@@ -0,0 +1,123 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from interviewhub.models import Interview, Question, Submission
+from interviewhub.results import rebuild_results
+
+# Every query an endpoint runs must read its tables through an index; paged
+# listings must also come out of the index in order (no sort of the whole table).
+
+PAGED = [
+    "/api/questions/?qtype=Scale",
+    "/api/interviews/?published=1",
+    "/api/submissions/",
+    "/api/submissions/?pagination=cursor",
+]
+
+
+def _plan(sql, params):
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            # Seeded tables are small: make the planner show whether an index exists
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {sql}", params)
+            return [row[0] for row in cursor.fetchall()]
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def _full_scans(plan):
+    if connection.vendor == "postgresql":
+        return [line for line in plan if "Seq Scan" in line]
+    # SQLite: "SCAN t" reads the table, "SCAN t USING INDEX i" walks an index in order
+    return [line for line in plan if re.match(r"\s*SCAN \w+$", line.strip())]
+
+
+def _sorts(plan):
+    if connection.vendor == "postgresql":
+        return [line for line in plan if re.search(r"\bSort\b", line)]
+    return [line for line in plan if "TEMP B-TREE FOR ORDER BY" in line]
+
+
+def _explained(client, method, url, **kwargs):
+    with CaptureQueriesContext(connection) as ctx:
+        resp = getattr(client, method)(url, **kwargs)
+    assert resp.status_code < 300, (url, resp.status_code)
+    plans = []
+    for query in ctx.captured_queries:
+        sql = query["sql"]
+        if not re.match(r"\s*(SELECT|UPDATE|DELETE)\b", sql):
+            continue
+        # Captured SQL has the parameters inlined already
+        plans.append((sql, _plan(sql, None)))
+    return plans
+
+
+@pytest.fixture
+def seeded(interview, participant, facilitator):
+    questions = Question.objects.bulk_create(
+        [
+            Question(title=f"Q{i}", qtype=[Question.SCALE, Question.OPEN_ENDED][i % 2])
+            for i in range(40)
+        ]
+    )
+    for i in range(5):
+        iv = Interview.objects.create(
+            owner=facilitator, title=f"Pulse {i}", is_published=i % 2 == 0
+        )
+        iv.questions.set(questions[i * 8 : i * 8 + 8])
+        Submission.objects.bulk_create(
+            [
+                Submission(candidate=participant, interview=iv, question=q, answer_text="3")
+                for q in questions[i * 8 : i * 8 + 8]
+                if q.qtype == Question.SCALE
+            ]
+        )
+    rebuild_results()
+    return interview
+
+
+@pytest.mark.django_db
+def test_endpoint_queries_use_indexes(client, seeded, participant, facilitator):
+    iv = seeded
+    question = iv.questions.get(qtype=Question.SCALE)
+    choice = iv.questions.get(qtype=Question.MULTIPLE_CHOICE)
+    client.force_authenticate(participant)
+    requests = [
+        ("get", "/api/questions/", {}),
+        ("get", "/api/questions/?tag=x", {}),
+        ("get", f"/api/questions/{question.id}/", {}),
+        ("get", "/api/tags/?prefix=a", {}),
+        ("get", "/api/interviews/", {}),
+        ("get", f"/api/interviews/{iv.id}/", {}),
+        ("get", f"/api/interviews/{iv.id}/session/", {}),
+        (
+            "post",
+            "/api/submissions/create/",
+            {"data": {"interview": iv.id, "question": question.id, "answer_text": "4"}},
+        ),
+        (
+            "post",
+            f"/api/interviews/{iv.id}/submissions/",
+            {"data": [{"question": choice.id, "answer_text": "Jira"}]},
+        ),
+    ] + [("get", url, {}) for url in PAGED]
+
+    failures = []
+    for method, url, kwargs in requests:
+        for sql, plan in _explained(client, method, url, format="json", **kwargs):
+            scans = _full_scans(plan)
+            sorts = _sorts(plan) if url in PAGED and " LIMIT " in sql else []
+            if scans or sorts:
+                failures.append((url, sql, plan))
+
+    client.force_authenticate(facilitator)
+    for url in [f"/api/interviews/{iv.id}/results/", f"/api/interviews/{iv.id}/export/"]:
+        for sql, plan in _explained(client, "get", url):
+            if _full_scans(plan):
+                failures.append((url, sql, plan))
+
+    assert not failures, "\n\n".join(f"{u}\n{s}\n{p}" for u, s, p in failures)
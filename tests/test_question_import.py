@@ -0,0 +1,69 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+from interviewhub.models import Question, Tag
+
+
+@pytest.mark.django_db
+def test_bulk_upsert_reports_errors_per_row(client, facilitator, participant, interview):
+    existing = Question.objects.create(external_id="bank-1", title="Old", tags=["old"])
+    url = "/api/questions/bulk/"
+    rows = [
+        {"external_id": "bank-1", "title": "Leadership", "qtype": "Scale", "tags": ["team"]},
+        {"external_id": "bank-2", "title": "Tool", "qtype": "Multiple Choice", "options": ["A"]},
+        {"title": "Anything else?", "qtype": "Open Ended", "body": "Updated by title"},
+        {"external_id": "bank-3", "title": "New", "qtype": "Scale", "tags": ["team"]},
+        {"external_id": "bank-3", "title": "Again", "qtype": "Scale"},
+        "not a question",
+    ]
+
+    client.force_authenticate(participant)
+    assert client.post(url, rows, format="json").status_code == 403
+
+    client.force_authenticate(facilitator)
+    resp = client.post(url, rows, format="json")
+    assert resp.status_code == 200
+    report = resp.json()
+    assert (report["created"], report["updated"]) == (1, 2)
+    assert [e["index"] for e in report["errors"]] == [1, 4, 5]
+    assert "options" in report["errors"][0]["errors"]
+
+    existing.refresh_from_db()
+    assert (existing.title, existing.qtype, existing.tags) == ("Leadership", "Scale", ["team"])
+    by_title = interview.questions.get(title="Anything else?")
+    assert by_title.body == "Updated by title" and by_title.external_id is None
+    assert dict(Tag.objects.values_list("name", "question_count")) == {"old": 0, "team": 2}
+    # Interview payloads embedding an updated question are refreshed
+    session = client.get(f"/api/interviews/{interview.id}/session/").json()
+    assert {q["id"]: q["body"] for q in session["questions"]}[by_title.id] == by_title.body
+
+
+@pytest.mark.django_db
+def test_import_command_streams_csv_and_jsonl(tmp_path, capsys):
+    csv_file = tmp_path / "bank.csv"
+    csv_file.write_text(
+        "external_id,title,qtype,options,tags\n"
+        "q1,Preferred tool,Multiple Choice,Jira|Slack,tools\n"
+        'q2,Clarity,Scale,,"[""team"", ""lead""]"\n'
+        "q3,Broken,Multiple Choice,OnlyOne,\n"
+        "q4,Anything else?,,,\n"
+    )
+    call_command("import_questions", str(csv_file), chunk_size=2)
+    out = capsys.readouterr()
+    assert "3 created, 0 updated, 1 rejected" in out.out
+    assert out.err.startswith("row 3: ")
+    assert Question.objects.get(external_id="q1").options == ["Jira", "Slack"]
+    assert Question.objects.get(external_id="q2").tags == ["team", "lead"]
+    # An empty qtype cell takes the default type
+    assert Question.objects.get(external_id="q4").qtype == Question.OPEN_ENDED
+
+    jsonl_file = tmp_path / "bank.jsonl"
+    jsonl_file.write_text(
+        json.dumps({"external_id": "q2", "title": "Clarity (v2)", "qtype": "Scale"}) + "\n{broken\n"
+    )
+    call_command("import_questions", str(jsonl_file))
+    assert "0 created, 1 updated, 1 rejected" in capsys.readouterr().out
+    assert Question.objects.get(external_id="q2").title == "Clarity (v2)"
+    assert Question.objects.filter(title__startswith="Clarity").count() == 1
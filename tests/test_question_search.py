@@ -0,0 +1,40 @@
+import pytest
+
+from interviewhub.models import Question
+
+
+def _titles(client, query):
+    resp = client.get(f"/api/questions/?{query}")
+    assert resp.status_code == 200
+    return [q["title"] for q in resp.data["results"]]
+
+
+@pytest.mark.django_db
+def test_search_matches_prefixes_and_ranks(client):
+    Question.objects.create(title="Leadership clarity", body="How clear is the leadership?")
+    Question.objects.create(title="Preferred tool", body="Pick the tool leadership uses")
+    Question.objects.create(title="Office space")
+
+    assert _titles(client, "search=leader") == ["Leadership clarity", "Preferred tool"]
+    assert _titles(client, "search=lead+cla") == ["Leadership clarity"]
+    assert _titles(client, "search=nothing") == []
+
+
+@pytest.mark.django_db
+def test_search_follows_updates_and_deletes(client):
+    q = Question.objects.create(title="Old wording")
+    q.title = "New wording"
+    q.save()
+    assert _titles(client, "search=new") == ["New wording"]
+    assert _titles(client, "search=old") == []
+
+    q.delete()
+    assert _titles(client, "search=new") == []
+
+
+@pytest.mark.django_db
+def test_tag_filter_is_exact(client):
+    Question.objects.create(title="A", tags=["team lead"])
+    Question.objects.create(title="B", tags=["lead", "ops"])
+
+    assert _titles(client, "tag=lead") == ["B"]
@@ -0,0 +1,94 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from interviewhub.models import Interview, InterviewQuestion, Question, Submission
+from interviewhub.question_sets import set_interview_questions, snapshot_questions
+from interviewhub.serializers import InterviewSerializer
+
+
+def _link_writes(ctx):
+    return [
+        q["sql"].split()[0]
+        for q in ctx.captured_queries
+        if re.match(
+            r'(INSERT INTO|UPDATE|DELETE FROM) "interviewhub_interview_questions"', q["sql"]
+        )
+    ]
+
+
+@pytest.mark.django_db
+def test_reorder_writes_only_the_moved_rows(client, facilitator):
+    questions = Question.objects.bulk_create([Question(title=f"Q{i}") for i in range(50)])
+    client.force_authenticate(facilitator)
+    created = client.post(
+        "/api/interviews/",
+        {"title": "Pulse", "questions": [q.id for q in questions]},
+        format="json",
+    ).json()
+    assert created["questions"] == [q.id for q in questions]
+    iv = Interview.objects.get(pk=created["id"])
+
+    # Move the last question to the front, drop one, add one at the end
+    extra = Question.objects.create(title="Extra")
+    order = [questions[-1]] + questions[1:-1] + [extra]
+    serializer = InterviewSerializer(iv, data={"questions": [q.id for q in order]}, partial=True)
+    serializer.is_valid(raise_exception=True)
+    with CaptureQueriesContext(connection) as ctx:
+        serializer.save()
+    assert sorted(_link_writes(ctx)) == ["DELETE", "INSERT", "UPDATE"]
+    assert client.get(f"/api/interviews/{iv.id}/").json()["questions"] == [q.id for q in order]
+
+    # Unchanged set: nothing written
+    with CaptureQueriesContext(connection) as ctx:
+        counts = set_interview_questions(iv, order)
+    assert counts == {"added": 0, "removed": 0, "moved": 0} and not _link_writes(ctx)
+
+
+@pytest.mark.django_db
+def test_repeated_inserts_at_one_spot_renumber_once_gaps_run_out(facilitator):
+    iv = Interview.objects.create(owner=facilitator, title="Pulse")
+    first, last = Question.objects.create(title="first"), Question.objects.create(title="last")
+    order = [first, last]
+    set_interview_questions(iv, order)
+    renumbered = 0
+    for i in range(15):
+        order.insert(1, Question.objects.create(title=f"Q{i}"))
+        counts = set_interview_questions(iv, order)
+        renumbered += counts["moved"] > 0
+    links = InterviewQuestion.objects.filter(interview=iv).order_by("position", "id")
+    assert [link.question_id for link in links] == [q.id for q in order]
+    assert renumbered == 1
+
+
+@pytest.mark.django_db
+def test_submissions_reference_the_question_set_they_answered(client, interview, participant):
+    scale = interview.questions.get(qtype=Question.SCALE)
+    choice = interview.questions.get(qtype=Question.MULTIPLE_CHOICE)
+    client.force_authenticate(participant)
+
+    def answer(question, text):
+        return client.post(
+            "/api/submissions/create/",
+            {"interview": interview.id, "question": question.id, "answer_text": text},
+            format="json",
+        ).json()["snapshot"]
+
+    before = answer(scale, "4")
+    # Same questions, same snapshot
+    assert answer(choice, "Jira") == before
+
+    scale.title = "Leadership clarity (revised)"
+    scale.save()
+    client.force_authenticate(interview.owner)
+    after = answer(scale, "2")
+    assert after != before
+
+    old = Submission.objects.get(candidate=participant, question=scale).snapshot
+    titles = [v.title for v in snapshot_questions(old)]
+    assert "Leadership clarity" in titles and scale.title not in titles
+    # Unchanged questions share their stored version across snapshots
+    new = Submission.objects.get(candidate=interview.owner, question=scale).snapshot
+    assert len(set(old.question_versions) & set(new.question_versions)) == 2
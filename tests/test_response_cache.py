@@ -0,0 +1,50 @@
+import pytest
+
+from interviewhub.models import Question
+
+
+@pytest.mark.django_db
+def test_interview_detail_is_served_from_cache_until_questions_change(
+    client, interview, django_assert_num_queries
+):
+    url = f"/api/interviews/{interview.id}/"
+    first = client.get(url)
+    assert first["X-Cache"] == "MISS"
+
+    with django_assert_num_queries(0):
+        hit = client.get(url)
+        not_modified = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert hit["X-Cache"] == "HIT" and hit.content == first.content
+    assert not_modified.status_code == 304
+
+    # Editing a question of the interview invalidates the interview payload
+    q = interview.questions.first()
+    q.title = "Renamed"
+    q.save()
+    fresh = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert fresh.status_code == 200 and fresh["X-Cache"] == "MISS"
+    assert "Renamed" in [d["title"] for d in fresh.json()["questions_data"]]
+
+
+@pytest.mark.django_db
+def test_m2m_changes_invalidate_interview_list(client, interview):
+    client.get("/api/interviews/")
+    assert client.get("/api/interviews/")["X-Cache"] == "HIT"
+
+    extra = Question.objects.create(title="Extra")
+    extra.interviews.add(interview)
+
+    resp = client.get("/api/interviews/")
+    assert resp["X-Cache"] == "MISS"
+    assert extra.id in resp.json()["results"][0]["questions"]
+
+
+@pytest.mark.django_db
+def test_question_detail_cache_and_stats(client, facilitator):
+    q = Question.objects.create(title="Leadership clarity")
+    client.get(f"/api/questions/{q.id}/")
+    client.get(f"/api/questions/{q.id}/")
+
+    client.force_authenticate(facilitator)
+    stats = client.get("/api/cache/stats/").json()
+    assert stats["hit"] == 1 and stats["miss"] >= 1
@@ -0,0 +1,96 @@
+import pytest
+from django.core.management import call_command
+
+from interviewhub.models import AnswerBucket, Question, QuestionResult, Submission
+
+
+def _questions(interview):
+    return {q.qtype: q for q in interview.questions.all()}
+
+
+@pytest.mark.django_db
+def test_results_are_maintained_on_write_and_match_rebuild(
+    client, facilitator, participant, interview, django_user_model
+):
+    qs = _questions(interview)
+    scale, choice = qs[Question.SCALE], qs[Question.MULTIPLE_CHOICE]
+    bob = django_user_model.objects.create_user(username="bob", password="pw")
+
+    client.force_authenticate(participant)
+    client.post(
+        "/api/submissions/create/",
+        {"interview": interview.id, "question": scale.id, "answer_text": "4"},
+        format="json",
+    )
+    client.post(
+        "/api/submissions/create/",
+        {"interview": interview.id, "question": choice.id, "answer_text": "Slack"},
+        format="json",
+    )
+    client.force_authenticate(bob)
+    client.post(
+        f"/api/interviews/{interview.id}/submissions/",
+        [
+            {"question": scale.id, "answer_text": "4"},
+            {"question": choice.id, "answer_text": "2"},  # index form of "Slack"
+        ],
+        format="json",
+    )
+
+    client.force_authenticate(facilitator)
+    resp = client.get(f"/api/interviews/{interview.id}/results/")
+    assert resp.status_code == 200
+    by_q = {r["question"]: r for r in resp.data["questions"]}
+    assert by_q[scale.id]["responses"] == 2
+    assert by_q[scale.id]["histogram"] == {"1": 0, "2": 0, "3": 0, "4": 2, "5": 0}
+    assert [o["count"] for o in by_q[choice.id]["options"]] == [0, 0, 2]
+
+    # Deleting a submission rolls it back out of the aggregates
+    Submission.objects.get(candidate=bob, question=scale).delete()
+    resp = client.get(f"/api/interviews/{interview.id}/results/")
+    by_q = {r["question"]: r for r in resp.data["questions"]}
+    assert by_q[scale.id]["histogram"]["4"] == 1
+
+    def snapshot():
+        return (
+            sorted(QuestionResult.objects.values_list("question_id", "response_count")),
+            sorted(
+                AnswerBucket.objects.filter(count__gt=0).values_list(
+                    "question_id", "bucket", "count"
+                )
+            ),
+        )
+
+    incremental = snapshot()
+    call_command("rebuild_results")
+    assert snapshot() == incremental
+
+
+@pytest.mark.django_db
+def test_results_hidden_from_participants_unless_public(client, participant, interview):
+    client.force_authenticate(participant)
+    assert client.get(f"/api/interviews/{interview.id}/results/").status_code == 403
+
+    interview.confidentiality = interview.CONF_PUBLIC
+    interview.save()
+    assert client.get(f"/api/interviews/{interview.id}/results/").status_code == 200
+
+
+@pytest.mark.django_db
+def test_public_results_follow_interview_visibility(
+    client, participant, interview, django_user_model
+):
+    interview.confidentiality = interview.CONF_PUBLIC
+    interview.save()
+    bob = django_user_model.objects.create_user(username="bob", password="pw")
+    interview.allowed_participants.add(bob)
+    url = f"/api/interviews/{interview.id}/results/"
+
+    client.force_authenticate(participant)
+    assert client.get(url).status_code == 403
+    client.force_authenticate(bob)
+    assert client.get(url).status_code == 200
+
+    interview.is_published = False
+    interview.save()
+    assert client.get(url).status_code == 404
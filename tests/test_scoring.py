@@ -0,0 +1,95 @@
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+
+from interviewhub.models import Question, ScoringJob, Submission
+from interviewhub.scoring import BaseScorer, LexiconSentimentScorer, claim_jobs, run_jobs
+
+
+class ExplodingScorer(BaseScorer):
+    def score_many(self, submissions):
+        if any("boom" in s.answer_text for s in submissions):
+            raise RuntimeError("model unavailable")
+        return [Decimal("0.50")] * len(submissions)
+
+
+def _submit(client, interview, user, answers):
+    qs = {q.qtype: q for q in interview.questions.all()}
+    client.force_authenticate(user)
+    resp = client.post(
+        f"/api/interviews/{interview.id}/submissions/",
+        [{"question": qs[qtype].id, "answer_text": text} for qtype, text in answers],
+        format="json",
+    )
+    assert resp.status_code == 201
+    return qs
+
+
+@pytest.mark.django_db
+def test_worker_scores_queued_submissions_and_updates_results(
+    client, facilitator, participant, interview
+):
+    qs = _submit(
+        client,
+        interview,
+        participant,
+        [(Question.SCALE, "5"), (Question.OPEN_ENDED, "Great team, not stressful at all")],
+    )
+    assert ScoringJob.objects.count() == 2
+
+    call_command("score_worker", "--once")
+
+    scores = dict(Submission.objects.values_list("question_id", "metric_score"))
+    assert scores[qs[Question.SCALE].id] == Decimal("1.00")
+    assert scores[qs[Question.OPEN_ENDED].id] == Decimal("1.00")
+    assert not ScoringJob.objects.exists()
+
+    client.force_authenticate(facilitator)
+    results = client.get(f"/api/interviews/{interview.id}/results/").data["questions"]
+    by_q = {r["question"]: r for r in results}
+    assert by_q[qs[Question.SCALE].id]["mean_metric_score"] == Decimal("1.00")
+
+
+@pytest.mark.django_db
+def test_failing_submissions_are_retried_with_backoff(client, participant, interview, settings):
+    settings.SCORING_MAX_ATTEMPTS = 2
+    _submit(client, interview, participant, [(Question.SCALE, "3"), (Question.OPEN_ENDED, "boom")])
+
+    assert run_jobs(claim_jobs(10, "w1"), ExplodingScorer(), "w1") == (1, 1)
+    job = ScoringJob.objects.get()
+    assert job.status == ScoringJob.PENDING and job.attempts == 1
+    assert "model unavailable" in job.last_error
+    assert claim_jobs(10, "w1") == []  # not due yet
+
+    ScoringJob.objects.update(run_after=job.created_at)
+    run_jobs(claim_jobs(10, "w1"), ExplodingScorer(), "w1")
+    assert ScoringJob.objects.get().status == ScoringJob.FAILED
+
+
+@pytest.mark.django_db
+def test_answer_edited_while_its_job_runs_is_scored_again(
+    client, facilitator, participant, interview
+):
+    question = interview.questions.get(qtype=Question.OPEN_ENDED)
+    url = "/api/submissions/create/?upsert=1"
+    client.force_authenticate(participant)
+    payload = {"interview": interview.id, "question": question.id}
+    client.post(url, {**payload, "answer_text": "Great team"}, format="json")
+    run_jobs(claim_jobs(10, "w1"), LexiconSentimentScorer(), "w1")
+    assert Submission.objects.get().metric_score == Decimal("1.00")
+
+    # w1 claims the rescoring of an edit, a second edit lands before it finishes
+    client.post(url, {**payload, "answer_text": "Awful, stressful"}, format="json")
+    ids = claim_jobs(10, "w1")
+    client.post(url, {**payload, "answer_text": "Fine"}, format="json")
+    assert run_jobs(ids, LexiconSentimentScorer(), "w1") == (0, 0)
+    assert Submission.objects.get().metric_score is None
+    assert ScoringJob.objects.get().status == ScoringJob.PENDING
+
+    run_jobs(claim_jobs(10, "w1"), LexiconSentimentScorer(), "w1")
+    client.force_authenticate(facilitator)
+    results = client.get(f"/api/interviews/{interview.id}/results/").data["questions"]
+    by_q = {r["question"]: r for r in results}
+    assert by_q[question.id]["responses"] == 1
+    assert by_q[question.id]["mean_metric_score"] == Submission.objects.get().metric_score
@@ -0,0 +1,65 @@
+import pytest
+from django.contrib.auth.models import User
+
+from interviewhub.models import Question, Submission
+
+
+@pytest.mark.django_db
+def test_session_returns_interview_questions_and_answers(
+    client, interview, participant, django_assert_num_queries
+):
+    scale, choice, _open = interview.questions.order_by("id")
+    Submission.objects.create(
+        candidate=participant, interview=interview, question=scale, answer_text="4"
+    )
+    client.force_authenticate(participant)
+    url = f"/api/interviews/{interview.id}/session/"
+
+    # interview + access, questions, answers
+    with django_assert_num_queries(3):
+        first = client.get(url)
+    body = first.json()
+    assert body["title"] == interview.title
+    links = interview.questions.through.objects.filter(interview=interview).order_by("id")
+    assert [q["id"] for q in body["questions"]] == [link.question_id for link in links]
+    assert next(q for q in body["questions"] if q["id"] == choice.id)["options"] == choice.options
+    assert [(a["question"], a["answer_text"]) for a in body["answers"]] == [(scale.id, "4")]
+    assert first["Cache-Control"] == "private, no-cache"
+
+    # Interview part is cached, the caller's answers are not
+    client.post(
+        "/api/submissions/create/",
+        {"interview": interview.id, "question": choice.id, "answer_text": "Jira"},
+        format="json",
+    )
+    with django_assert_num_queries(2):
+        second = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert second.status_code == 200 and len(second.json()["answers"]) == 2
+    assert client.get(url, HTTP_IF_NONE_MATCH=second["ETag"]).status_code == 304
+
+    # A question edit shows up
+    choice.body = "Pick the one you use most"
+    choice.save()
+    questions = client.get(url).json()["questions"]
+    assert next(q for q in questions if q["id"] == choice.id)["body"] == choice.body
+
+
+@pytest.mark.django_db
+def test_session_access(client, interview, participant, facilitator):
+    url = f"/api/interviews/{interview.id}/session/"
+    assert client.get(url).status_code == 401
+
+    client.force_authenticate(participant)
+    other = User.objects.create_user(username="bob", password="pw")
+    interview.allowed_participants.add(other)
+    assert client.get(url).status_code == 403
+    interview.allowed_participants.add(participant)
+    assert client.get(url).status_code == 200
+
+    interview.is_published = False
+    interview.save()
+    assert client.get(url).status_code == 404
+    # Owner and staff can preview it
+    client.force_authenticate(facilitator)
+    assert client.get(url).status_code == 200
+    assert Question.objects.count() == len(client.get(url).json()["questions"])
@@ -0,0 +1,36 @@
+import pytest
+
+from interviewhub.models import Question, Tag
+
+
+def _titles(client, query):
+    return sorted(q["title"] for q in client.get(f"/api/questions/?{query}").data["results"])
+
+
+@pytest.fixture
+def tagged(db):
+    Question.objects.create(title="A", tags=["team lead", "ops"])
+    Question.objects.create(title="B", tags=["lead", "ops"])
+    Question.objects.create(title="C", tags=["lead"])
+
+
+@pytest.mark.django_db
+def test_tag_filters_use_exact_names(client, tagged):
+    assert _titles(client, "tag=lead") == ["B", "C"]
+    assert _titles(client, "tag=lead&tag=ops") == ["A", "B", "C"]
+    assert _titles(client, "tag=lead&tag=ops&tag_mode=all") == ["B"]
+
+
+@pytest.mark.django_db
+def test_tag_facets_follow_question_edits(client, tagged):
+    resp = client.get("/api/tags/?prefix=LE")
+    assert [(t["name"], t["question_count"]) for t in resp.data["results"]] == [("lead", 2)]
+
+    b = Question.objects.get(title="B")
+    b.tags = ["ops", "remote"]
+    b.save()
+    Question.objects.get(title="C").delete()
+
+    counts = dict(Tag.objects.values_list("name", "question_count"))
+    assert counts == {"team lead": 1, "ops": 2, "lead": 0, "remote": 1}
+    assert client.get("/api/tags/?prefix=lead").data["results"] == []
@@ -0,0 +1,80 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import caches
+from django.test import AsyncRequestFactory
+
+from interviewhub.async_views import QuestionDetailAsyncView
+from interviewhub.models import Question
+from interviewhub.throttling import CacheBucketStore, LocalBucketStore, parse_rate
+
+
+def test_bucket_refills_and_evicts_least_recently_used(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("interviewhub.throttling.time.monotonic", lambda: clock[0])
+    store = LocalBucketStore(shards=1, max_buckets=2)
+    rate, burst = parse_rate("60/min:2")
+    assert (rate, burst) == (1.0, 2)
+
+    assert store.take("a", rate, burst) == 0
+    assert store.take("a", rate, burst) == 0
+    assert store.take("a", rate, burst) == pytest.approx(1.0)
+    clock[0] += 0.5
+    assert store.take("a", rate, burst) == pytest.approx(0.5)
+    clock[0] += 0.5
+    assert store.take("a", rate, burst) == 0
+
+    # "a" is the oldest bucket once two more are used: dropped, so full again
+    store.take("b", rate, burst)
+    store.take("c", rate, burst)
+    assert store.take("a", rate, burst) == 0
+    assert store.take("a", rate, burst) == 0
+
+
+def test_cache_store_shares_buckets(settings):
+    settings.THROTTLE_CACHE_ALIAS = "default"
+    caches["default"].clear()
+    first, second = CacheBucketStore(), CacheBucketStore()
+    assert first.take(("default", 1), 1.0, 1) == 0
+    assert second.take(("default", 1), 1.0, 1) > 0
+
+
+@pytest.mark.django_db
+def test_search_bucket_does_not_starve_submissions(client, settings, participant, interview):
+    settings.THROTTLE_RATES = {"default": "100/min", "search": "2/min", "submit": "2/min"}
+    client.force_authenticate(participant)
+    for _ in range(2):
+        assert client.get("/api/questions/?search=tool").status_code == 200
+    refused = client.get("/api/questions/?search=tool")
+    assert refused.status_code == 429
+    assert refused["Retry-After"] == "30"
+    # Other scopes keep their own buckets
+    assert client.get("/api/questions/").status_code == 200
+    question = interview.questions.get(qtype=Question.SCALE)
+    created = client.post(
+        "/api/submissions/create/",
+        {"interview": interview.id, "question": question.id, "answer_text": "4"},
+        format="json",
+    )
+    assert created.status_code == 201
+
+    # Keyed by user: someone else still gets their full search bucket
+    client.force_authenticate(interview.owner)
+    assert client.get("/api/questions/?search=tool").status_code == 200
+
+
+@pytest.mark.django_db
+def test_async_views_throttle_anonymous_clients_by_ip(settings, interview):
+    settings.THROTTLE_RATES = {"default": "1/hour"}
+    view = QuestionDetailAsyncView.as_view()
+    question = interview.questions.first()
+    factory = AsyncRequestFactory()
+
+    def get(ip):
+        return async_to_sync(view)(
+            factory.get("/", headers={"X-Forwarded-For": ip}), pk=question.id
+        )
+
+    assert get("10.0.0.1").status_code == 200
+    refused = get("10.0.0.1")
+    assert refused.status_code == 429 and refused["Retry-After"] == "3600"
+    assert get("10.0.0.2").status_code == 200
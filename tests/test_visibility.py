@@ -0,0 +1,97 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.test import AsyncRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from interviewhub.async_views import InterviewDetailAsyncView
+from interviewhub.models import Interview
+
+
+def _async_get(pk, user=None):
+    headers = {"Authorization": f"Bearer {AccessToken.for_user(user)}"} if user else {}
+    request = AsyncRequestFactory().get("/", headers=headers)
+    return async_to_sync(InterviewDetailAsyncView.as_view())(request, pk=pk)
+
+
+def _titles(client, user=None):
+    client.force_authenticate(user)
+    return sorted(row["title"] for row in client.get("/api/interviews/").json()["results"])
+
+
+@pytest.fixture
+def interviews(interview, facilitator, participant):
+    olga = User.objects.create_user(username="olga", password="pw")
+    Interview.objects.create(owner=olga, title="Draft")
+    restricted = Interview.objects.create(owner=olga, title="Invite only", is_published=True)
+    restricted.allowed_participants.add(User.objects.create_user(username="bob", password="pw"))
+    return olga, restricted
+
+
+@pytest.mark.django_db
+def test_interview_list_shows_what_each_caller_may_see(
+    client, interviews, facilitator, participant
+):
+    olga, restricted = interviews
+    public = ["Org Health Pulse"]
+    assert _titles(client) == public
+    assert _titles(client, participant) == public
+    assert _titles(client, olga) == ["Draft", "Invite only", "Org Health Pulse"]
+    assert _titles(client, facilitator) == ["Draft", "Invite only", "Org Health Pulse"]
+
+    # The cached lists are per audience and follow invitations
+    restricted.allowed_participants.add(participant)
+    assert _titles(client, participant) == ["Invite only", "Org Health Pulse"]
+    assert _titles(client) == public
+
+
+@pytest.mark.django_db
+def test_detail_session_and_submissions_check_access(client, interviews, participant):
+    olga, restricted = interviews
+    draft = Interview.objects.get(title="Draft")
+    question = restricted.questions.create(title="Team size")
+    url = f"/api/interviews/{restricted.id}/"
+
+    client.force_authenticate(olga)
+    assert client.get(url).status_code == 200
+    assert client.get(f"/api/interviews/{draft.id}/").status_code == 200
+
+    # The owner's request cached the payload: others still get checked
+    client.force_authenticate(participant)
+    denied = client.get(url)
+    assert denied.status_code == 403
+    assert denied.json()["detail"] == "You are not invited to this interview."
+    assert client.get(f"/api/interviews/{draft.id}/").status_code == 404
+    assert client.get(f"{url}session/").status_code == 403
+    assert (
+        client.post(
+            f"{url}submissions/", [{"question": question.id, "answer_text": "8"}], format="json"
+        ).status_code
+        == 403
+    )
+    resp = client.post(
+        "/api/submissions/create/",
+        {"interview": restricted.id, "question": question.id, "answer_text": "8"},
+        format="json",
+    )
+    assert resp.status_code == 400 and "interview" in resp.json()
+
+    restricted.allowed_participants.add(participant)
+    assert client.get(url).status_code == 200
+    resp = client.post(
+        "/api/submissions/create/",
+        {"interview": restricted.id, "question": question.id, "answer_text": "8"},
+        format="json",
+    )
+    assert resp.status_code == 201
+
+
+@pytest.mark.django_db
+def test_async_detail_checks_access(interviews, participant):
+    olga, restricted = interviews
+    assert _async_get(restricted.id, olga).status_code == 200
+    assert _async_get(restricted.id, participant).status_code == 403
+    assert _async_get(restricted.id).status_code == 403
+
+    restricted.allowed_participants.add(participant)
+    assert _async_get(restricted.id, participant).status_code == 200